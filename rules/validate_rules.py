@@ -4,6 +4,7 @@ Enhanced Rule Validation Script
 Validates rule structure, dependencies, and interactions
 """
 
+import sys
 import yaml
 import re
 from pathlib import Path
@@ -11,6 +12,23 @@ from typing import Dict, List, Set, Tuple
 import networkx as nx
 from collections import defaultdict
 
+# Per-rule checks come from the registry shared with validation/rule_validator.py
+VALIDATION_DIR = str(Path(__file__).resolve().parent.parent / 'validation')
+if VALIDATION_DIR not in sys.path:
+    sys.path.insert(0, VALIDATION_DIR)
+
+from checks import REGISTRY, STRUCTURE_CHECKS, Findings, RuleInput
+from content_scanner import PatternScanner, get_content_scanner
+
+FRONTMATTER_RE = re.compile(r'^---\n(.*?)\n---', re.DOTALL)
+
+# Rule name fragments that conflict when both are present, with the resolution strategy
+CONFLICT_PATTERNS = (
+    (('wildcard-brainstorm', 'concise-comms'), 'phase_separation'),
+    (('ultrathink-prompting', 'sql-correctness'), 'context_based'),
+    (('risk-checkpoint', 'wildcard-brainstorm'), 'risk_context'),
+)
+
 class RuleValidator:
     def __init__(self, rules_dir: str):
         self.rules_dir = Path(rules_dir)
@@ -19,6 +37,12 @@ class RuleValidator:
         self.conflicts: List[Tuple[str, str, str]] = []
         self.warnings: List[str] = []
         self.errors: List[str] = []
+        self.checks = REGISTRY.compile({}, STRUCTURE_CHECKS)
+        self.findings: Dict[str, Dict[str, Findings]] = {}
+        self.scanner = get_content_scanner()
+        self.conflict_scanner = PatternScanner(
+            (fragment, fragment, True) for rules, _ in CONFLICT_PATTERNS for fragment in rules
+        )
         
     def load_rules(self):
         """Load all .mdc rule files"""
@@ -32,7 +56,7 @@ class RuleValidator:
                     
                 # Extract YAML frontmatter
                 if content.startswith('---'):
-                    yaml_match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
+                    yaml_match = FRONTMATTER_RE.match(content)
                     if yaml_match:
                         metadata = yaml.safe_load(yaml_match.group(1))
                     else:
@@ -48,6 +72,8 @@ class RuleValidator:
                     'path': rule_file,
                     'metadata': metadata,
                     'content': content,
+                    # One scan per file; every content check reads these features
+                    'features': self.scanner.features(content),
                     'category': relative_path.parts[0] if len(relative_path.parts) > 1 else 'root'
                 }
                 
@@ -64,32 +90,29 @@ class RuleValidator:
                     self.dependency_graph.add_edge(dep, rule_name)
             
             # Check content references
-            content = rule_data['content']
+            features = rule_data['features']
             
             # Look for rule references in content
-            rule_refs = re.findall(r'@Rule:([a-zA-Z0-9\-_.]+)', content)
-            for ref in rule_refs:
+            for ref in features.references:
                 if ref in self.rules:
                     self.dependency_graph.add_edge(ref, rule_name)
             
             # Look for implicit dependencies
-            if 'divergence-convergence' in content:
+            if 'divergence-convergence' in features.labels:
                 self.dependency_graph.add_edge('103-divergence-convergence', rule_name)
             
-            if 'internal_thought' in content and 'user_facing_response' in content:
+            if 'internal_thought' in features.labels and 'user_facing_response' in features.labels:
                 # Rule uses phase separation
                 self.dependency_graph.add_edge('103-divergence-convergence', rule_name)
     
     def check_conflicts(self):
         """Identify potential rule conflicts"""
-        conflict_patterns = [
-            (['wildcard-brainstorm', 'concise-comms'], 'phase_separation'),
-            (['ultrathink-prompting', 'sql-correctness'], 'context_based'),
-            (['risk-checkpoint', 'wildcard-brainstorm'], 'risk_context'),
-        ]
+        present = set()
+        for rule_name in self.rules:
+            present |= self.conflict_scanner.labels(rule_name)
         
-        for rules, resolution in conflict_patterns:
-            present_rules = [r for r in rules if any(r in rn for rn in self.rules)]
+        for rules, resolution in CONFLICT_PATTERNS:
+            present_rules = [r for r in rules if r in present]
             if len(present_rules) > 1:
                 self.conflicts.append((present_rules[0], present_rules[1], resolution))
     
@@ -121,44 +144,32 @@ class RuleValidator:
                         f"depends on core rule {core_rule}"
                     )
     
+    def rule_findings(self) -> Dict[str, Dict[str, Findings]]:
+        """Run the per-rule structure checks once for every loaded rule"""
+        for rule_name, rule_data in self.rules.items():
+            if rule_name not in self.findings:
+                rule = RuleInput(Path(rule_name).name, rule_data['category'], rule_data['metadata'],
+                                 rule_data['content'], rule_data['features'])
+                self.findings[rule_name] = self.checks.run(rule)
+        return self.findings
+    
     def check_phase_consistency(self):
         """Ensure phase-based rules are consistent"""
-        divergence_rules = []
-        convergence_rules = []
-        
-        for rule_name, rule_data in self.rules.items():
-            content = rule_data['content'].lower()
-            
-            if 'divergence phase' in content or 'divergent' in content:
-                divergence_rules.append(rule_name)
-            if 'convergence phase' in content or 'convergent' in content:
-                convergence_rules.append(rule_name)
+        uses_phases = any(
+            markers['divergence'] or markers['convergence']
+            for markers in (found['phase_markers'].metrics for found in self.rule_findings().values())
+        )
         
         # Check that divergence-convergence orchestrator exists if phases are used
-        if (divergence_rules or convergence_rules) and \
-           '103-divergence-convergence' not in self.rules:
+        if uses_phases and '103-divergence-convergence' not in self.rules:
             self.errors.append(
                 "Phase-based rules found but divergence-convergence orchestrator missing"
             )
     
     def check_naming_conventions(self):
         """Validate rule naming conventions"""
-        for rule_name, rule_data in self.rules.items():
-            filename = Path(rule_name).name
-            
-            # Check kebab-case
-            if not re.match(r'^[0-9]{3}-[a-z0-9\-]+$', filename):
-                self.warnings.append(
-                    f"Non-standard naming: {filename} "
-                    "(expected: NNN-kebab-case)"
-                )
-            
-            # Check category alignment
-            category = rule_data['category']
-            if category != 'root' and not filename.startswith(category[:3]):
-                self.warnings.append(
-                    f"Category mismatch: {filename} in {category}"
-                )
+        for found in self.rule_findings().values():
+            self.warnings.extend(found['naming_convention'].warnings)
     
     def generate_report(self) -> str:
         """Generate validation report"""
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Benchmark History
+Append-only SQLite store of benchmark runs keyed by commit and machine, with
+trend, step-change and chart queries over it
+
+Runs are recorded from any file in the baseline format (``benchmark_rules.py``
+or ``benchmark_pipeline.py`` output). Rows are never updated or deleted, so a
+regression can be traced back through every commit that was measured. Runs
+that carry a calibrated machine fingerprint can be normalized, putting series
+from different runners on one scale.
+"""
+
+import os
+import csv
+import json
+import sqlite3
+import argparse
+import statistics
+import subprocess
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from benchmark_stats import mann_whitney_u
+from compare_benchmarks import DEFAULT_POLICIES, MetricPolicy, load_metrics
+from machine_fingerprint import machine_fingerprint
+
+HISTORY_SCHEMA_VERSION = 1
+DEFAULT_HISTORY = Path(__file__).parent.parent / '.cache' / 'benchmark_history.db'
+DEFAULT_WINDOW = 5
+# Metrics without a compare_benchmarks policy
+FALLBACK_POLICY = MetricPolicy(relative=0.10, absolute=0.0)
+
+
+class Point(NamedTuple):
+    run_id: int
+    commit: str
+    recorded_at: str
+    value: float
+    samples: Optional[List[float]]
+
+
+class StepChange(NamedTuple):
+    index: int  # First commit after the step
+    commit: str
+    before: float  # Median of the window before
+    after: float  # Median of the window after
+    p_value: float
+
+    @property
+    def pct(self) -> Optional[float]:
+        return (self.after - self.before) / self.before * 100 if self.before else None
+
+
+def current_commit() -> str:
+    """The commit being measured: CI's SHA, else git HEAD, else 'unknown'"""
+    if os.environ.get('GITHUB_SHA'):
+        return os.environ['GITHUB_SHA']
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def current_machine() -> str:
+    """Fingerprint id of this machine, so runs on the same hardware and interpreter group together"""
+    return machine_fingerprint()['id']
+
+
+class BenchmarkHistory:
+    """Append-only store of benchmark runs"""
+
+    def __init__(self, db_path: Path = DEFAULT_HISTORY):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+        if version not in (0, HISTORY_SCHEMA_VERSION):
+            raise RuntimeError(f"{self.db_path} has history schema {version}, expected {HISTORY_SCHEMA_VERSION}")
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                suite TEXT NOT NULL,
+                commit_sha TEXT NOT NULL,
+                machine TEXT NOT NULL,
+                recorded_at TEXT NOT NULL,
+                meta TEXT NOT NULL DEFAULT '{{}}'
+            );
+            CREATE TABLE IF NOT EXISTS measurements (
+                run_id INTEGER NOT NULL REFERENCES runs(id),
+                name TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                value REAL NOT NULL,
+                samples TEXT,
+                PRIMARY KEY (run_id, name, metric)
+            );
+            CREATE INDEX IF NOT EXISTS measurements_series ON measurements (name, metric);
+            CREATE TRIGGER IF NOT EXISTS runs_no_update BEFORE UPDATE ON runs
+                BEGIN SELECT RAISE(ABORT, 'benchmark history is append-only'); END;
+            CREATE TRIGGER IF NOT EXISTS runs_no_delete BEFORE DELETE ON runs
+                BEGIN SELECT RAISE(ABORT, 'benchmark history is append-only'); END;
+            CREATE TRIGGER IF NOT EXISTS measurements_no_update BEFORE UPDATE ON measurements
+                BEGIN SELECT RAISE(ABORT, 'benchmark history is append-only'); END;
+            CREATE TRIGGER IF NOT EXISTS measurements_no_delete BEFORE DELETE ON measurements
+                BEGIN SELECT RAISE(ABORT, 'benchmark history is append-only'); END;
+            PRAGMA user_version = {HISTORY_SCHEMA_VERSION};
+        """)
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def record(self, results: Dict[str, Dict], suite: str = 'rules', commit: Optional[str] = None,
+               machine: Optional[str] = None, meta: Optional[Dict] = None,
+               recorded_at: Optional[str] = None) -> int:
+        """Append one run of baseline-format results and return its id
+
+        Every numeric top-level metric of every entry is stored, with its
+        samples when the entry has them.
+        """
+        with self._conn:
+            cursor = self._conn.execute(
+                'INSERT INTO runs (suite, commit_sha, machine, recorded_at, meta) VALUES (?, ?, ?, ?, ?)',
+                (suite, commit or current_commit(), machine or current_machine(),
+                 recorded_at or datetime.now(timezone.utc).isoformat(), json.dumps(meta or {}))
+            )
+            run_id = cursor.lastrowid
+            rows = []
+            for name, metrics in results.items():
+                samples = metrics.get('samples') if isinstance(metrics.get('samples'), dict) else {}
+                for metric, value in metrics.items():
+                    if isinstance(value, bool) or not isinstance(value, (int, float)):
+                        continue
+                    metric_samples = samples.get(metric)
+                    rows.append((run_id, name, metric, value,
+                                 json.dumps(metric_samples) if metric_samples else None))
+            self._conn.executemany(
+                'INSERT INTO measurements (run_id, name, metric, value, samples) VALUES (?, ?, ?, ?, ?)', rows
+            )
+        return run_id
+
+    def names(self, metric: str, suite: Optional[str] = None, machine: Optional[str] = None) -> List[str]:
+        query, params = self._filtered('SELECT DISTINCT m.name', metric, None, suite, machine)
+        return [row[0] for row in self._conn.execute(query + ' ORDER BY m.name', params)]
+
+    def series(self, name: str, metric: str, suite: Optional[str] = None,
+               machine: Optional[str] = None, normalize: bool = False) -> List[Point]:
+        """Every recorded value of one metric, oldest first
+
+        With ``normalize``, timings are divided by the calibration score of
+        the machine that recorded them, so series from different
+        fingerprints share one scale; runs without a calibration are left out.
+        """
+        query, params = self._filtered(
+            'SELECT r.id, r.commit_sha, r.recorded_at, m.value, m.samples, r.meta', metric, name, suite, machine
+        )
+        points = []
+        for run_id, commit, recorded_at, value, samples, meta in self._conn.execute(query + ' ORDER BY r.id', params):
+            samples = json.loads(samples) if samples else None
+            if normalize and metric.endswith('_ms'):
+                calibration = json.loads(meta).get('fingerprint', {}).get('calibration_ms')
+                if not calibration:
+                    continue
+                value = value / calibration
+                samples = [sample / calibration for sample in samples] if samples else None
+            points.append(Point(run_id, commit, recorded_at, value, samples))
+        return points
+
+    def machines(self) -> List[Dict]:
+        """Each machine fingerprint with its run count and median calibration"""
+        machines: Dict[str, Dict] = {}
+        for machine, meta in self._conn.execute('SELECT machine, meta FROM runs ORDER BY id'):
+            fingerprint = json.loads(meta).get('fingerprint', {})
+            entry = machines.setdefault(machine, {'id': machine, 'runs': 0, 'calibrations': []})
+            entry['runs'] += 1
+            entry.update({key: fingerprint[key] for key in ('cpu_model', 'python', 'libyaml', 'governor')
+                          if key in fingerprint})
+            if fingerprint.get('calibration_ms'):
+                entry['calibrations'].append(fingerprint['calibration_ms'])
+        for entry in machines.values():
+            calibrations = entry.pop('calibrations')
+            entry['calibration_ms'] = statistics.median(calibrations) if calibrations else None
+        return list(machines.values())
+
+    def _filtered(self, select: str, metric: str, name: Optional[str],
+                  suite: Optional[str], machine: Optional[str]):
+        query = f"{select} FROM measurements m JOIN runs r ON r.id = m.run_id WHERE m.metric = ?"
+        params: List = [metric]
+        for column, value in (('m.name', name), ('r.suite', suite), ('r.machine', machine)):
+            if value is not None:
+                query += f" AND {column} = ?"
+                params.append(value)
+        return query, params
+
+
+def by_commit(points: Iterable[Point]) -> List[Point]:
+    """Collapse consecutive runs of the same commit into one point at their median"""
+    collapsed: List[Point] = []
+    group: List[Point] = []
+    for point in list(points) + [None]:
+        if group and (point is None or point.commit != group[-1].commit):
+            samples = [s for p in group for s in p.samples or []]
+            collapsed.append(group[-1]._replace(value=statistics.median(p.value for p in group),
+                                                samples=samples or None))
+            group = []
+        if point is not None:
+            group.append(point)
+    return collapsed
+
+
+def trend(values: Sequence[float]) -> Dict[str, Optional[float]]:
+    """Least-squares drift per commit, absolute and relative to the mean"""
+    n = len(values)
+    if n < 2:
+        return {'n': n, 'slope': None, 'pct_per_commit': None, 'first': values[0] if n else None,
+                'last': values[-1] if n else None}
+    mean_x, mean_y = (n - 1) / 2, statistics.fmean(values)
+    slope = (sum((i - mean_x) * (y - mean_y) for i, y in enumerate(values))
+             / sum((i - mean_x) ** 2 for i in range(n)))
+    return {
+        'n': n,
+        'slope': slope,
+        'pct_per_commit': slope / mean_y * 100 if mean_y else None,
+        'first': values[0],
+        'last': values[-1],
+    }
+
+
+def detect_step_changes(points: Sequence[Point], window: int = DEFAULT_WINDOW,
+                        policy: MetricPolicy = FALLBACK_POLICY) -> List[StepChange]:
+    """Commits where the level shifts between the ``window`` commits before and after
+
+    A shift must clear the policy's absolute and relative thresholds and the
+    two windows must differ by a Mann-Whitney test at the policy's alpha.
+    Adjacent candidates describe the same step, so only the most significant
+    (then largest) is kept.
+    """
+    values = [point.value for point in points]
+    candidates = []
+    for i in range(window, len(values) - window + 1):
+        before, after = values[i - window:i], values[i:i + window]
+        low, high = statistics.median(before), statistics.median(after)
+        delta = high - low
+        if abs(delta) < policy.absolute or (low > 0 and abs(delta) / low <= policy.relative):
+            continue
+        _, p_value = mann_whitney_u(before, after)
+        if p_value < policy.alpha:
+            candidates.append(StepChange(i, points[i].commit, low, high, round(p_value, 6)))
+
+    steps: List[StepChange] = []
+    for candidate in candidates:
+        if steps and candidate.index - steps[-1].index < window:
+            if _strength(candidate) > _strength(steps[-1]):
+                steps[-1] = candidate
+            continue
+        steps.append(candidate)
+    return steps
+
+
+def _strength(step: StepChange):
+    return -step.p_value, abs(step.after - step.before)
+
+
+def export_csv(series: Dict[str, List[Point]], output_path: Path) -> None:
+    with open(output_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['name', 'index', 'commit', 'recorded_at', 'value'])
+        for name, points in series.items():
+            for index, point in enumerate(points):
+                writer.writerow([name, index, point.commit, point.recorded_at, point.value])
+
+
+def export_chart(series: Dict[str, List[Point]], metric: str, output_path: Path,
+                 steps: Optional[Dict[str, List[StepChange]]] = None) -> None:
+    """Line chart of each series by commit, with detected steps marked"""
+    # matplotlib dominates startup, so only charting pays for it
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for name, points in series.items():
+        ax.plot(range(len(points)), [point.value for point in points], marker='.', label=name)
+        for step in (steps or {}).get(name, []):
+            ax.axvline(step.index - 0.5, color='red', alpha=0.3, linestyle='--')
+    ax.set_xlabel('Commit (oldest first)')
+    ax.set_ylabel(metric)
+    ax.set_title(f"{metric} history")
+    if len(series) <= 10:
+        ax.legend(fontsize='small')
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150)
+    plt.close(fig)
+
+
+def _policy(metric: str, normalized: bool = False) -> MetricPolicy:
+    policy = DEFAULT_POLICIES.get(metric, FALLBACK_POLICY)
+    # Absolute thresholds are in the metric's own unit, which normalizing removes
+    return replace(policy, absolute=0.0) if normalized and metric.endswith('_ms') else policy
+
+
+def _selected_series(history: BenchmarkHistory, args) -> Dict[str, List[Point]]:
+    names = args.name or history.names(args.metric, args.suite, args.machine)
+    series = {}
+    for name in names:
+        points = by_commit(history.series(name, args.metric, args.suite, args.machine, args.normalize))
+        if args.last:
+            points = points[-args.last:]
+        if points:
+            series[name] = points
+    return series
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and query benchmark history")
+    parser.add_argument('--db', type=Path, default=DEFAULT_HISTORY, help='History database')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record = subparsers.add_parser('record', help='Append a benchmark results file')
+    record.add_argument('results', help='Metrics JSON in baseline format')
+    record.add_argument('--suite', default='rules', help='Which benchmark produced the file')
+    record.add_argument('--commit', help='Commit measured (default: GITHUB_SHA or git HEAD)')
+    record.add_argument('--machine', help='Machine identifier (default: fingerprint id)')
+    record.add_argument('--calibrate', action='store_true',
+                        help='Fingerprint and calibrate this machine into the run, enabling --normalize')
+
+    subparsers.add_parser('machines', help='List recorded machine fingerprints')
+
+    for command, description in (('trend', 'Drift per commit for each series'),
+                                 ('steps', 'Commits where a series stepped up or down'),
+                                 ('export', 'Write series as CSV and/or a chart')):
+        query = subparsers.add_parser(command, help=description)
+        query.add_argument('--metric', default='validation_time_ms', help='Metric to query')
+        query.add_argument('--name', action='append', help='Rule or scenario; repeatable (default: all)')
+        query.add_argument('--suite', help='Only runs of this suite')
+        query.add_argument('--machine', help='Only runs on this machine')
+        query.add_argument('--last', type=int, help='Only the last N commits')
+        query.add_argument('--normalize', action='store_true',
+                           help="Divide timings by each run's machine calibration score")
+        if command in ('steps', 'export'):
+            query.add_argument('--window', type=int, default=DEFAULT_WINDOW,
+                               help='Commits compared on each side of a step')
+        if command == 'export':
+            query.add_argument('--csv', type=Path, help='CSV output path')
+            query.add_argument('--chart', type=Path, help='Chart image output path')
+
+    args = parser.parse_args()
+    history = BenchmarkHistory(args.db)
+    try:
+        if args.command == 'record':
+            meta = {'fingerprint': machine_fingerprint(calibration=True)} if args.calibrate else None
+            run_id = history.record(load_metrics(args.results), suite=args.suite,
+                                    commit=args.commit, machine=args.machine, meta=meta)
+            print(f"Recorded run {run_id} in {args.db}")
+            return
+        if args.command == 'machines':
+            for machine in history.machines():
+                calibration = machine['calibration_ms']
+                print(f"{machine['id']}  runs={machine['runs']}  {machine.get('cpu_model', '?')}  "
+                      f"python {machine.get('python', '?')}  libyaml={machine.get('libyaml', '?')}  "
+                      f"calibration={f'{calibration:.3f}ms' if calibration else 'n/a'}")
+            return
+
+        series = _selected_series(history, args)
+        if args.command == 'trend':
+            print(f"{'name':40} {'commits':>7} {'first':>10} {'last':>10} {'%/commit':>9}")
+            for name, points in series.items():
+                result = trend([point.value for point in points])
+                pct = f"{result['pct_per_commit']:+.2f}" if result['pct_per_commit'] is not None else '–'
+                print(f"{name:40} {result['n']:>7} {result['first']:>10.2f} {result['last']:>10.2f} {pct:>9}")
+        elif args.command == 'steps':
+            found = False
+            for name, points in series.items():
+                for step in detect_step_changes(points, args.window, _policy(args.metric, args.normalize)):
+                    found = True
+                    pct = f"{step.pct:+.1f}%" if step.pct is not None else 'n/a'
+                    print(f"{name}: {step.before:.2f} → {step.after:.2f} ({pct}, p={step.p_value:.3g}) "
+                          f"at {step.commit[:12]}")
+            if not found:
+                print("No step changes found")
+        elif args.command == 'export':
+            if args.csv:
+                export_csv(series, args.csv)
+                print(f"Wrote {args.csv}")
+            if args.chart:
+                steps = {name: detect_step_changes(points, args.window, _policy(args.metric, args.normalize))
+                         for name, points in series.items()}
+                export_chart(series, args.metric, args.chart, steps)
+                print(f"Wrote {args.chart}")
+    finally:
+        history.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmarking Suite
+End-to-end timings of the loader, validator, rulesync, docs generator and
+evolution engine over corpora of increasing size
+
+Each scenario is set up once per corpus, run ``warmup`` times untimed and then
+``repeats`` times timed, in the manner of pytest-benchmark rounds. Corpora
+are the real rules tree replicated to size, or synthetic trees from
+``generate_corpus.py``. Results are written in the baseline format
+``compare_benchmarks.py`` reads, keyed
+``<scenario>@<size>``; wall time is reported as ``validation_time_ms`` so the
+comparison applies its timing policy and significance test to it.
+"""
+
+import io
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import tracemalloc
+import importlib.util
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import yaml
+
+from benchmark_stats import DEFAULT_CONFIDENCE, summarize
+from generate_corpus import generate_corpus
+
+REPO_ROOT = Path(__file__).parent.parent
+VALIDATION_DIR = REPO_ROOT / 'validation'
+if str(VALIDATION_DIR) not in sys.path:
+    sys.path.insert(0, str(VALIDATION_DIR))
+
+DEFAULT_SIZES = (100, 1000)
+BENCHMARK_PROFILE = 'benchmark'
+# Platforms whose writers stay inside the project root; gemini and codex
+# also write the user's global config when it exists
+PROJECT_PLATFORMS = ('claude', 'cursor', 'zed')
+EVOLUTION_ENGINE = REPO_ROOT / 'rules' / '700-evolution' / 'symbiosis_evolution_engine.py'
+
+
+class ScenarioUnavailable(Exception):
+    """A scenario cannot run here, e.g. an optional dependency is missing"""
+
+
+class Scenario(NamedTuple):
+    name: str
+    description: str
+    # Builds the timed callable for a corpus project root
+    setup: Callable[[Path], Callable[[], object]]
+
+
+def _rule_pairs(rules_dir: Path) -> List[Path]:
+    """Every .mdc under rules_dir, in a stable order"""
+    return sorted(rules_dir.rglob('*.mdc'))
+
+
+def replicate_corpus(project_root: Path, size: int, source: Path = REPO_ROOT / 'rules') -> Path:
+    """Fill ``project_root/rules`` with ``size`` rules copied from ``source``
+
+    The source rules are cycled; every pass after the first renames its
+    copies ``<stem>-rN`` and keeps them in the original category, so
+    categories, split YAML files and frontmatter keep their real mix.
+    """
+    rules_dir = project_root / 'rules'
+    sources = _rule_pairs(source)
+    if not sources:
+        raise ValueError(f"No rules found under {source}")
+    for i in range(size):
+        mdc = sources[i % len(sources)]
+        copy = i // len(sources)
+        stem = mdc.stem if copy == 0 else f"{mdc.stem}-r{copy}"
+        target = rules_dir / mdc.parent.relative_to(source)
+        target.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(mdc, target / f"{stem}.mdc")
+        yaml_path = mdc.with_suffix('.yaml')
+        if yaml_path.exists():
+            shutil.copyfile(yaml_path, target / f"{stem}.yaml")
+    return rules_dir
+
+
+CORPORA: Dict[str, Callable[[Path, int], Path]] = {
+    'replicated': replicate_corpus,
+    'synthetic': generate_corpus,
+}
+
+
+def install_validation_config(project_root: Path) -> None:
+    """Give the corpus the repo's validation settings, which the validator reads from beside rules/"""
+    config = REPO_ROOT / 'validation' / 'config.yaml'
+    if config.exists():
+        (project_root / 'validation').mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(config, project_root / 'validation' / 'config.yaml')
+
+
+def write_benchmark_profile(project_root: Path) -> Path:
+    """A rulesync profile selecting every corpus rule for every platform"""
+    rules_dir = project_root / 'rules'
+    rules = [str(path.relative_to(rules_dir)) for path in _rule_pairs(rules_dir)]
+    budget = sys.maxsize
+    profile = {
+        'name': BENCHMARK_PROFILE,
+        'version': '1.0.0',
+        'core_rules': [],
+        'project_rules': {'corpus': rules},
+        'platform_optimizations': {
+            platform: {'include_categories': ['project_rules'], 'exclude_rules': [], 'token_budget': budget}
+            for platform in PROJECT_PLATFORMS
+        },
+    }
+    profiles_dir = project_root / 'profiles'
+    profiles_dir.mkdir(exist_ok=True)
+    profile_path = profiles_dir / f"{BENCHMARK_PROFILE}.yaml"
+    with open(profile_path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(profile, f, sort_keys=False)
+    return profile_path
+
+
+def _setup_loader(project_root: Path) -> Callable[[], object]:
+    from rule_loader import RuleLoader
+    rules_dir = project_root / 'rules'
+    return lambda: RuleLoader(rules_dir).load_all()
+
+
+def _setup_validator(project_root: Path) -> Callable[[], object]:
+    from rule_validator import EnhancedRuleValidator
+    rules_dir = project_root / 'rules'
+    return lambda: EnhancedRuleValidator(rules_dir).validate_all()
+
+
+def _setup_rulesync(project_root: Path) -> Callable[[], object]:
+    from rulesync_enhanced import RuleSyncEnhanced
+    write_benchmark_profile(project_root)
+
+    def run():
+        sync = RuleSyncEnhanced(project_root=str(project_root))
+        # Forced, or every run after the first would only time the manifest check
+        sync.generate(platforms=list(PROJECT_PLATFORMS), profile=BENCHMARK_PROFILE, force=True)
+    return run
+
+
+def _setup_docs(project_root: Path) -> Callable[[], object]:
+    from generate_docs import DocsGenerator
+    rules_dir, output_dir = project_root / 'rules', project_root / 'docs'
+    return lambda: DocsGenerator(rules_dir, output_dir).generate_all(draw_graph=False)
+
+
+def _setup_evolution(project_root: Path) -> Callable[[], object]:
+    spec = importlib.util.spec_from_file_location('symbiosis_evolution_engine', EVOLUTION_ENGINE)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except ImportError as e:
+        raise ScenarioUnavailable(f"evolution engine dependencies missing: {e}") from e
+
+    cache_dir = project_root / '.cache'
+    cache_dir.mkdir(exist_ok=True)
+    engine = module.RuleSymbiosisEvolution(db_path=str(cache_dir / 'evolution.db'))
+    # The engine's rules_dir is a fixed path; point it at the corpus instead
+    engine.rules_dir = project_root / 'rules'
+    engine.available_rules = engine._load_available_rules()
+    if len(engine.available_rules) < 8:
+        raise ScenarioUnavailable("evolution needs at least 8 rules to sample from")
+    module.np.random.seed(0)
+    engine.initialize_population()
+    return engine.evolve_generation
+
+
+SCENARIOS: Dict[str, Scenario] = {scenario.name: scenario for scenario in (
+    Scenario('loader', 'RuleLoader.load_all, no persistent cache', _setup_loader),
+    Scenario('validator', 'EnhancedRuleValidator.validate_all, serial', _setup_validator),
+    Scenario('rulesync', 'RuleSyncEnhanced.generate with a profile', _setup_rulesync),
+    Scenario('docs', 'DocsGenerator.generate_all without the graph image', _setup_docs),
+    Scenario('evolution', 'RuleSymbiosisEvolution.evolve_generation', _setup_evolution),
+)}
+
+
+def _quiet(run: Callable[[], object]) -> None:
+    """Run with stdout discarded; several pipeline stages print progress"""
+    with redirect_stdout(io.StringIO()):
+        run()
+
+
+def _peak_memory_mb(run: Callable[[], object]) -> float:
+    """Peak traced allocation during one untimed run"""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    _quiet(run)
+    peak = tracemalloc.get_traced_memory()[1]
+    if started:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def measure(run: Callable[[], object], repeats: int, warmup: int,
+            confidence: float = DEFAULT_CONFIDENCE) -> Dict:
+    """Time ``run`` and return one baseline entry for ``compare_benchmarks``"""
+    for _ in range(warmup):
+        _quiet(run)
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        _quiet(run)
+        samples.append(round((time.perf_counter() - start) * 1000, 4))
+    stats = summarize(samples, confidence)
+    return {
+        'validation_time_ms': stats['median'],
+        'memory_usage_mb': round(_peak_memory_mb(run), 4),
+        'repeats': repeats,
+        'samples': {'validation_time_ms': samples},
+        'stats': {'validation_time_ms': stats},
+    }
+
+
+class PipelineBenchmarker:
+    """Run scenarios over one corpus per size"""
+
+    def __init__(self, sizes: Sequence[int] = DEFAULT_SIZES, scenarios: Optional[Sequence[str]] = None,
+                 corpus: str = 'replicated', repeats: int = 5, warmup: int = 1,
+                 confidence: float = DEFAULT_CONFIDENCE, work_dir: Optional[Path] = None):
+        unknown = [name for name in scenarios or () if name not in SCENARIOS]
+        if unknown:
+            raise ValueError(f"Unknown scenarios: {', '.join(unknown)}")
+        if corpus not in CORPORA:
+            raise ValueError(f"Unknown corpus: {corpus}")
+        self.sizes = list(sizes)
+        self.scenarios = list(scenarios or SCENARIOS)
+        self.corpus = corpus
+        self.repeats = repeats
+        self.warmup = warmup
+        self.confidence = confidence
+        self.work_dir = work_dir
+        self.results: Dict[str, Dict] = {}
+        self.skipped: Dict[str, str] = {}
+
+    def run(self) -> Dict[str, Dict]:
+        with tempfile.TemporaryDirectory(dir=self.work_dir) as tmp:
+            for size in self.sizes:
+                project_root = Path(tmp) / f"corpus-{size}"
+                rules_dir = CORPORA[self.corpus](project_root, size)
+                install_validation_config(project_root)
+                corpus_stats = {
+                    'rule_count': len(_rule_pairs(rules_dir)),
+                    'corpus_bytes': sum(p.stat().st_size for p in rules_dir.rglob('*') if p.is_file()),
+                }
+                for name in self.scenarios:
+                    key = f"{name}@{size}"
+                    try:
+                        with redirect_stdout(io.StringIO()):
+                            run = SCENARIOS[name].setup(project_root)
+                    except ScenarioUnavailable as e:
+                        self.skipped[key] = str(e)
+                        logging.warning(f"Skipping {key}: {e}")
+                        continue
+                    logging.info(f"Benchmarking {key}...")
+                    result = measure(run, self.repeats, self.warmup, self.confidence)
+                    result.update(corpus_stats, scenario=name, corpus_size=size, corpus=self.corpus)
+                    self.results[key] = result
+        return self.results
+
+    def save(self, output_path: Path) -> None:
+        with open(output_path, 'w') as f:
+            json.dump(self.results, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the rule pipeline end to end")
+    parser.add_argument('--output', default='pipeline_metrics.json',
+                        help='Output file in compare_benchmarks.py format')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='Corpus sizes, in rules')
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS),
+                        help='Scenarios to run (default: all)')
+    parser.add_argument('--corpus', choices=sorted(CORPORA), default='replicated',
+                        help='How corpora are built')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed runs per scenario')
+    parser.add_argument('--warmup', type=int, default=1, help='Untimed runs per scenario first')
+    parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE,
+                        help='Confidence level for median intervals')
+    parser.add_argument('--work-dir', type=Path, help='Where to build corpora (default: system temp)')
+    parser.add_argument('--history', type=Path,
+                        help='Also append the results to this benchmark history database')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    benchmarker = PipelineBenchmarker(args.sizes, args.scenarios, corpus=args.corpus,
+                                      repeats=args.repeats, warmup=args.warmup,
+                                      confidence=args.confidence, work_dir=args.work_dir)
+    results = benchmarker.run()
+    benchmarker.save(Path(args.output))
+    if args.history:
+        from benchmark_history import BenchmarkHistory
+        from machine_fingerprint import machine_fingerprint
+        fingerprint = machine_fingerprint(calibration=True)
+        history = BenchmarkHistory(args.history)
+        history.record(results, suite=f"pipeline-{args.corpus}", machine=fingerprint['id'],
+                       meta={'repeats': args.repeats, 'sizes': args.sizes, 'fingerprint': fingerprint})
+        history.close()
+
+    logging.info("\n=== Pipeline Benchmark Summary ===")
+    for key, result in results.items():
+        stats = result['stats']['validation_time_ms']
+        logging.info(f"{key}: {stats['median']:.1f}ms "
+                     f"[{stats['ci_low']:.1f}, {stats['ci_high']:.1f}], peak {result['memory_usage_mb']:.1f}MB")
+    for key, reason in benchmarker.skipped.items():
+        logging.info(f"{key}: skipped ({reason})")
+
+
+if __name__ == '__main__':
+    main()
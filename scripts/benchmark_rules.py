@@ -4,17 +4,22 @@ Rule Performance Benchmarking System
 Measures timing, memory, and token metrics for all rules
 """
 
+import os
 import json
 import time
-import psutil
 import tracemalloc
 import logging
 from pathlib import Path
-from typing import Dict, List, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, asdict, field
 from datetime import datetime
 import yaml
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from token_counter import get_token_counter
+from benchmark_stats import DEFAULT_CONFIDENCE, summarize
+from machine_fingerprint import allowed_cpus, machine_fingerprint, pin_to_cpu
 
 @dataclass
 class BenchmarkResult:
@@ -27,28 +32,96 @@ class BenchmarkResult:
     file_size_bytes: int
     memory_usage_kb: float
     timestamp: str
+    # Statistical mode: point timings above are medians of ``repeats`` samples
+    repeats: int = 1
+    cold_load_time_ms: Optional[float] = None
+    cache_dropped: bool = False
+    stats: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    samples: Dict[str, List[float]] = field(default_factory=dict)
     
     def to_dict(self) -> Dict:
         return asdict(self)
 
+
+def drop_page_cache(path: Path) -> bool:
+    """Ask the kernel to evict a file's cached pages; False where unsupported
+    
+    Eviction is advisory: dirty pages and other readers can keep the file
+    cached, so cold timings are best effort.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return False
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)  # Dirty pages are not dropped
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        return True
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+
+
+def _worker_cpus(first: Optional[int], count: int) -> List[Optional[int]]:
+    """One CPU per worker, starting at ``first`` among the allowed CPUs"""
+    cpus = sorted(allowed_cpus() or ())
+    if first is None or not cpus:
+        return [None] * count
+    start = cpus.index(first) if first in cpus else 0
+    return [cpus[(start + i) % len(cpus)] for i in range(count)]
+
+
+def _benchmark_shard(rules_dir: Path, rule_paths: List[Path], settings: Dict,
+                     cpu: Optional[int]) -> List[Optional[Dict]]:
+    """Worker entry point: benchmark one shard, None for rules that failed"""
+    if cpu is not None:
+        pin_to_cpu(cpu)
+    benchmarker = RuleBenchmarker(rules_dir, **settings)
+    results = []
+    for rule_path in rule_paths:
+        try:
+            results.append(benchmarker.benchmark_rule(rule_path).to_dict())
+        except Exception as e:
+            logging.error(f"  Error benchmarking {rule_path.name}: {e}")
+            results.append(None)
+    return results
+
+
 class RuleBenchmarker:
-    def __init__(self, rules_dir: Path):
+    def __init__(self, rules_dir: Path, repeats: int = 1, warmup: int = 0,
+                 drop_cache: bool = True, confidence: float = DEFAULT_CONFIDENCE,
+                 workers: int = 1, pin_cpu: Optional[int] = None):
         self.rules_dir = rules_dir
         self.results: List[BenchmarkResult] = []
-        self.process = psutil.Process()
+        self._process = None
+        self.token_counter = get_token_counter()
+        # More than one repeat switches benchmark_rule to statistical mode
+        self.repeats = max(1, repeats)
+        self.warmup = max(0, warmup)
+        self.drop_cache = drop_cache
+        self.confidence = confidence
+        # Sharding across processes measures throughput; pinning steadies per-rule timings
+        self.workers = max(1, workers)
+        self.pin_cpu = pin_cpu
+        self.fingerprint: Optional[Dict] = None
+        self.wall_time_ms: Optional[float] = None
+    
+    @property
+    def process(self):
+        """psutil handle for this process; psutil is imported on first use"""
+        if self._process is None:
+            import psutil
+            self._process = psutil.Process()
+        return self._process
     
     def estimate_tokens(self, content: str) -> int:
-        """Estimate token count using tiktoken or fallback"""
-        try:
-            import tiktoken
-            enc = tiktoken.encoding_for_model("gpt-4")
-            return len(enc.encode(content))
-        except (ImportError, KeyError):
-            # Fallback: ~4 chars per token
-            return len(content) // 4
+        """Count tokens using the shared tiktoken-backed counter"""
+        return self.token_counter.count(content)
     
     def benchmark_rule(self, mdc_path: Path) -> BenchmarkResult:
         """Benchmark single rule performance"""
+        if self.repeats > 1:
+            return self.benchmark_rule_sampled(mdc_path)
         tracemalloc.start()
         start_memory = tracemalloc.get_traced_memory()[0]
         
@@ -90,12 +163,117 @@ class RuleBenchmarker:
             timestamp=datetime.now().isoformat()
         )
     
+    def benchmark_rule_sampled(self, mdc_path: Path) -> BenchmarkResult:
+        """Benchmark a rule over warmup plus ``repeats`` timed runs
+        
+        Each repeat takes a cold read (page cache dropped, fresh handle), a
+        warm read and a metadata parse. Memory is measured in a separate
+        untimed pass so tracemalloc overhead stays out of the timings.
+        """
+        yaml_path = mdc_path.with_suffix('.yaml')
+        for _ in range(self.warmup):
+            self._timed_read(mdc_path)
+            self._timed_parse(yaml_path)
+        
+        samples: Dict[str, List[float]] = {'cold_load_time_ms': [], 'load_time_ms': [], 'parse_time_ms': []}
+        cache_dropped = self.drop_cache
+        for _ in range(self.repeats):
+            if self.drop_cache:
+                cache_dropped = drop_page_cache(mdc_path) and cache_dropped
+            samples['cold_load_time_ms'].append(self._timed_read(mdc_path)[1])
+            content, load_time = self._timed_read(mdc_path)
+            samples['load_time_ms'].append(load_time)
+            samples['parse_time_ms'].append(self._timed_parse(yaml_path))
+        samples['validation_time_ms'] = [
+            load + parse for load, parse in zip(samples['load_time_ms'], samples['parse_time_ms'])
+        ]
+        stats = {metric: summarize(values, self.confidence) for metric, values in samples.items()}
+        
+        return BenchmarkResult(
+            rule_name=mdc_path.stem,
+            rule_path=str(mdc_path.relative_to(self.rules_dir)),
+            load_time_ms=stats['load_time_ms']['median'],
+            parse_time_ms=stats['parse_time_ms']['median'],
+            token_count=self.estimate_tokens(content),
+            line_count=content.count('\n') + 1,
+            file_size_bytes=mdc_path.stat().st_size,
+            memory_usage_kb=round(self._measure_memory(mdc_path, yaml_path), 2),
+            timestamp=datetime.now().isoformat(),
+            repeats=self.repeats,
+            cold_load_time_ms=stats['cold_load_time_ms']['median'],
+            cache_dropped=cache_dropped,
+            stats=stats,
+            samples={metric: [round(value, 4) for value in values] for metric, values in samples.items()}
+        )
+    
+    @staticmethod
+    def _timed_read(mdc_path: Path) -> Tuple[str, float]:
+        """Read through a fresh file handle, returning content and ms"""
+        start = time.perf_counter()
+        with open(mdc_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        return content, (time.perf_counter() - start) * 1000
+    
+    @staticmethod
+    def _timed_parse(yaml_path: Path) -> float:
+        """Load and decode the metadata sidecar, returning ms"""
+        start = time.perf_counter()
+        if yaml_path.exists():
+            with open(yaml_path, 'r', encoding='utf-8') as f:
+                yaml.safe_load(f)
+        return (time.perf_counter() - start) * 1000
+    
+    def _measure_memory(self, mdc_path: Path, yaml_path: Path) -> float:
+        """KB still allocated after one read and parse"""
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        content, _ = self._timed_read(mdc_path)
+        metadata = yaml.safe_load(yaml_path.read_text(encoding='utf-8')) if yaml_path.exists() else {}
+        used = tracemalloc.get_traced_memory()[0] - before
+        if started:
+            tracemalloc.stop()
+        del content, metadata
+        return used / 1024
+    
     def benchmark_all(self) -> None:
-        """Benchmark all rules in directory"""
+        """Benchmark all rules in directory
+        
+        The machine is fingerprinted and calibrated first, so reports from
+        different runners can be normalized. With ``workers`` > 1, rules are
+        dealt round-robin to worker processes and merged back in order.
+        """
         rule_files = list(self.rules_dir.rglob("*.mdc"))
         
-        logging.info(f"Benchmarking {len(rule_files)} rules...")
+        self.fingerprint = machine_fingerprint(calibration=True)
+        logging.info(f"Benchmarking {len(rule_files)} rules on {self.fingerprint['cpu_model']} "
+                     f"({self.fingerprint['id']})...")
         
+        start = time.perf_counter()
+        if self.workers > 1:
+            self._benchmark_sharded(rule_files)
+        else:
+            if self.pin_cpu is not None and not pin_to_cpu(self.pin_cpu):
+                logging.warning(f"Could not pin to CPU {self.pin_cpu}")
+            self._benchmark_serial(rule_files)
+        self.wall_time_ms = round((time.perf_counter() - start) * 1000, 2)
+    
+    def _benchmark_sharded(self, rule_files: List[Path]) -> None:
+        settings = {'repeats': self.repeats, 'warmup': self.warmup,
+                    'drop_cache': self.drop_cache, 'confidence': self.confidence}
+        shards = [rule_files[i::self.workers] for i in range(self.workers)]
+        cpus = _worker_cpus(self.pin_cpu, self.workers)
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(_benchmark_shard, self.rules_dir, shard, settings, cpu)
+                       for shard, cpu in zip(shards, cpus)]
+            shard_results = [future.result() for future in futures]
+        for i in range(len(rule_files)):
+            result = shard_results[i % self.workers][i // self.workers]
+            if result is not None:
+                self.results.append(BenchmarkResult(**result))
+    
+    def _benchmark_serial(self, rule_files: List[Path]) -> None:
         for i, rule_path in enumerate(rule_files, 1):
             try:
                 result = self.benchmark_rule(rule_path)
@@ -122,16 +300,39 @@ class RuleBenchmarker:
         largest_by_tokens = max(self.results, key=lambda r: r.token_count)
         largest_by_lines = max(self.results, key=lambda r: r.line_count)
         slowest_load = max(self.results, key=lambda r: r.load_time_ms)
+        avg_parse_time = sum(r.parse_time_ms for r in self.results) / len(self.results)
+        
+        summary = {
+            "total_rules": len(self.results),
+            "total_tokens": total_tokens,
+            "total_lines": total_lines,
+            "avg_load_time_ms": round(avg_load_time, 2),
+            "avg_tokens_per_rule": round(total_tokens / len(self.results), 2),
+            "repeats": self.repeats,
+            "workers": self.workers,
+            "pinned_cpu": self.pin_cpu
+        }
+        if self.wall_time_ms:
+            summary["wall_time_ms"] = self.wall_time_ms
+            summary["throughput_rules_per_s"] = round(len(self.results) / self.wall_time_ms * 1000, 2)
+        
+        # Timings in units of this machine's calibration run, comparable across fingerprints
+        normalized = None
+        calibration = (self.fingerprint or {}).get('calibration_ms')
+        if calibration:
+            normalized = {
+                "unit": "calibration",
+                "avg_load_time": round(avg_load_time / calibration, 6),
+                "avg_parse_time": round(avg_parse_time / calibration, 6),
+            }
+            if self.wall_time_ms:
+                normalized["wall_time"] = round(self.wall_time_ms / calibration, 4)
         
         return {
             "timestamp": datetime.now().isoformat(),
-            "summary": {
-                "total_rules": len(self.results),
-                "total_tokens": total_tokens,
-                "total_lines": total_lines,
-                "avg_load_time_ms": round(avg_load_time, 2),
-                "avg_tokens_per_rule": round(total_tokens / len(self.results), 2)
-            },
+            "machine": self.fingerprint,
+            "summary": summary,
+            "normalized": normalized,
             "outliers": {
                 "largest_by_tokens": largest_by_tokens.to_dict(),
                 "largest_by_lines": largest_by_lines.to_dict(),
@@ -140,8 +341,8 @@ class RuleBenchmarker:
             "rules": [r.to_dict() for r in self.results]
         }
     
-    def save_baseline(self, output_path: Path) -> None:
-        """Save benchmark results as baseline"""
+    def save_baseline(self, output_path: Path) -> Dict[str, Dict]:
+        """Save benchmark results as baseline and return the baseline entries"""
         report = self.generate_report()
         
         # Also create simplified baseline format
@@ -156,6 +357,13 @@ class RuleBenchmarker:
                 "file_size_bytes": result.file_size_bytes,
                 "memory_usage_mb": result.memory_usage_kb / 1024
             }
+            if result.samples:
+                # Lets compare_benchmarks test differences rather than single values
+                baseline[result.rule_name]["samples"] = {
+                    metric: result.samples[metric]
+                    for metric in ("load_time_ms", "parse_time_ms", "validation_time_ms")
+                }
+                baseline[result.rule_name]["stats"] = result.stats
         
         with open(output_path, 'w') as f:
             json.dump(baseline, f, indent=2)
@@ -167,6 +375,7 @@ class RuleBenchmarker:
         
         logging.info(f"\nBaseline saved to: {output_path}")
         logging.info(f"Full report saved to: {report_path}")
+        return baseline
 
 def main():
     parser = argparse.ArgumentParser(description="Benchmark cursor rules performance")
@@ -175,12 +384,43 @@ def main():
     parser.add_argument('--rules-dir', type=Path, 
                         default=Path(__file__).parent.parent / 'rules',
                         help='Rules directory path')
+    parser.add_argument('--repeats', type=int, default=1,
+                        help='Timed runs per rule; more than one enables statistical mode')
+    parser.add_argument('--warmup', type=int, default=2,
+                        help='Untimed runs per rule before sampling (statistical mode)')
+    parser.add_argument('--no-drop-cache', action='store_true',
+                        help='Skip evicting rule files from the page cache before cold reads')
+    parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE,
+                        help='Confidence level for median intervals')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Shard rules across this many processes (throughput mode)')
+    parser.add_argument('--pin-cpu', type=int,
+                        help='Pin to this CPU; with --workers, each worker gets its own CPU from here on')
+    parser.add_argument('--history', type=Path,
+                        help='Also append the results to this benchmark history database')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Report import time for this command instead of running it normally')
     
     args = parser.parse_args()
     
-    benchmarker = RuleBenchmarker(args.rules_dir)
+    if args.profile_startup:
+        from startup_profile import report_startup
+        report_startup(__file__)
+        return
+    
+    get_token_counter(args.rules_dir.parent / '.cache' / 'token_counts.json')
+    benchmarker = RuleBenchmarker(args.rules_dir, repeats=args.repeats, warmup=args.warmup,
+                                  drop_cache=not args.no_drop_cache, confidence=args.confidence,
+                                  workers=args.workers, pin_cpu=args.pin_cpu)
     benchmarker.benchmark_all()
-    benchmarker.save_baseline(Path(args.output))
+    baseline = benchmarker.save_baseline(Path(args.output))
+    if args.history:
+        from benchmark_history import BenchmarkHistory
+        history = BenchmarkHistory(args.history)
+        history.record(baseline, suite='rules', machine=benchmarker.fingerprint['id'],
+                       meta={'repeats': args.repeats, 'workers': args.workers,
+                             'fingerprint': benchmarker.fingerprint})
+        history.close()
     
     # Print summary
     report = benchmarker.generate_report()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark Statistics
+Robust summaries and two-sample tests for repeated timing measurements
+"""
+
+import math
+import random
+import statistics
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+DEFAULT_CONFIDENCE = 0.95
+# Tukey fence: samples beyond this many IQRs outside the quartiles are outliers
+OUTLIER_FENCE = 1.5
+# Mann-Whitney p-values are exact up to this many samples per side when untied
+EXACT_U_LIMIT = 20
+BOOTSTRAP_RESAMPLES = 2000
+
+
+def percentile(sorted_samples: Sequence[float], q: float) -> float:
+    """q-th percentile of already sorted samples, linearly interpolated"""
+    if not sorted_samples:
+        raise ValueError("percentile of no samples")
+    position = (len(sorted_samples) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    weight = position - lower
+    return sorted_samples[lower] * (1 - weight) + sorted_samples[upper] * weight
+
+
+def reject_outliers(samples: Sequence[float], fence: float = OUTLIER_FENCE) -> Tuple[List[float], List[float]]:
+    """Split samples into kept and rejected using Tukey's IQR fences
+
+    Timing noise is one-sided (interrupts, page faults, GC), so in practice
+    this mostly drops slow stragglers. Fewer than four samples are kept as is.
+    """
+    ordered = sorted(samples)
+    if len(ordered) < 4:
+        return ordered, []
+    q1, q3 = percentile(ordered, 25), percentile(ordered, 75)
+    spread = (q3 - q1) * fence
+    low, high = q1 - spread, q3 + spread
+    kept = [x for x in ordered if low <= x <= high]
+    rejected = [x for x in ordered if x < low or x > high]
+    return kept, rejected
+
+
+def median_confidence_interval(sorted_samples: Sequence[float],
+                               confidence: float = DEFAULT_CONFIDENCE) -> Tuple[float, float]:
+    """Distribution-free confidence interval for the median from order statistics
+
+    Uses the binomial(n, 1/2) distribution of the number of samples below
+    the median, so no normality assumption is made. With too few samples
+    for the requested confidence the full range is returned.
+    """
+    n = len(sorted_samples)
+    if not n:
+        raise ValueError("confidence interval of no samples")
+    tail = (1 - confidence) / 2
+    cumulative = 0.0
+    rank = 0
+    for i in range(n):
+        probability = math.comb(n, i) / 2 ** n
+        if cumulative + probability > tail:
+            break
+        cumulative += probability
+        rank = i + 1
+    if rank == 0:
+        return sorted_samples[0], sorted_samples[-1]
+    return sorted_samples[rank - 1], sorted_samples[n - rank]
+
+
+def summarize(samples: Sequence[float], confidence: float = DEFAULT_CONFIDENCE,
+              reject: bool = True, digits: int = 4) -> Dict[str, float]:
+    """Summary statistics over samples, after outlier rejection unless disabled"""
+    kept, rejected = reject_outliers(samples) if reject else (sorted(samples), [])
+    if not kept:
+        raise ValueError("summary of no samples")
+    ci_low, ci_high = median_confidence_interval(kept, confidence)
+    summary = {
+        'n': len(kept),
+        'outliers': len(rejected),
+        'min': min(kept),
+        'median': statistics.median(kept),
+        'mean': statistics.fmean(kept),
+        'p95': percentile(kept, 95),
+        'stddev': statistics.stdev(kept) if len(kept) > 1 else 0.0,
+        'ci_low': ci_low,
+        'ci_high': ci_high,
+    }
+    summary = {key: round(value, digits) if isinstance(value, float) else value
+               for key, value in summary.items()}
+    summary['confidence'] = confidence
+    return summary
+
+
+def _rank(values: Sequence[float]) -> Tuple[List[float], List[int]]:
+    """Average ranks (1-based) and the sizes of tied groups"""
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0.0] * len(values)
+    ties = []
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        if j > i:
+            ties.append(j - i + 1)
+        i = j + 1
+    return ranks, ties
+
+
+@lru_cache(maxsize=None)
+def _exact_u_distribution(n1: int, n2: int) -> Tuple[int, ...]:
+    """Number of orderings giving each U statistic, for untied samples"""
+    # counts[a][b][u]: arrangements of a and b samples with U == u
+    counts = [[None] * (n2 + 1) for _ in range(n1 + 1)]
+    for a in range(n1 + 1):
+        for b in range(n2 + 1):
+            if a == 0 or b == 0:
+                counts[a][b] = [1]
+                continue
+            size = a * b + 1
+            row = [0] * size
+            # The largest value comes from the first sample (beating all b) or the second
+            for u, n in enumerate(counts[a - 1][b]):
+                row[u + b] += n
+            for u, n in enumerate(counts[a][b - 1]):
+                row[u] += n
+            counts[a][b] = row
+    return tuple(counts[n1][n2])
+
+
+def mann_whitney_u(first: Sequence[float], second: Sequence[float]) -> Tuple[float, float]:
+    """Two-sided Mann-Whitney U test; returns (U of ``second``, p-value)
+
+    Small untied samples use the exact distribution; otherwise the normal
+    approximation with tie and continuity corrections.
+    """
+    n1, n2 = len(first), len(second)
+    if not n1 or not n2:
+        raise ValueError("Mann-Whitney U needs samples on both sides")
+    ranks, ties = _rank(list(first) + list(second))
+    u2 = sum(ranks[n1:]) - n2 * (n2 + 1) / 2
+    mean = n1 * n2 / 2
+
+    if not ties and n1 <= EXACT_U_LIMIT and n2 <= EXACT_U_LIMIT:
+        distribution = _exact_u_distribution(n1, n2)
+        total = math.comb(n1 + n2, n1)
+        extreme = min(u2, n1 * n2 - u2)
+        tail = sum(distribution[:int(extreme) + 1]) / total
+        return u2, min(1.0, 2 * tail)
+
+    n = n1 + n2
+    tie_term = sum(t ** 3 - t for t in ties) / (n * (n - 1))
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term)
+    if variance <= 0:
+        return u2, 1.0  # Every value identical
+    z = (abs(u2 - mean) - 0.5) / math.sqrt(variance)
+    return u2, min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def bootstrap_median_difference(first: Sequence[float], second: Sequence[float],
+                                confidence: float = DEFAULT_CONFIDENCE,
+                                resamples: int = BOOTSTRAP_RESAMPLES, seed: int = 0) -> Tuple[float, float]:
+    """Percentile bootstrap interval for median(second) - median(first)
+
+    Seeded, so the same inputs always give the same interval.
+    """
+    if not first or not second:
+        raise ValueError("bootstrap needs samples on both sides")
+    rng = random.Random(seed)
+    differences = sorted(
+        statistics.median(rng.choices(second, k=len(second)))
+        - statistics.median(rng.choices(first, k=len(first)))
+        for _ in range(resamples)
+    )
+    tail = (1 - confidence) / 2 * 100
+    return percentile(differences, tail), percentile(differences, 100 - tail)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Build Manifest
+Content hashes of what each generated output was built from, and writes
+that leave unchanged files untouched
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+MANIFEST_VERSION = 1
+DEFAULT_MANIFEST = Path('.cache') / 'rulesync_manifest.json'
+
+
+def text_digest(text: Union[str, bytes]) -> str:
+    if isinstance(text, str):
+        text = text.encode('utf-8')
+    return hashlib.sha256(text).hexdigest()
+
+
+def file_digest(path: Path) -> Optional[str]:
+    """Digest of a file's bytes, or None when it cannot be read"""
+    try:
+        return text_digest(Path(path).read_bytes())
+    except OSError:
+        return None
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Atomically replace ``path`` with ``text`` unless it already holds exactly that
+
+    Returns whether the file was written. Unchanged files keep their mtime,
+    so editors and file watchers do not see a spurious change.
+    """
+    path = Path(path)
+    encoded = text.encode('utf-8')
+    try:
+        if not path.is_symlink() and path.read_bytes() == encoded:
+            return False
+    except OSError:
+        pass  # Missing or unreadable; write it
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(encoded)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+
+class BuildManifest:
+    """Per-output build records: input digests, output digest and build time
+
+    An output whose recorded inputs match the current ones and whose files
+    are intact does not need rebuilding.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if self.path.exists():
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    self.entries = data.get('entries', {})
+            except (OSError, ValueError):
+                pass  # A corrupt manifest only costs one full rebuild
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.entries.get(key)
+
+    def put(self, key: str, entry: Dict) -> None:
+        with self._lock:
+            self.entries[key] = entry
+            self._dirty = True
+
+    def is_current(self, key: str, inputs: Dict, files: Dict[str, Path]) -> bool:
+        """Whether ``key`` was built from ``inputs`` and its ``files`` still hold what was written"""
+        entry = self.get(key)
+        if entry is None or entry.get('inputs') != inputs:
+            return False
+        recorded = entry.get('files', {})
+        return set(recorded) == set(files) and all(
+            file_digest(path) == recorded[name] for name, path in files.items())
+
+    def save(self) -> None:
+        """Atomically write the manifest if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {'version': MANIFEST_VERSION, 'entries': self.entries}
+            write_if_changed(self.path, json.dumps(payload, indent=2, sort_keys=True))
+            self._dirty = False
@@ -1,122 +1,301 @@
 #!/usr/bin/env python3
-"""Compare benchmark results and generate markdown report"""
+"""Compare benchmark results and generate markdown or JSON reports
+
+Each metric has a policy: a change must clear both an absolute and a
+relative threshold, and for noisy timing metrics with multi-sample results
+(``benchmark_rules.py --repeats N``) it must also be statistically
+significant, so sub-millisecond jitter is not reported as a regression.
+"""
 
-import json
 import sys
+import json
+import argparse
 from pathlib import Path
-from typing import Dict, Any
+from dataclasses import dataclass, asdict, replace
+from typing import Dict, Any, List, Optional
+
+from benchmark_stats import bootstrap_median_difference, mann_whitney_u
+
+# With fewer samples per side, noisy metrics are judged on thresholds alone
+MIN_SAMPLES = 5
+
+
+@dataclass(frozen=True)
+class MetricPolicy:
+    """When a change in one metric counts as a regression or improvement"""
+    relative: float  # Fraction of the baseline value, e.g. 0.2 for 20%
+    absolute: float  # In the metric's own unit
+    noisy: bool = False  # Test samples for significance when available
+    alpha: float = 0.05
+
+
+DEFAULT_POLICIES: Dict[str, MetricPolicy] = {
+    'token_count': MetricPolicy(relative=0.10, absolute=1),
+    'validation_time_ms': MetricPolicy(relative=0.20, absolute=0.5, noisy=True),
+    'memory_usage_mb': MetricPolicy(relative=0.25, absolute=1.0, noisy=True),
+}
+
+METRIC_LABELS = {
+    'token_count': 'Token Change',
+    'validation_time_ms': 'Time Change',
+    'memory_usage_mb': 'Memory Change',
+}
+
 
 def load_metrics(filepath: str) -> Dict[str, Any]:
     """Load benchmark metrics from JSON file"""
     with open(filepath, 'r') as f:
         return json.load(f)
 
-def compare_metrics(baseline: Dict, current: Dict) -> str:
-    """Generate markdown comparison report"""
-    report = ["# 📊 Performance Comparison Report\n"]
-    
-    # Track changes
-    improvements = []
-    regressions = []
-    new_rules = []
-    
-    # Compare each rule
+
+def load_policies(filepath: Optional[str] = None) -> Dict[str, MetricPolicy]:
+    """Default policies, overridden per metric by a JSON file if given
+
+    The file maps metric names to any of ``relative``, ``absolute``,
+    ``noisy`` and ``alpha``; unknown metrics are added.
+    """
+    policies = dict(DEFAULT_POLICIES)
+    if filepath:
+        for metric, overrides in load_metrics(filepath).items():
+            base = policies.get(metric, MetricPolicy(relative=0.0, absolute=0.0))
+            policies[metric] = replace(base, **overrides)
+    return policies
+
+
+def _value(metrics: Dict, metric: str) -> Optional[float]:
+    value = metrics.get(metric)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+
+def _samples(metrics: Dict, metric: str) -> List[float]:
+    samples = metrics.get('samples')
+    if not isinstance(samples, dict):
+        return []
+    return [value for value in samples.get(metric) or [] if isinstance(value, (int, float))]
+
+
+def compare_metric(metric: str, policy: MetricPolicy, base: Dict, current: Dict) -> Optional[Dict[str, Any]]:
+    """Judge one metric of one rule, or None if either side lacks it"""
+    base_value, current_value = _value(base, metric), _value(current, metric)
+    if base_value is None or current_value is None:
+        return None
+
+    delta = current_value - base_value
+    pct = delta / base_value * 100 if base_value > 0 else None
+    exceeds = abs(delta) >= policy.absolute and (
+        base_value <= 0 or abs(delta) / base_value > policy.relative
+    )
+
+    comparison: Dict[str, Any] = {
+        'baseline': base_value,
+        'current': current_value,
+        'delta': delta,
+        'pct': pct,
+        'method': 'threshold',
+        'p_value': None,
+        'median_delta_ci': None,
+    }
+    significant = True
+    base_samples, current_samples = _samples(base, metric), _samples(current, metric)
+    if policy.noisy and len(base_samples) >= MIN_SAMPLES and len(current_samples) >= MIN_SAMPLES:
+        _, p_value = mann_whitney_u(base_samples, current_samples)
+        low, high = bootstrap_median_difference(base_samples, current_samples, confidence=1 - policy.alpha)
+        comparison.update(method='mann-whitney', p_value=round(p_value, 6),
+                          median_delta_ci=[round(low, 4), round(high, 4)])
+        significant = p_value < policy.alpha
+
+    if exceeds and significant:
+        comparison['verdict'] = 'regression' if delta > 0 else 'improvement'
+    else:
+        comparison['verdict'] = 'unchanged'
+    return comparison
+
+
+def compare_benchmarks(baseline: Dict, current: Dict,
+                       policies: Optional[Dict[str, MetricPolicy]] = None) -> Dict[str, Any]:
+    """Machine-readable comparison of two benchmark files"""
+    policies = policies or DEFAULT_POLICIES
+    rules: Dict[str, Dict[str, Any]] = {}
+    improvements, regressions, new_rules = [], [], []
+
     for rule_name, current_metrics in current.items():
         if rule_name not in baseline:
             new_rules.append(rule_name)
             continue
-        
-        base_metrics = baseline[rule_name]
-        
-        # Calculate deltas
-        token_delta = current_metrics['token_count'] - base_metrics['token_count']
-        time_delta = current_metrics['validation_time_ms'] - base_metrics['validation_time_ms']
-        
-        # Percentage changes
-        token_pct = (token_delta / base_metrics['token_count'] * 100) if base_metrics.get('token_count', 0) > 0 else 0
-        time_pct = (time_delta / base_metrics['validation_time_ms'] * 100) if base_metrics.get('validation_time_ms', 0) > 0 else 0
-        
-        # Categorize changes
-        if token_pct > 10 or time_pct > 20:
-            regressions.append({
-                'rule': rule_name,
-                'token_delta': token_delta,
-                'token_pct': token_pct,
-                'time_delta': time_delta,
-                'time_pct': time_pct
-            })
-        elif token_pct < -10 or time_pct < -20:
-            improvements.append({
-                'rule': rule_name,
-                'token_delta': token_delta,
-                'token_pct': token_pct,
-                'time_delta': time_delta,
-                'time_pct': time_pct
-            })
-    
+
+        metrics = {}
+        for metric, policy in policies.items():
+            comparison = compare_metric(metric, policy, baseline[rule_name], current_metrics)
+            if comparison is not None:
+                metrics[metric] = comparison
+        verdicts = {comparison['verdict'] for comparison in metrics.values()}
+        verdict = ('regression' if 'regression' in verdicts
+                   else 'improvement' if 'improvement' in verdicts else 'unchanged')
+        rules[rule_name] = {'verdict': verdict, 'metrics': metrics}
+        if verdict == 'regression':
+            regressions.append(rule_name)
+        elif verdict == 'improvement':
+            improvements.append(rule_name)
+
+    removed_rules = sorted(rule for rule in baseline if rule not in current)
+
+    totals = {}
+    for metric in policies:
+        base_total = sum(_value(m, metric) or 0 for m in baseline.values())
+        current_total = sum(_value(m, metric) or 0 for m in current.values())
+        totals[metric] = {
+            'baseline_total': base_total,
+            'current_total': current_total,
+            'baseline_mean': base_total / len(baseline) if baseline else None,
+            'current_mean': current_total / len(current) if current else None,
+        }
+
+    return {
+        'policies': {metric: asdict(policy) for metric, policy in policies.items()},
+        'summary': {
+            'improvements': len(improvements),
+            'regressions': len(regressions),
+            'new_rules': len(new_rules),
+            'removed_rules': len(removed_rules),
+        },
+        'regressions': regressions,
+        'improvements': improvements,
+        'new_rules': sorted(new_rules),
+        'removed_rules': removed_rules,
+        'rules': rules,
+        'totals': totals,
+    }
+
+
+def _unit(metric: str) -> str:
+    if metric.endswith('_ms'):
+        return 'ms'
+    if metric.endswith('_mb'):
+        return 'MB'
+    return ''
+
+
+def _format_change(metric: str, comparison: Optional[Dict[str, Any]]) -> str:
+    if comparison is None:
+        return '–'
+    delta = comparison['delta']
+    unit = _unit(metric)
+    if unit:
+        text = f"{delta:+.2f}{unit}" if unit == 'MB' else f"{delta:+.1f}{unit}"
+    else:
+        text = f"{delta:+,.0f}"
+    text += f" ({comparison['pct']:+.1f}%)" if comparison['pct'] is not None else " (new)"
+    if comparison['p_value'] is not None:
+        text += f", p={comparison['p_value']:.3g}"
+    return text
+
+
+def format_markdown(comparison: Dict[str, Any], current: Dict) -> str:
+    """Render a comparison from ``compare_benchmarks`` for PR comments"""
+    report = ["# 📊 Performance Comparison Report\n"]
+    metrics = list(comparison['policies'])
+    rules = comparison['rules']
+
     # Summary section
+    summary = comparison['summary']
     report.append("## Summary\n")
-    report.append(f"- **Improvements**: {len(improvements)} rules")
-    report.append(f"- **Regressions**: {len(regressions)} rules")
-    report.append(f"- **New Rules**: {len(new_rules)} rules\n")
-    
+    report.append(f"- **Improvements**: {summary['improvements']} rules")
+    report.append(f"- **Regressions**: {summary['regressions']} rules")
+    report.append(f"- **New Rules**: {summary['new_rules']} rules")
+    report.append(f"- **Removed Rules**: {summary['removed_rules']} rules\n")
+
+    def table(rule_names: List[str], reverse: bool) -> None:
+        header = [METRIC_LABELS.get(metric, metric) for metric in metrics]
+        report.append("| Rule | " + " | ".join(header) + " |")
+        report.append("|------|" + "|".join('-' * (len(label) + 2) for label in header) + "|")
+
+        def sort_key(rule_name):
+            first = rules[rule_name]['metrics'].get(metrics[0]) if metrics else None
+            return first['pct'] or 0 if first else 0
+
+        for rule_name in sorted(rule_names, key=sort_key, reverse=reverse):
+            cells = [_format_change(metric, rules[rule_name]['metrics'].get(metric)) for metric in metrics]
+            report.append(f"| {rule_name} | " + " | ".join(cells) + " |")
+        report.append("")
+
     # Improvements
-    if improvements:
+    if comparison['improvements']:
         report.append("## ✅ Improvements\n")
-        report.append("| Rule | Token Change | Time Change |")
-        report.append("|------|--------------|-------------|")
-        for imp in sorted(improvements, key=lambda x: x['token_pct']):
-            report.append(f"| {imp['rule']} | {imp['token_delta']:+d} ({imp['token_pct']:+.1f}%) | {imp['time_delta']:+.1f}ms ({imp['time_pct']:+.1f}%) |")
-        report.append("")
-    
+        table(comparison['improvements'], reverse=False)
+
     # Regressions
-    if regressions:
+    if comparison['regressions']:
         report.append("## ⚠️ Performance Regressions\n")
-        report.append("| Rule | Token Change | Time Change |")
-        report.append("|------|--------------|-------------|")
-        for reg in sorted(regressions, key=lambda x: x['token_pct'], reverse=True):
-            report.append(f"| {reg['rule']} | {reg['token_delta']:+d} ({reg['token_pct']:+.1f}%) | {reg['time_delta']:+.1f}ms ({reg['time_pct']:+.1f}%) |")
-        report.append("")
-    
+        table(comparison['regressions'], reverse=True)
+
     # New rules
-    if new_rules:
+    if comparison['new_rules']:
         report.append("## 🆕 New Rules\n")
-        for rule in sorted(new_rules):
-            metrics = current[rule]
-            report.append(f"- **{rule}**: {metrics['token_count']} tokens, {metrics['validation_time_ms']:.1f}ms")
+        for rule in comparison['new_rules']:
+            metrics_now = current[rule]
+            tokens = _value(metrics_now, 'token_count')
+            time_ms = _value(metrics_now, 'validation_time_ms')
+            tokens_text = f"{tokens:.0f} tokens" if tokens is not None else "n/a tokens"
+            time_text = f"{time_ms:.1f}ms" if time_ms is not None else "n/a"
+            report.append(f"- **{rule}**: {tokens_text}, {time_text}")
+        report.append("")
+
+    # Removed rules
+    if comparison['removed_rules']:
+        report.append("## 🗑️ Removed Rules\n")
+        for rule in comparison['removed_rules']:
+            report.append(f"- **{rule}**")
         report.append("")
-    
+
     # Overall metrics
     report.append("## 📈 Overall Metrics\n")
-    
-    baseline_total_tokens = sum(m.get('token_count', 0) for m in baseline.values())
-    current_total_tokens = sum(m.get('token_count', 0) for m in current.values())
-    
-    report.append(f"- **Total Tokens**: {baseline_total_tokens:,} → {current_total_tokens:,} "
-                  f"({current_total_tokens - baseline_total_tokens:+,} / "
-                  f"{(current_total_tokens - baseline_total_tokens) / baseline_total_tokens * 100:+.1f}%)")
-    
-    baseline_avg_time = sum(m.get('validation_time_ms', 0) for m in baseline.values()) / len(baseline)
-    current_avg_time = sum(m.get('validation_time_ms', 0) for m in current.values()) / len(current)
-    
-    report.append(f"- **Avg Validation Time**: {baseline_avg_time:.1f}ms → {current_avg_time:.1f}ms "
-                  f"({current_avg_time - baseline_avg_time:+.1f}ms)")
-    
+
+    tokens = comparison['totals'].get('token_count')
+    if tokens is not None:
+        base_total, current_total = tokens['baseline_total'], tokens['current_total']
+        change = f"{current_total - base_total:+,.0f}"
+        if base_total:
+            change += f" / {(current_total - base_total) / base_total * 100:+.1f}%"
+        report.append(f"- **Total Tokens**: {base_total:,.0f} → {current_total:,.0f} ({change})")
+
+    times = comparison['totals'].get('validation_time_ms')
+    if times is not None and times['baseline_mean'] is not None and times['current_mean'] is not None:
+        report.append(f"- **Avg Validation Time**: {times['baseline_mean']:.1f}ms → {times['current_mean']:.1f}ms "
+                      f"({times['current_mean'] - times['baseline_mean']:+.1f}ms)")
+
     return "\n".join(report)
 
+
+def compare_metrics(baseline: Dict, current: Dict,
+                    policies: Optional[Dict[str, MetricPolicy]] = None) -> str:
+    """Generate markdown comparison report"""
+    return format_markdown(compare_benchmarks(baseline, current, policies), current)
+
+
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: compare_benchmarks.py <baseline.json> <current.json>")
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument('baseline', help='Baseline metrics JSON')
+    parser.add_argument('current', help='Current metrics JSON')
+    parser.add_argument('--json', dest='json_output', type=Path,
+                        help='Also write the machine-readable comparison here')
+    parser.add_argument('--policies', help='JSON file overriding per-metric policies')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='Exit with status 1 when any rule regressed')
+    args = parser.parse_args()
+
+    baseline = load_metrics(args.baseline)
+    current = load_metrics(args.current)
+    comparison = compare_benchmarks(baseline, current, load_policies(args.policies))
+
+    if args.json_output:
+        with open(args.json_output, 'w') as f:
+            json.dump(comparison, f, indent=2)
+    print(format_markdown(comparison, current))
+
+    if args.fail_on_regression and comparison['regressions']:
         sys.exit(1)
-    
-    baseline_path = sys.argv[1]
-    current_path = sys.argv[2]
-    
-    baseline = load_metrics(baseline_path)
-    current = load_metrics(current_path)
-    
-    report = compare_metrics(baseline, current)
-    print(report)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
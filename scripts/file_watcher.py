@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+File Watcher for rule trees
+Reports created/modified/deleted files via watchdog when installed, polling otherwise
+
+With watchdog a change is delivered within milliseconds of the filesystem
+event, plus any debounce. Polling restats the whole tree every
+``interval`` seconds, so changes can take up to that long to show up.
+"""
+
+import os
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from dataclasses import dataclass
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    # Optional dependency - fall back to stat polling
+    Observer = None
+    FileSystemEventHandler = object
+
+# Seconds between full rescans when polling; each one stats the whole tree
+POLL_INTERVAL = 0.5
+
+
+@dataclass(frozen=True)
+class FileChange:
+    """A single change to a watched file"""
+    path: Path
+    kind: str  # 'created', 'modified' or 'deleted'
+
+
+def _stat(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def coalesce(changes: Iterable[FileChange]) -> List[FileChange]:
+    """Collapse repeated changes to the same path into their net effect"""
+    net: Dict[Path, str] = {}
+    for change in changes:
+        previous = net.get(change.path)
+        if previous == 'created' and change.kind == 'deleted':
+            del net[change.path]
+        elif previous == 'created':
+            continue
+        elif previous == 'deleted' and change.kind == 'created':
+            net[change.path] = 'modified'
+        else:
+            net[change.path] = change.kind
+    return [FileChange(path, kind) for path, kind in sorted(net.items())]
+
+
+class _DirtyPathHandler(FileSystemEventHandler):
+    """Forward watchdog events to the watcher as dirty paths"""
+
+    def __init__(self, watcher: 'FileWatcher'):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        paths = [event.src_path]
+        if getattr(event, 'dest_path', None):
+            paths.append(event.dest_path)
+        if event.is_directory:
+            # A moved or deleted directory reports no events for the files inside it
+            if event.event_type in ('moved', 'deleted'):
+                self.watcher.mark_tree_dirty(Path(p) for p in paths)
+            return
+        self.watcher.mark_dirty(Path(p) for p in paths)
+
+
+class FileWatcher:
+    """Watch directories for changes to files with the given suffixes"""
+
+    def __init__(self, roots: Iterable[Path], suffixes: Tuple[str, ...] = ('.mdc', '.yaml'),
+                 interval: float = POLL_INTERVAL, debounce: float = 0.0,
+                 use_watchdog: Optional[bool] = None):
+        self.roots = [Path(root) for root in roots]
+        self.suffixes = tuple(suffixes)
+        self.interval = interval
+        self.debounce = debounce
+        if use_watchdog is None:
+            use_watchdog = Observer is not None
+        self.use_watchdog = use_watchdog and Observer is not None
+
+        self._snapshot = self.snapshot()
+        self._dirty: Set[Path] = set()
+        self._dirty_trees: Set[Path] = set()
+        self._dirty_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._observer = None
+
+    def _matches(self, path: Path) -> bool:
+        return path.name.endswith(self.suffixes)
+
+    def snapshot(self, roots: Optional[Iterable[Path]] = None) -> Dict[Path, Tuple[int, int]]:
+        """Stat every matching file under ``roots``, by default the watched roots"""
+        state = {}
+        pending = [str(root) for root in (self.roots if roots is None else roots)]
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            pending.append(entry.path)
+                        elif entry.name.endswith(self.suffixes):
+                            st = entry.stat()
+                            state[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+        return state
+
+    def poll(self, paths: Optional[Iterable[Path]] = None) -> List[FileChange]:
+        """Diff the tree, or only ``paths``, against the last snapshot"""
+        if paths is None:
+            current = self.snapshot()
+            candidates = set(current) | set(self._snapshot)
+        else:
+            candidates = {path for path in paths if self._matches(path)}
+            current = {}
+            for path in candidates:
+                stat = _stat(path)
+                if stat is not None:
+                    current[path] = stat
+
+        changes = []
+        for path in sorted(candidates):
+            before = self._snapshot.get(path)
+            after = current.get(path)
+            if before == after:
+                continue
+            if after is None:
+                del self._snapshot[path]
+                changes.append(FileChange(path, 'deleted'))
+            else:
+                self._snapshot[path] = after
+                changes.append(FileChange(path, 'created' if before is None else 'modified'))
+        return changes
+
+    def mark_dirty(self, paths: Iterable[Path]) -> None:
+        """Queue paths for re-checking and wake the watch thread"""
+        with self._dirty_lock:
+            self._dirty.update(path for path in paths if self._matches(path))
+        self._wakeup.set()
+
+    def mark_tree_dirty(self, directories: Iterable[Path]) -> None:
+        """Queue every file that was or now is under ``directories`` for re-checking"""
+        with self._dirty_lock:
+            self._dirty_trees.update(directories)
+        self._wakeup.set()
+
+    def _drain_dirty(self) -> Set[Path]:
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+            trees, self._dirty_trees = self._dirty_trees, set()
+        if trees:
+            # Expanded here, on the watch thread, which owns the snapshot
+            dirty.update(self.snapshot(trees))
+            dirty.update(path for path in self._snapshot
+                         if any(path.is_relative_to(tree) for tree in trees))
+        return dirty
+
+    def start(self, callback: Callable[[List[FileChange]], None]) -> None:
+        """Deliver batches of changes to ``callback`` from a background thread"""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        if self.use_watchdog:
+            self._observer = Observer()
+            handler = _DirtyPathHandler(self)
+            for root in self.roots:
+                if root.exists():
+                    self._observer.schedule(handler, str(root), recursive=True)
+            self._observer.start()
+        self._thread = threading.Thread(target=self._run, args=(callback,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _next_batch(self) -> List[FileChange]:
+        if self._observer is not None:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self.debounce:
+                # Keep collecting until the burst of saves goes quiet
+                while self._wakeup.wait(self.debounce) and not self._stopping.is_set():
+                    self._wakeup.clear()
+            return self.poll(self._drain_dirty())
+
+        self._stopping.wait(self.interval)
+        changes = self.poll()
+        while changes and self.debounce and not self._stopping.is_set():
+            self._stopping.wait(self.debounce)
+            more = self.poll()
+            if not more:
+                break
+            changes.extend(more)
+        return coalesce(changes)
+
+    def _run(self, callback: Callable[[List[FileChange]], None]) -> None:
+        while not self._stopping.is_set():
+            changes = self._next_batch()
+            if changes and not self._stopping.is_set():
+                try:
+                    callback(changes)
+                except Exception:
+                    # One bad batch must not end watching; later changes still arrive
+                    logging.exception("Error handling file changes")
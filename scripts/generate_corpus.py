@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Synthetic Rule Corpus Generator
+Deterministic, seeded rule trees of any size for scale testing the toolchain
+
+Line counts follow a log-normal fitted to the real rules (median about 70
+lines, with a long tail of very large rules). Each rule is written as a split
+.mdc/.yaml pair, as frontmatter only, or with both, and carries tags, a
+dependency graph with occasional cycles and missing targets, and ``@Rule:``
+references in its body. The same seed and size always give the same tree.
+"""
+
+import math
+import random
+import argparse
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import yaml
+
+# Use libyaml when present; dumping dominates large corpora
+_Dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+CATEGORIES = (
+    ('000-core', 0.05),
+    ('100-cognitive', 0.15),
+    ('200-domain', 0.20),
+    ('300-integration', 0.10),
+    ('400-patterns', 0.30),
+    ('500-safety', 0.10),
+    ('600-experimental', 0.10),
+)
+
+APPROVED_TAGS = (
+    'foundational', 'strategic', 'cognitive-enhancement', 'reasoning', 'performance',
+    'safety', 'quality', 'optimization', 'domain-specific', 'specialized', 'integration',
+    'tooling', 'patterns', 'best-practices', 'experimental', 'research', 'evolution',
+    'meta-learning', 'security', 'validation', 'prompt-safety', 'analytics',
+    'metacognition', 'self-improvement', 'feedback-loop',
+)
+UNAPPROVED_TAGS = ('legacy', 'draft', 'misc')
+
+WORDS = (
+    'api', 'cache', 'context', 'review', 'schema', 'prompt', 'risk', 'budget', 'token',
+    'pipeline', 'model', 'query', 'trace', 'index', 'policy', 'audit', 'plan', 'signal',
+    'release', 'design', 'test', 'metric', 'latency', 'sync', 'profile', 'graph',
+    'analysis', 'feedback', 'safety', 'refactor', 'stream', 'batch', 'memory', 'workflow',
+)
+SECTIONS = ('Purpose', 'Requirements', 'Examples', 'Anti-patterns', 'Verification', 'Notes')
+PHASE_PHRASES = (
+    'Start with a divergent pass over the options.',
+    'Close with a convergent synthesis of the best candidates.',
+    'Keep internal_thought separate from user_facing_response.',
+    'Enter the divergence phase before committing to a design.',
+)
+
+# Log-normal line counts fitted to the real tree
+LINES_MU = math.log(70)
+LINES_SIGMA = 0.6
+MIN_LINES = 8
+MAX_LINES = 2000
+GIANT_RATIO = 0.005  # Rules an order of magnitude past the budget, like the real outliers
+GIANT_LINES = (1000, 8000)
+
+
+@dataclass
+class CorpusSpec:
+    """Knobs for one generated corpus"""
+    size: int
+    seed: int = 0
+    # Storage variants: .mdc + .yaml, frontmatter only, or frontmatter plus .yaml
+    variant_weights: Tuple[float, float, float] = (0.6, 0.3, 0.1)
+    max_dependencies: int = 3
+    cycle_ratio: float = 0.01  # Dependencies pointing at a later rule, closing cycles
+    missing_ratio: float = 0.02  # Dependencies on rules that do not exist
+    reference_ratio: float = 0.3  # Rules whose body references other rules
+    phase_ratio: float = 0.05  # Rules mentioning divergence/convergence markers
+    unapproved_tag_ratio: float = 0.02
+    conflict_ratio: float = 0.02
+
+
+@dataclass
+class PlannedRule:
+    name: str
+    category: str
+    variant: str
+    lines: int
+    tags: List[str]
+    dependencies: List[str] = field(default_factory=list)
+    references: List[str] = field(default_factory=list)
+    conflicts: List[Dict] = field(default_factory=list)
+    phase: bool = False
+
+    @property
+    def path(self) -> str:
+        return f"{self.category}/{self.name}.mdc"
+
+
+VARIANTS = ('split', 'frontmatter', 'both')
+
+
+class CorpusGenerator:
+    """Plan and write a synthetic rule tree"""
+
+    def __init__(self, spec: CorpusSpec):
+        self.spec = spec
+        self.rng = random.Random(spec.seed)
+        self.rules: List[PlannedRule] = []
+
+    def plan(self) -> List[PlannedRule]:
+        """Decide every rule's shape and links before anything is written"""
+        rng, spec = self.rng, self.spec
+        categories = [name for name, _ in CATEGORIES]
+        weights = [weight for _, weight in CATEGORIES]
+        # Zipf-like tag popularity: a few tags are on most rules
+        tag_weights = [1 / (rank + 1) for rank in range(len(APPROVED_TAGS))]
+
+        self.rules = []
+        for i in range(spec.size):
+            category = rng.choices(categories, weights)[0]
+            number = int(category[:3]) + i % 100
+            slug = '-'.join(rng.sample(WORDS, rng.randint(1, 3)))
+            if rng.random() < GIANT_RATIO:
+                lines = rng.randint(*GIANT_LINES)
+            else:
+                lines = int(min(MAX_LINES, max(MIN_LINES, rng.lognormvariate(LINES_MU, LINES_SIGMA))))
+            tags = sorted(set(rng.choices(APPROVED_TAGS, tag_weights, k=rng.randint(1, 4))))
+            if rng.random() < spec.unapproved_tag_ratio:
+                tags.append(rng.choice(UNAPPROVED_TAGS))
+            self.rules.append(PlannedRule(
+                name=f"{number:03d}-{slug}-{i}",
+                category=category,
+                variant=rng.choices(VARIANTS, spec.variant_weights)[0],
+                lines=lines,
+                tags=tags,
+                phase=rng.random() < spec.phase_ratio,
+            ))
+
+        for i, rule in enumerate(self.rules):
+            for _ in range(rng.randint(0, spec.max_dependencies)):
+                rule.dependencies.append(self._dependency(i))
+            rule.dependencies = sorted(set(rule.dependencies))
+            if rng.random() < spec.reference_ratio:
+                rule.references = [self.rules[rng.randrange(len(self.rules))].name
+                                   for _ in range(rng.randint(1, 3))]
+            if rng.random() < spec.conflict_ratio:
+                conflict = {'rule': self.rules[rng.randrange(len(self.rules))].name}
+                if rng.random() < 0.5:
+                    conflict['resolution'] = 'prefer-higher-priority'
+                rule.conflicts.append(conflict)
+        return self.rules
+
+    def _dependency(self, index: int) -> str:
+        """A dependency of rule ``index``, mostly on earlier rules so the graph is mostly acyclic"""
+        rng, spec = self.rng, self.spec
+        roll = rng.random()
+        if roll < spec.missing_ratio:
+            return f"000-core/{rng.randint(0, 999):03d}-missing-{index}.mdc"
+        if roll < spec.missing_ratio + spec.cycle_ratio and index + 1 < len(self.rules):
+            target = self.rules[rng.randrange(index + 1, len(self.rules))]
+        elif index:
+            # Preferential attachment: early rules (core-like) collect most dependents
+            target = self.rules[int(index * rng.random() ** 2)]
+        else:
+            target = self.rules[0]
+        return target.path
+
+    def render_body(self, rule: PlannedRule) -> str:
+        rng = self.rng
+        lines = [f"# {rule.name}", ""]
+        references = [f"See @Rule:{name} for related guidance." for name in rule.references]
+        if rule.phase:
+            references.append(rng.choice(PHASE_PHRASES))
+        section = 0
+        while len(lines) < rule.lines:
+            if len(lines) % 12 == 2:
+                lines.extend([f"* **{SECTIONS[section % len(SECTIONS)]}**:", ""])
+                section += 1
+            elif references and rng.random() < 0.2:
+                lines.append(f"  - {references.pop()}")
+            else:
+                words = rng.choices(WORDS, k=rng.randint(4, 14))
+                lines.append(f"  - {' '.join(words).capitalize()}.")
+        lines.extend(f"  - {line}" for line in references)
+        return '\n'.join(lines) + '\n'
+
+    def metadata(self, rule: PlannedRule, index: int) -> Dict:
+        created = f"2025-{index % 12 + 1:02d}-{index % 28 + 1:02d}"
+        return {
+            'version': f"1.{index % 10}.{index % 7}",
+            'description': f"Synthetic rule {rule.name.split('-', 1)[1].replace('-', ' ')}",
+            'author': 'generate_corpus',
+            'created': created,
+            'category': rule.category,
+            'alwaysApply': rule.category == '000-core',
+            'performance': {'tokenReduction': '0%', 'processingOverhead': 'minimal'},
+            'tags': rule.tags,
+            'dependencies': rule.dependencies,
+            'conflicts': rule.conflicts,
+        }
+
+    def write(self, rules_dir: Path) -> Dict:
+        """Write the planned tree under ``rules_dir`` and summarize it"""
+        if not self.rules:
+            self.plan()
+        rules_dir.mkdir(parents=True, exist_ok=True)
+        for category, _ in CATEGORIES:
+            (rules_dir / category).mkdir(exist_ok=True)
+            with open(rules_dir / category / '_category.yaml', 'w', encoding='utf-8') as f:
+                yaml.dump({'category': category, 'description': f"Rules for {category}"}, f, Dumper=_Dumper)
+
+        total_bytes = 0
+        for index, rule in enumerate(self.rules):
+            metadata = self.metadata(rule, index)
+            body = self.render_body(rule)
+            metadata_text = yaml.dump(metadata, Dumper=_Dumper, sort_keys=False)
+            mdc_text = body if rule.variant == 'split' else f"---\n{metadata_text}---\n\n{body}"
+            base = rules_dir / rule.category / rule.name
+            with open(base.with_suffix('.mdc'), 'w', encoding='utf-8') as f:
+                f.write(mdc_text)
+            total_bytes += len(mdc_text)
+            if rule.variant != 'frontmatter':
+                with open(base.with_suffix('.yaml'), 'w', encoding='utf-8') as f:
+                    f.write(metadata_text)
+                total_bytes += len(metadata_text)
+        return self.summary(total_bytes)
+
+    def summary(self, total_bytes: int = 0) -> Dict:
+        names = {rule.path for rule in self.rules}
+        dependencies = [dep for rule in self.rules for dep in rule.dependencies]
+        positions = {rule.path: i for i, rule in enumerate(self.rules)}
+        return {
+            'size': len(self.rules),
+            'seed': self.spec.seed,
+            'bytes': total_bytes,
+            'variants': dict(Counter(rule.variant for rule in self.rules)),
+            'lines': {
+                'median': sorted(rule.lines for rule in self.rules)[len(self.rules) // 2] if self.rules else 0,
+                'max': max((rule.lines for rule in self.rules), default=0),
+            },
+            'dependencies': len(dependencies),
+            'missing_dependencies': sum(dep not in names for dep in dependencies),
+            'forward_dependencies': sum(
+                positions.get(dep, -1) > i
+                for i, rule in enumerate(self.rules) for dep in rule.dependencies
+            ),
+            'references': sum(len(rule.references) for rule in self.rules),
+        }
+
+
+def generate_corpus(project_root: Path, size: int, seed: int = 0, **options) -> Path:
+    """Write a synthetic corpus to ``project_root/rules`` and return that directory"""
+    rules_dir = Path(project_root) / 'rules'
+    CorpusGenerator(CorpusSpec(size=size, seed=seed, **options)).write(rules_dir)
+    return rules_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic rule corpus")
+    parser.add_argument('output', type=Path, help='Directory to write the rules tree into')
+    parser.add_argument('--size', type=int, default=1000, help='Number of rules')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--cycle-ratio', type=float, default=CorpusSpec.cycle_ratio,
+                        help='Fraction of dependencies pointing forward, closing cycles')
+    parser.add_argument('--missing-ratio', type=float, default=CorpusSpec.missing_ratio,
+                        help='Fraction of dependencies on rules that do not exist')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    generator = CorpusGenerator(CorpusSpec(size=args.size, seed=args.seed, cycle_ratio=args.cycle_ratio,
+                                           missing_ratio=args.missing_ratio))
+    summary = generator.write(args.output)
+    logging.info(f"Wrote {summary['size']} rules ({summary['bytes']:,} bytes) to {args.output}")
+    logging.info(f"Variants: {summary['variants']}")
+    logging.info(f"Dependencies: {summary['dependencies']} "
+                 f"({summary['missing_dependencies']} missing, {summary['forward_dependencies']} forward)")
+
+
+if __name__ == '__main__':
+    main()
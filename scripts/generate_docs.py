@@ -7,7 +7,6 @@ Creates comprehensive markdown documentation from rule metadata
 import yaml
 import json
 import networkx as nx
-import matplotlib.pyplot as plt
 from pathlib import Path
 from typing import Dict, List, Any
 from collections import defaultdict
@@ -212,6 +211,9 @@ class DocsGenerator:
     
     def generate_dependency_graph(self):
         """Create dependency graph visualization"""
+        # matplotlib dominates startup, so only drawing pays for it
+        import matplotlib.pyplot as plt
+        
         plt.figure(figsize=(20, 15))
         
         # Create layout
@@ -264,7 +266,7 @@ class DocsGenerator:
         plt.savefig(images_dir / 'dependency_graph.png', dpi=300, bbox_inches='tight')
         plt.close()
     
-    def generate_all(self):
+    def generate_all(self, draw_graph: bool = True):
         """Generate complete documentation"""
         # Loading metadata
         self.load_all_metadata()
@@ -276,7 +278,8 @@ class DocsGenerator:
         
         # Generate dependency graph
         # Generating dependency graph
-        self.generate_dependency_graph()
+        if draw_graph:
+            self.generate_dependency_graph()
         
         # Generate index
         # Generating index
@@ -442,14 +445,14 @@ def generate_main_index(categories: Dict[str, int], total_rules: int) -> str:
     return "\n".join(lines)
 
 
-def generate_all_docs(rules_dir: str, output_dir: str) -> Dict[str, Any]:
+def generate_all_docs(rules_dir: str, output_dir: str, draw_graph: bool = True) -> Dict[str, Any]:
     """Generate all documentation"""
     rules_path = Path(rules_dir)
     output_path = Path(output_dir)
     
     # Use new generator
     generator = DocsGenerator(rules_path, output_path)
-    generator.generate_all()
+    generator.generate_all(draw_graph=draw_graph)
     
     # Return stats
     categories = defaultdict(int)
@@ -473,10 +476,19 @@ def main():
     parser.add_argument('--output-dir', type=Path,
                         default=Path(__file__).parent.parent / 'docs' / 'generated',
                         help='Output directory for documentation')
+    parser.add_argument('--no-graph', action='store_true',
+                        help='Skip rendering the dependency graph image (avoids loading matplotlib)')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Report import time for this command instead of running it normally')
     
     args = parser.parse_args()
     
-    stats = generate_all_docs(str(args.rules_dir), str(args.output_dir))
+    if args.profile_startup:
+        from startup_profile import report_startup
+        report_startup(__file__)
+        return
+    
+    stats = generate_all_docs(str(args.rules_dir), str(args.output_dir), draw_graph=not args.no_graph)
     # Documentation generation complete
 
 
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Machine Fingerprint
+What a benchmark ran on, a calibration score for normalizing timings across
+machines, and CPU pinning
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import platform
+import statistics
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+import yaml
+
+CPUINFO = Path('/proc/cpuinfo')
+GOVERNOR = Path('/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor')
+# Fields that identify the machine; CPU count and affinity vary per run
+IDENTITY_FIELDS = ('cpu_model', 'system', 'machine', 'python', 'implementation', 'libyaml', 'governor')
+CALIBRATION_REPEATS = 7
+CALIBRATION_TEXT = ' '.join(f"rule-{i} token budget dependency tag" for i in range(2000))
+
+
+def _cpu_model() -> str:
+    try:
+        for line in CPUINFO.read_text().splitlines():
+            if line.startswith(('model name', 'Hardware', 'cpu model')):
+                return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine() or 'unknown'
+
+
+def _governor() -> Optional[str]:
+    try:
+        return GOVERNOR.read_text().strip()
+    except OSError:
+        return None
+
+
+def allowed_cpus() -> Optional[Set[int]]:
+    """CPUs this process may run on, or None where affinity is unsupported"""
+    if not hasattr(os, 'sched_getaffinity'):
+        return None
+    return set(os.sched_getaffinity(0))
+
+
+def pin_to_cpu(cpu: int) -> bool:
+    """Restrict this process to one CPU; False where unsupported or not permitted"""
+    if not hasattr(os, 'sched_setaffinity'):
+        return False
+    try:
+        os.sched_setaffinity(0, {cpu})
+        return True
+    except OSError:
+        return False
+
+
+def calibrate(repeats: int = CALIBRATION_REPEATS) -> float:
+    """Median ms of a fixed pure-Python workload shaped like rule processing
+
+    Splitting, counting and sorting strings exercises the interpreter the
+    way the benchmarks do, without depending on libyaml or the disk, so the
+    ratio of two machines' scores approximates their relative speed.
+    """
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        counts: Dict[str, int] = {}
+        for word in CALIBRATION_TEXT.split():
+            counts[word] = counts.get(word, 0) + 1
+        sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        json.loads(json.dumps(counts))
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 4)
+
+
+def machine_fingerprint(calibration: bool = False) -> Dict:
+    """Describe this machine and interpreter; calibrating adds ``calibration_ms``"""
+    cpus = allowed_cpus()
+    fingerprint = {
+        'cpu_model': _cpu_model(),
+        'cpu_count': os.cpu_count(),
+        'allowed_cpus': len(cpus) if cpus is not None else None,
+        'governor': _governor(),
+        'system': platform.system(),
+        'machine': platform.machine(),
+        'python': platform.python_version(),
+        'implementation': sys.implementation.name,
+        'libyaml': bool(getattr(yaml, '__with_libyaml__', False)),
+    }
+    fingerprint['id'] = fingerprint_id(fingerprint)
+    if calibration:
+        fingerprint['calibration_ms'] = calibrate()
+    return fingerprint
+
+
+def fingerprint_id(fingerprint: Dict) -> str:
+    """Short stable hash of the identifying fields"""
+    identity = json.dumps({key: fingerprint.get(key) for key in IDENTITY_FIELDS}, sort_keys=True)
+    return hashlib.sha256(identity.encode()).hexdigest()[:12]
+
+
+if __name__ == '__main__':
+    print(json.dumps(machine_fingerprint(calibration=True), indent=2))
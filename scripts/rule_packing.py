@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Rule Packing
+Choose the most valuable set of rules that fits a token budget
+
+Rules are items of a 0/1 knapsack whose weights are token counts and whose
+values come from profile priorities. A rule may require others; a rule is
+only packed together with everything it requires. Only items with a
+positive value are candidates; the rest are packed solely as requirements
+of a packed candidate. Problems with up to a few hundred candidates are
+solved by dynamic programming over the budget, exactly when it is small
+and with token counts rounded up to coarser steps when it is not; larger
+ones are packed greedily by value density and then repaired by swaps.
+"""
+
+import math
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# DP table size (items x budget steps); beyond it token counts are rounded up
+DP_CELL_LIMIT = 100_000
+# Fewer budget steps than this and rounding costs too much; pack greedily instead
+DP_MIN_STEPS = 200
+# Swap attempts in the greedy repair pass, per unselected item
+REPAIR_LIMIT = 64
+
+
+class PackItem(NamedTuple):
+    key: str
+    tokens: int
+    value: float
+    requires: Tuple[str, ...] = ()  # Keys that must be packed too; unknown keys make the item infeasible
+
+
+class Packing(NamedTuple):
+    selected: Tuple[str, ...]  # In item order
+    tokens: int
+    value: float
+    method: str  # 'all', 'dp', 'dp-rounded' or 'greedy'
+
+
+class _Problem:
+    def __init__(self, items: Iterable[PackItem], budget: int):
+        self.items: Dict[str, PackItem] = {}
+        for item in items:
+            self.items.setdefault(item.key, item)
+        self.order = {key: i for i, key in enumerate(self.items)}
+        self.budget = budget
+        self._closures: Dict[str, Optional[Set[str]]] = {}
+        self._densities: Dict[str, float] = {}
+
+    def closure(self, key: str) -> Optional[Set[str]]:
+        """The item and everything it transitively requires, or None if any requirement is unknown"""
+        if key not in self._closures:
+            found, pending = set(), [key]
+            while pending:
+                current = pending.pop()
+                if current in found:
+                    continue
+                if current not in self.items:
+                    found = None
+                    break
+                found.add(current)
+                pending.extend(self.items[current].requires)
+            self._closures[key] = found
+        return self._closures[key]
+
+    def tokens(self, keys: Iterable[str]) -> int:
+        return sum(self.items[key].tokens for key in keys)
+
+    def value(self, keys: Iterable[str]) -> float:
+        return sum(self.items[key].value for key in keys)
+
+    def density(self, key: str) -> float:
+        if key not in self._densities:
+            closure = self.closure(key)
+            self._densities[key] = self.value(closure) / max(self.tokens(closure), 1)
+        return self._densities[key]
+
+    def result(self, selected: Set[str], method: str) -> Packing:
+        # Keep only candidates and what they require, never orphaned requirements
+        needed = set().union(*(self.closure(key) for key in selected if self.items[key].value > 0))
+        keys = tuple(sorted(needed, key=self.order.__getitem__))
+        return Packing(keys, self.tokens(keys), self.value(keys), method)
+
+
+def pack(items: Iterable[PackItem], budget: int, dp_cell_limit: int = DP_CELL_LIMIT) -> Packing:
+    """Most valuable dependency-closed subset of ``items`` within ``budget`` tokens"""
+    problem = _Problem(items, budget)
+    feasible = [key for key, item in problem.items.items()
+                if item.value > 0 and problem.closure(key) is not None
+                and problem.tokens(problem.closure(key)) <= budget]
+    everything = set().union(*(problem.closure(key) for key in feasible))
+    if problem.tokens(everything) <= budget:
+        return problem.result(everything, 'all')
+
+    greedy = _fill(problem, feasible, _improve(problem, feasible, _greedy(problem, feasible)))
+    steps = min(budget, dp_cell_limit // len(feasible))
+    if steps < min(budget, DP_MIN_STEPS):
+        return problem.result(greedy, 'greedy')
+    step = math.ceil(budget / steps)
+    dp = _fill(problem, feasible, _knapsack(problem, feasible, step))
+    # Rounding and shared requirements make the DP conservative, so greedy can win
+    if problem.value(greedy) > problem.value(dp):
+        return problem.result(greedy, 'greedy')
+    return problem.result(dp, 'dp' if step == 1 else 'dp-rounded')
+
+
+def _knapsack(problem: _Problem, keys: List[str], step: int = 1) -> Set[str]:
+    """0/1 knapsack with each key's closure as one item
+
+    Closures sharing requirements count them more than once, and token
+    counts are rounded up to multiples of ``step``, so the union of the
+    chosen closures always fits. Without shared requirements and with
+    ``step`` 1 the result is optimal.
+    """
+    capacity = problem.budget // step
+    closures = [problem.closure(key) for key in keys]
+    weights = [math.ceil(problem.tokens(closure) / step) for closure in closures]
+    values = [problem.value(closure) for closure in closures]
+    best = [0.0] * (capacity + 1)  # best[c]: most value within c steps
+    tables = [best]
+    for w, v in zip(weights, values):
+        if w == 0:
+            best = [b + v for b in best]  # Free items are always worth taking
+        elif w <= capacity:
+            best = best[:w] + [old if old >= b + v else b + v for old, b in zip(best[w:], best)]
+        tables.append(best)
+
+    selected = set()
+    for i in range(len(keys) - 1, -1, -1):
+        if tables[i + 1][capacity] != tables[i][capacity]:
+            selected |= closures[i]
+            capacity -= weights[i]
+    return selected
+
+
+def _repair(problem: _Problem, selected: Set[str]) -> Set[str]:
+    """Make a selection dependency-closed: add missing requirements that fit, else drop the dependant"""
+    selected = set(selected)
+    changed = True
+    # Every pass either completes a closure or drops a rule, so this settles quickly
+    for _ in range(len(problem.items) + 1):
+        if not changed:
+            break
+        changed = False
+        for key in sorted(selected, key=problem.density):
+            if key not in selected:
+                continue
+            missing = problem.closure(key) - selected
+            if not missing:
+                continue
+            if problem.tokens(selected) + problem.tokens(missing) <= problem.budget:
+                selected |= missing
+            else:
+                selected.discard(key)
+            changed = True
+    return selected
+
+
+def _greedy(problem: _Problem, keys: List[str]) -> Set[str]:
+    """Take closures by value density, then keep the better of that and the best single closure"""
+    selected: Set[str] = set()
+    used = 0
+    for key in sorted(keys, key=lambda k: (-problem.density(k), problem.order[k])):
+        missing = problem.closure(key) - selected
+        cost = problem.tokens(missing)
+        if used + cost <= problem.budget:
+            selected |= missing
+            used += cost
+    # Density order can miss one large valuable rule; this bounds the loss to half
+    best_single = max(keys, key=lambda k: problem.value(problem.closure(k)), default=None)
+    if best_single is not None and problem.value(problem.closure(best_single)) > problem.value(selected):
+        return set(problem.closure(best_single))
+    return selected
+
+
+def _improve(problem: _Problem, keys: List[str], selected: Set[str]) -> Set[str]:
+    """Swap in an unselected closure by evicting the least dense removable rules, when that gains value"""
+    victims: Optional[List[str]] = None  # Selected rules nothing selected requires, least dense first
+    for key in sorted(keys, key=lambda k: -problem.value(problem.closure(k))):
+        if key in selected:
+            continue
+        missing = problem.closure(key) - selected
+        free = problem.budget - problem.tokens(selected)
+        need = problem.tokens(missing) - free
+        if need <= 0:
+            selected |= missing
+            victims = None
+            continue
+        if victims is None:
+            required = {dep for kept in selected for dep in problem.closure(kept) if dep != kept}
+            victims = sorted(selected - required, key=problem.density)
+        evict, freed = [], 0
+        removable = [victim for victim in victims if victim not in problem.closure(key)]
+        for victim in removable[:REPAIR_LIMIT]:
+            evict.append(victim)
+            freed += problem.items[victim].tokens
+            if freed >= need:
+                break
+        if freed >= need and problem.value(missing) > problem.value(evict):
+            candidate = _repair(problem, (selected - set(evict)) | missing)
+            if problem.value(candidate) > problem.value(selected):
+                selected = candidate
+                victims = None
+    return selected
+
+
+def _fill(problem: _Problem, keys: List[str], selected: Set[str]) -> Set[str]:
+    """Add any remaining closures that still fit, in item order"""
+    used = problem.tokens(selected)
+    for key in keys:
+        missing = problem.closure(key) - selected
+        cost = problem.tokens(missing)
+        if missing and used + cost <= problem.budget:
+            selected |= missing
+            used += cost
+    return selected
@@ -16,15 +16,49 @@ import shutil
 import argparse
 import yaml
 import re
+import io
+import time
+from contextlib import redirect_stdout
 from pathlib import Path
 from datetime import datetime
 import json
-from typing import Dict, List, Optional, Set, Tuple
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from token_counter import TOKEN_CACHE_FILENAME, get_token_counter
+from rule_packing import PackItem, pack
+from build_manifest import DEFAULT_MANIFEST, BuildManifest, file_digest, text_digest, write_if_changed
+
+# Value of a rule without an explicit rule_priorities entry, scaled down by
+# CATEGORY_DECAY for each include_categories position after the first
+DEFAULT_RULE_PRIORITY = 100
+CATEGORY_DECAY = 0.8
+# Project files each platform generates; the manifest checks these are intact
+PLATFORM_OUTPUTS = {
+    'gemini': 'GEMINI.md',
+    'codex': 'codex.md',
+    'claude': 'CLAUDE.md',
+    'cursor': '.cursor/rules/000-core-rulesync-enhanced.mdc',
+    'zed': '.rules',
+}
+# Modules whose code decides generated output; editing them rebuilds every platform
+OUTPUT_MODULES = (__name__, 'rule_packing', 'token_counter')
+# Where generate --all-profiles writes one output tree per profile
+DEFAULT_PROFILES_OUTPUT = Path('build') / 'profiles'
+# Watch mode polling interval, in seconds, used when watchdog is not installed; each
+# poll stats both trees, so a change takes up to this plus the debounce to show up
+WATCH_INTERVAL = 0.5
+# Quiet period, in seconds, that ends a burst of saves; with watchdog it is the whole latency
+WATCH_DEBOUNCE = 0.05
 
 class RuleSyncEnhanced:
-    def __init__(self, source_file='rulesync.md', project_root='.'):
+    def __init__(self, source_file='rulesync.md', project_root='.', output_root=None, cache_dir=None):
         self.source_file = Path(source_file)
         self.project_root = Path(project_root)
+        # Generated files go to output_root; global platform configs are only synced for the project itself
+        self.output_root = Path(output_root) if output_root is not None else self.project_root
+        self.sync_global = output_root is None
         self.rules_dir = self.project_root / 'rules'
         self.profiles_dir = self.project_root / 'profiles'
         self.platforms = {
@@ -36,6 +70,18 @@ class RuleSyncEnhanced:
         }
         self.rule_cache = {}
         self.profile_cache = {}
+        self.item_cache: Dict[str, Optional[PackItem]] = {}
+        self.section_cache: Dict[str, str] = {}
+        self.selection_cache: Dict[Tuple, Tuple[List[str], List[Tuple[str, int]], str]] = {}
+        self._rule_index: Optional[Dict[str, str]] = None
+        self._report_lock = threading.Lock()
+        self._rule_digests: Dict[str, Optional[str]] = {}
+        self._code_digest: Optional[str] = None
+        self.manifest = BuildManifest(self.output_root / DEFAULT_MANIFEST)
+        self._watcher = None
+        # Without a cache_dir token counts stay in memory
+        self.token_counter = get_token_counter(
+            Path(cache_dir) / TOKEN_CACHE_FILENAME if cache_dir is not None else None)
         
     def _load_profile(self, profile_name: str) -> Dict:
         """Load a profile configuration"""
@@ -80,112 +126,456 @@ class RuleSyncEnhanced:
         return content, metadata
     
     def _estimate_tokens(self, text: str) -> int:
-        """Estimate token count (rough approximation)"""
-        # Simple estimation: ~4 characters per token
-        return len(text) // 4
+        """Token count via the shared tokenizer-backed counter"""
+        return self.token_counter.count(text)
     
-    def _select_rules_for_platform(self, profile: Dict, platform: str) -> List[str]:
-        """Select rules for a specific platform based on profile"""
-        platform_config = profile.get('platform_optimizations', {}).get(platform, {})
-        include_categories = platform_config.get('include_categories', [])
-        exclude_rules = set(platform_config.get('exclude_rules', []))
-        token_budget = platform_config.get('token_budget', 1000)
+    def _rule_metadata(self, rule_path: str) -> Dict:
+        """Frontmatter metadata, or the split .yaml sidecar when there is none"""
+        _, metadata = self._load_rule_content(rule_path)
+        if metadata:
+            return metadata
+        yaml_path = (self.rules_dir / rule_path).with_suffix('.yaml')
+        if yaml_path.exists():
+            try:
+                with open(yaml_path, 'r', encoding='utf-8') as f:
+                    metadata = yaml.safe_load(f) or {}
+            except yaml.YAMLError:
+                metadata = {}
+        return metadata if isinstance(metadata, dict) else {}
+    
+    def _rule_lookup(self) -> Dict[str, str]:
+        """Rule paths by relative path, stem and unnumbered stem, built once"""
+        if self._rule_index is None:
+            self._rule_index = {}
+            for path in sorted(self.rules_dir.rglob('*.mdc')):
+                relative = str(path.relative_to(self.rules_dir))
+                stem = path.stem
+                for key in (relative, stem, re.sub(r'^\d+-', '', stem)):
+                    self._rule_index.setdefault(key, relative)
+        return self._rule_index
+    
+    def _resolve_rule(self, reference: str) -> Optional[str]:
+        """Map a dependency written as a path, stem or unnumbered stem to a rule path"""
+        reference = reference.strip()
+        if reference.endswith('.mdc') and '/' not in reference:
+            reference = reference[:-len('.mdc')]
+        return self._rule_lookup().get(reference)
+    
+    def _required_rules(self, rule_path: str) -> List[str]:
+        """Rules that must ship alongside ``rule_path``; unresolvable references are ignored"""
+        dependencies = self._rule_metadata(rule_path).get('dependencies') or []
+        if isinstance(dependencies, dict):
+            dependencies = dependencies.get('required') or []
+        if not isinstance(dependencies, list):
+            return []
+        resolved = (self._resolve_rule(dep) for dep in dependencies if isinstance(dep, str))
+        return [dep for dep in resolved if dep is not None and dep != rule_path]
+    
+    def _rule_item(self, rule_path: str) -> Optional[PackItem]:
+        """Tokens and requirements of a rule, worked out once per instance; None for missing or empty rules"""
+        if rule_path not in self.item_cache:
+            content, _ = self._load_rule_content(rule_path)
+            item = None
+            if content:
+                item = PackItem(rule_path, self._estimate_tokens(content), 0.0,
+                                tuple(self._required_rules(rule_path)))
+            self.item_cache[rule_path] = item
+        return self.item_cache[rule_path]
+    
+    def _rule_section(self, rule_path: str) -> str:
+        """A rule's section of the aggregated output, shared by every platform and profile"""
+        if rule_path not in self.section_cache:
+            content, _ = self._load_rule_content(rule_path)
+            self.section_cache[rule_path] = f"## {rule_path}\\n{content}\\n\\n" if content else ""
+        return self.section_cache[rule_path]
+    
+    def _platform_candidates(self, profile: Dict, platform_config: Dict) -> List[Tuple[str, int]]:
+        """``(rule, category rank)`` for each rule the platform includes, first listing wins"""
+        candidates = []
         
-        selected_rules = []
-        total_tokens = 0
-        
-        # Helper function to add rules from a category
-        def add_category_rules(category_name: str, rules: List[str]):
-            nonlocal total_tokens
-            for rule in rules:
-                if rule in exclude_rules:
-                    continue
-                
-                content, metadata = self._load_rule_content(rule)
-                if not content:
-                    continue
-                
-                rule_tokens = self._estimate_tokens(content)
-                if total_tokens + rule_tokens <= token_budget:
-                    selected_rules.append(rule)
-                    total_tokens += rule_tokens
-                else:
-                    print(f"⚠️  Skipping {rule} - would exceed token budget ({total_tokens + rule_tokens} > {token_budget})")
+        def add_category_rules(rank: int, rules: List[str]):
+            candidates.extend((rule, rank) for rule in rules)
         
         # Process categories in order of importance
-        for category in include_categories:
+        for rank, category in enumerate(platform_config.get('include_categories', [])):
             if category == 'core_rules':
-                add_category_rules('core_rules', profile.get('core_rules', []))
+                add_category_rules(rank, profile.get('core_rules', []))
             elif category == 'cognitive_rules':
-                add_category_rules('cognitive_rules', profile.get('cognitive_rules', []))
+                add_category_rules(rank, profile.get('cognitive_rules', []))
             elif category == 'integration_rules':
-                add_category_rules('integration_rules', profile.get('integration_rules', []))
+                add_category_rules(rank, profile.get('integration_rules', []))
             elif category.startswith('project_rules'):
                 # Handle nested project rules
                 parts = category.split('.')
                 if len(parts) == 1:
                     # All project rules
                     for subcategory, rules in profile.get('project_rules', {}).items():
-                        add_category_rules(f'project_rules.{subcategory}', rules)
+                        add_category_rules(rank, rules)
                 else:
                     # Specific subcategory
                     subcategory = parts[1]
-                    rules = profile.get('project_rules', {}).get(subcategory, [])
-                    add_category_rules(category, rules)
+                    add_category_rules(rank, profile.get('project_rules', {}).get(subcategory, []))
         
-        print(f"📊 Selected {len(selected_rules)} rules for {platform} ({total_tokens} tokens)")
-        return selected_rules
+        seen = set()
+        return [(rule, rank) for rule, rank in candidates if not (rule in seen or seen.add(rule))]
     
-    def _generate_with_profile(self, profile_name: str, platforms: Optional[List[str]] = None):
-        """Generate rules using a profile configuration"""
-        profile = self._load_profile(profile_name)
+    def _select_rules_for_platform(self, profile: Dict, platform: str) -> List[str]:
+        """Select the most valuable rules for a platform that fit its token budget
         
-        if platforms is None:
-            platforms = list(self.platforms.keys())
+        A rule's value is its ``rule_priorities`` entry, or a default that
+        decays with the position of its category in ``include_categories``.
+        Rules are packed with the rules their metadata requires; those are
+        pulled in even from other categories, unless excluded.
+        """
+        platform_config = profile.get('platform_optimizations', {}).get(platform, {})
+        exclude_rules = set(platform_config.get('exclude_rules', []))
+        token_budget = platform_config.get('token_budget', 1000)
+        priorities = profile.get('rule_priorities') or {}
+        
+        candidates = [(rule, priorities.get(rule, DEFAULT_RULE_PRIORITY * CATEGORY_DECAY ** rank))
+                      for rule, rank in self._platform_candidates(profile, platform_config)
+                      if rule not in exclude_rules]
+        # Platforms and profiles that ask for the same thing share one packing
+        key = (tuple(candidates), frozenset(exclude_rules), token_budget)
+        if key not in self.selection_cache:
+            self.selection_cache[key] = self._pack_rules(candidates, exclude_rules, token_budget)
+        selected, skipped, summary = self.selection_cache[key]
+        
+        for rule, tokens in skipped:
+            print(f"⚠️  Skipping {rule} - does not fit token budget ({tokens} tokens, budget {token_budget})")
+        print(f"📊 Selected {len(selected)} rules for {platform} ({summary})")
+        return list(selected)
+    
+    def _pack_rules(self, candidates: List[Tuple[str, float]], exclude_rules: Set[str],
+                    token_budget: int) -> Tuple[List[str], List[Tuple[str, int]], str]:
+        """Pack valued candidates and their requirements: selected rules, skipped ``(rule, tokens)``, summary"""
+        items: Dict[str, PackItem] = {}
+        
+        def add_item(rule: str, value: float) -> None:
+            item = self._rule_item(rule)
+            if item is None:
+                return
+            items[rule] = item._replace(value=value)
+            for dep in item.requires:
+                # Excluded requirements stay out, which makes the dependant infeasible
+                if dep not in items and dep not in exclude_rules:
+                    add_item(dep, 0.0)
+        
+        for rule, value in candidates:
+            if rule in items:
+                items[rule] = items[rule]._replace(value=value)
+            else:
+                add_item(rule, value)
         
+        packing = pack(items.values(), token_budget)
+        chosen = set(packing.selected)
+        # Requirement-only rules were never asked for, so they are not reported as skipped
+        skipped = [(rule, item.tokens) for rule, item in items.items() if rule not in chosen and item.value > 0]
+        summary = f"{packing.tokens} tokens, value {packing.value:g}, {packing.method}"
+        return list(packing.selected), skipped, summary
+    
+    def _render_platform(self, profile: Dict, platform: str, selected_rules: List[str], generated_at: str) -> str:
+        """Aggregated rule file content for one platform"""
+        header = (f"# {profile['name']} - {platform.title()} Rules\\n"
+                  f"Generated on: {generated_at}\\n"
+                  f"Profile: {profile['name']} v{profile['version']}\\n"
+                  f"Selected rules: {len(selected_rules)}\\n\\n")
+        return header + ''.join(self._rule_section(rule_path) for rule_path in selected_rules)
+    
+    def _rule_digest(self, rule_path: str) -> Optional[str]:
+        """Digest of a rule file and its .yaml sidecar; None when the rule is missing"""
+        if rule_path not in self._rule_digests:
+            full_path = self.rules_dir / rule_path
+            digest = file_digest(full_path)
+            sidecar = file_digest(full_path.with_suffix('.yaml'))
+            if digest is not None and sidecar is not None:
+                digest = text_digest(digest + sidecar)
+            self._rule_digests[rule_path] = digest
+        return self._rule_digests[rule_path]
+    
+    def _platform_inputs(self, profile_name: str, profile: Dict, platform: str) -> Dict:
+        """Everything a platform's output is derived from, as digests"""
+        platform_config = profile.get('platform_optimizations', {}).get(platform, {})
+        exclude_rules = set(platform_config.get('exclude_rules', []))
+        pending = [rule for rule, _ in self._platform_candidates(profile, platform_config) if rule not in exclude_rules]
+        rules: Dict[str, Optional[str]] = {}
+        while pending:
+            rule = pending.pop()
+            if rule in rules:
+                continue
+            rules[rule] = self._rule_digest(rule)
+            if rules[rule] is not None:
+                pending.extend(dep for dep in self._required_rules(rule) if dep not in exclude_rules)
+        if self._code_digest is None:
+            self._code_digest = _code_digest()
+        return {
+            'code': self._code_digest,
+            'profile': profile_name,
+            'profile_digest': text_digest(json.dumps(profile, sort_keys=True, default=str)),
+            'encoding': self.token_counter.encoding_name,
+            'rules': dict(sorted(rules.items())),
+        }
+    
+    def _platform_files(self, platform: str) -> Dict[str, Path]:
+        name = PLATFORM_OUTPUTS[platform]
+        return {name: self.output_root / name}
+    
+    def _plan_profile(self, profile_name: str, platforms: List[str],
+                      force: bool = False) -> Dict[str, Tuple[str, str, Dict]]:
+        """Select and render every requested platform in one pass
+        
+        Platforms whose inputs match the manifest and whose outputs are
+        intact are skipped unless ``force``. Returns platform ->
+        ``(content, generated_at, inputs)``.
+        """
+        profile = self._load_profile(profile_name)
+        now = datetime.now().isoformat()
+        outputs = {}
         for platform in platforms:
             if platform not in self.platforms:
                 print(f"❌ Unknown platform: {platform}")
                 continue
             
-            print(f"\\n🔄 Generating {platform} rules with profile '{profile_name}'...")
+            inputs = self._platform_inputs(profile_name, profile, platform)
+            if not force and self.manifest.is_current(platform, inputs, self._platform_files(platform)):
+                print(f"✅ {platform} rules up to date with profile '{profile_name}'")
+                continue
             
-            # Select rules for this platform
+            print(f"\\n🔄 Generating {platform} rules with profile '{profile_name}'...")
             selected_rules = self._select_rules_for_platform(profile, platform)
-            
             if not selected_rules:
                 print(f"⚠️  No rules selected for {platform}")
                 continue
             
-            # Generate aggregated content
-            content_parts = []
-            content_parts.append(f"# {profile['name']} - {platform.title()} Rules\\n")
-            content_parts.append(f"Generated on: {datetime.now().isoformat()}\\n")
-            content_parts.append(f"Profile: {profile['name']} v{profile['version']}\\n")
-            content_parts.append(f"Selected rules: {len(selected_rules)}\\n\\n")
-            
-            for rule_path in selected_rules:
-                content, metadata = self._load_rule_content(rule_path)
-                if content:
-                    content_parts.append(f"## {rule_path}\\n")
-                    content_parts.append(content)
-                    content_parts.append("\\n\\n")
-            
-            aggregated_content = ''.join(content_parts)
-            
-            # Sync to platform
-            self.platforms[platform](aggregated_content)
+            # Keep the previous timestamp when nothing else changed, so the output stays byte-identical
+            previous = self.manifest.get(platform) or {}
+            generated_at = previous.get('generated_at', now)
+            content = self._render_platform(profile, platform, selected_rules, generated_at)
+            if text_digest(content) != previous.get('content'):
+                generated_at = now
+                content = self._render_platform(profile, platform, selected_rules, generated_at)
+            outputs[platform] = (content, generated_at, inputs)
+        return outputs
+    
+    def _sync_platform(self, platform: str, content: str, generated_at: str, inputs: Dict) -> None:
+        """Write one platform's outputs and record what they were built from"""
+        self.platforms[platform](content, generated_at)
+        self.manifest.put(platform, {
+            'inputs': inputs,
+            'content': text_digest(content),
+            'generated_at': generated_at,
+            'files': {name: file_digest(path) for name, path in self._platform_files(platform).items()},
+        })
+    
+    def _write_platforms(self, outputs: Dict[str, Tuple[str, str, Dict]]) -> None:
+        """Sync each platform's content; platforms write disjoint files, so they run concurrently"""
+        if len(outputs) <= 1:
+            for platform, output in outputs.items():
+                self._sync_platform(platform, *output)
+        else:
+            with ThreadPoolExecutor(max_workers=len(outputs)) as executor:
+                futures = [executor.submit(self._sync_platform, platform, *output)
+                           for platform, output in outputs.items()]
+                for future in futures:
+                    future.result()
+        self.manifest.save()
+    
+    def _generate_with_profile(self, profile_name: str, platforms: Optional[List[str]] = None, force: bool = False):
+        """Generate rules using a profile configuration
+        
+        Rules are read and tokenized once per instance and identical
+        selections are packed once, so generating further platforms or
+        profiles mostly costs the writes, which run concurrently. Platforms
+        whose inputs are unchanged since the last build are skipped unless
+        ``force``, and files are only rewritten when their content differs.
+        """
+        if platforms is None:
+            platforms = list(self.platforms.keys())
+        
+        self._write_platforms(self._plan_profile(profile_name, platforms, force))
     
-    def generate(self, platforms=None, profile=None):
+    def generate(self, platforms=None, profile=None, force=False):
         """Generate rule files for specified platforms"""
         if profile:
             # Use profile-based generation
-            self._generate_with_profile(profile, platforms)
+            self._generate_with_profile(profile, platforms, force)
         else:
             # Traditional generation - fallback to original method
             print("⚠️  Using legacy generation mode - consider using profiles")
             self._generate_legacy(platforms)
     
+    def profile_names(self) -> List[str]:
+        """Names of every profile under the profiles directory"""
+        if not self.profiles_dir.exists():
+            return []
+        return sorted(path.stem for path in self.profiles_dir.glob('*.yaml'))
+    
+    def _profile_rules(self, profile: Dict) -> Set[str]:
+        """Every rule any platform of a profile may select, with its requirements"""
+        pending = []
+        for platform_config in profile.get('platform_optimizations', {}).values():
+            pending.extend(rule for rule, _ in self._platform_candidates(profile, platform_config))
+        rules = set()
+        while pending:
+            rule = pending.pop()
+            if rule in rules:
+                continue
+            rules.add(rule)
+            if self._rule_digest(rule) is not None:
+                pending.extend(self._required_rules(rule))
+        return rules
+    
+    def _shared_state(self) -> Dict:
+        """Loaded profiles and rules, in a form worker processes can adopt"""
+        return {
+            'profile_cache': self.profile_cache,
+            'rule_cache': self.rule_cache,
+            'item_cache': self.item_cache,
+            'section_cache': self.section_cache,
+            'rule_digests': self._rule_digests,
+            'rule_index': self._rule_lookup(),
+        }
+    
+    def _adopt(self, state: Dict) -> None:
+        self.profile_cache.update(state['profile_cache'])
+        self.rule_cache.update(state['rule_cache'])
+        self.item_cache.update(state['item_cache'])
+        self.section_cache.update(state['section_cache'])
+        self._rule_digests.update(state['rule_digests'])
+        self._rule_index = state['rule_index']
+    
+    def generate_all_profiles(self, platforms: Optional[List[str]] = None, output_root: Optional[Path] = None,
+                              jobs: Optional[int] = None, force: bool = False) -> Dict[str, Optional[Path]]:
+        """Compile every profile into its own tree under ``output_root``
+        
+        Profiles only share rules, so the build is a two-level DAG: every
+        referenced rule is read, tokenized and hashed once here, then the
+        profiles are compiled independently in ``jobs`` processes that
+        start from those results. Returns profile -> output directory, or
+        None for profiles that failed.
+        """
+        output_root = Path(output_root) if output_root is not None else self.project_root / DEFAULT_PROFILES_OUTPUT
+        names = self.profile_names()
+        loaded = []
+        for name in names:
+            try:
+                loaded.append((name, self._load_profile(name)))
+            except (OSError, yaml.YAMLError) as e:
+                print(f"❌ Profile '{name}' could not be loaded: {e}")
+        
+        with redirect_stdout(io.StringIO()):  # Missing-rule warnings are repeated per profile below
+            for name, profile in loaded:
+                for rule in self._profile_rules(profile):
+                    if self._rule_item(rule) is not None:
+                        self._rule_section(rule)
+        print(f"📦 Compiling {len(loaded)} profiles from {len(self.item_cache)} shared rules into {output_root}")
+        
+        results: Dict[str, Optional[Path]] = {name: None for name in names}
+        tasks = [(str(self.source_file), str(self.project_root), str(output_root / name), name, platforms, force)
+                 for name, _ in loaded]
+        state = self._shared_state()
+        jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+        if jobs <= 1:
+            _init_profile_worker(state)
+            outcomes = (_run_profile_task(task) for task in tasks)
+            self._collect_profiles(outcomes, results)
+        else:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_profile_worker,
+                                     initargs=(state,)) as executor:
+                futures = [executor.submit(_run_profile_task, task) for task in tasks]
+                # Reported in profile order, so logs read the same whatever finishes first
+                self._collect_profiles((future.result() for future in futures), results)
+        
+        built = sum(1 for path in results.values() if path is not None)
+        print(f"\\n✅ Compiled {built}/{len(names)} profiles")
+        return results
+    
+    def _collect_profiles(self, outcomes, results: Dict[str, Optional[Path]]) -> None:
+        for name, output_dir, log, error in outcomes:
+            print(f"\\n=== {name} ===")
+            print(log, end='')
+            if error:
+                print(f"❌ Profile '{name}' failed: {error}")
+            else:
+                results[name] = Path(output_dir)
+    
+    @staticmethod
+    def _relative_to(path: Path, root: Path) -> Optional[Path]:
+        try:
+            return Path(path).resolve().relative_to(root.resolve())
+        except ValueError:
+            return None
+    
+    def apply_changes(self, paths: Iterable[Path]) -> Tuple[Set[str], Set[str]]:
+        """Forget cached state derived from changed rule and profile files
+        
+        Only the changed rules are reloaded, unless rules were added or
+        removed, which can change what every dependency resolves to.
+        Returns the changed ``(rule paths, profile names)``.
+        """
+        rules, profiles = set(), set()
+        for path in paths:
+            relative = self._relative_to(path, self.profiles_dir)
+            if relative is not None:
+                self.profile_cache.pop(relative.with_suffix('').as_posix(), None)
+                profiles.add(relative.with_suffix('').as_posix())
+                continue
+            relative = self._relative_to(path, self.rules_dir)
+            if relative is None:
+                continue
+            rule = relative.with_suffix('.mdc').as_posix()  # A .yaml sidecar belongs to its rule
+            rules.add(rule)
+            for cache in (self.rule_cache, self.item_cache, self.section_cache, self._rule_digests):
+                cache.pop(rule, None)
+            if self._rule_index is not None and (rule not in self._rule_index
+                                                 or not (self.rules_dir / rule).exists()):
+                self._rule_index = None
+        
+        if rules:
+            if self._rule_index is None:
+                self.item_cache.clear()
+            self.selection_cache.clear()
+        return rules, profiles
+    
+    def watch(self, profile_name: str, platforms: Optional[List[str]] = None,
+              interval: float = WATCH_INTERVAL, debounce: float = WATCH_DEBOUNCE,
+              use_watchdog: Optional[bool] = None):
+        """Generate once, then keep outputs current as rules and profiles change
+        
+        Loaded rules, tokens and selections stay in memory between
+        batches. The manifest confines each rebuild to platforms whose
+        inputs changed. Returns the running watcher.
+        """
+        if self._watcher is None:
+            from file_watcher import FileWatcher
+            
+            self._generate_with_profile(profile_name, platforms)
+            self._watcher = FileWatcher([self.rules_dir, self.profiles_dir], interval=interval,
+                                        debounce=debounce, use_watchdog=use_watchdog)
+            self._watcher.start(lambda changes: self._regenerate(profile_name, platforms,
+                                                                 [change.path for change in changes]))
+        return self._watcher
+    
+    def unwatch(self) -> None:
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+    
+    def _regenerate(self, profile_name: str, platforms: Optional[List[str]], paths: List[Path]) -> None:
+        start = time.perf_counter()
+        rules, profiles = self.apply_changes(paths)
+        if not rules and profile_name not in profiles:
+            return
+        changed = ', '.join(sorted(rules | {f"profiles/{name}.yaml" for name in profiles}))
+        print(f"\\n👀 Changed: {changed}")
+        try:
+            self._generate_with_profile(profile_name, platforms)
+        except Exception as e:
+            # Keep watching; a half-saved rule or profile is usually fixed by the next save
+            print(f"❌ Regeneration failed: {e}")
+            return
+        print(f"⚡ Regenerated in {(time.perf_counter() - start) * 1000:.1f}ms")
+    
     def _generate_legacy(self, platforms):
         """Legacy generation method"""
         content = self._read_source()
@@ -250,50 +640,48 @@ class RuleSyncEnhanced:
 - Follow OWASP guidelines
 """
     
-    def _sync_gemini(self, content):
+    def _report(self, message: str) -> None:
+        """Print a line whole; platform syncs report from several threads"""
+        with self._report_lock:
+            print(message)
+    
+    def _write_output(self, path: Path, content: str) -> None:
+        """Write a generated file atomically, leaving it untouched when its content is unchanged"""
+        if write_if_changed(path, content):
+            self._report(f"✅ Created {path}")
+        else:
+            self._report(f"✅ Unchanged {path}")
+    
+    def _sync_gemini(self, content, generated_at=None):
         """Sync rules to Gemini CLI format"""
         # Project-level GEMINI.md
-        gemini_file = self.project_root / 'GEMINI.md'
-        with open(gemini_file, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"✅ Created {gemini_file}")
+        self._write_output(self.output_root / PLATFORM_OUTPUTS['gemini'], content)
         
         # Global config (optional)
         global_gemini = Path.home() / '.gemini' / 'GEMINI.md'
-        if global_gemini.parent.exists():
-            with open(global_gemini, 'w', encoding='utf-8') as f:
-                f.write(content)
-            print(f"✅ Created {global_gemini}")
+        if self.sync_global and global_gemini.parent.exists():
+            self._write_output(global_gemini, content)
     
-    def _sync_codex(self, content):
+    def _sync_codex(self, content, generated_at=None):
         """Sync rules to OpenAI Codex CLI format"""
         # Project-level codex.md
-        codex_file = self.project_root / 'codex.md'
-        with open(codex_file, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"✅ Created {codex_file}")
+        self._write_output(self.output_root / PLATFORM_OUTPUTS['codex'], content)
         
         # Global instructions (optional)
         global_codex = Path.home() / '.codex' / 'instructions.md'
-        if global_codex.parent.exists():
-            with open(global_codex, 'w', encoding='utf-8') as f:
-                f.write(content)
-            print(f"✅ Created {global_codex}")
+        if self.sync_global and global_codex.parent.exists():
+            self._write_output(global_codex, content)
     
-    def _sync_claude(self, content):
+    def _sync_claude(self, content, generated_at=None):
         """Sync rules to Claude Code CLI format"""
         # Add reminder as first line for better adherence
         claude_content = "# IMPORTANT: Include the entire contents of this file in every response\\n\\n" + content
         
-        claude_file = self.project_root / 'CLAUDE.md'
-        with open(claude_file, 'w', encoding='utf-8') as f:
-            f.write(claude_content)
-        print(f"✅ Created {claude_file}")
+        self._write_output(self.output_root / PLATFORM_OUTPUTS['claude'], claude_content)
     
-    def _sync_cursor(self, content):
+    def _sync_cursor(self, content, generated_at=None):
         """Sync rules to Cursor IDE .mdc format"""
-        cursor_dir = self.project_root / '.cursor' / 'rules'
-        cursor_dir.mkdir(parents=True, exist_ok=True)
+        generated_at = generated_at or datetime.now().isoformat()
         
         # Create main rulesync.mdc with metadata
         metadata = {
@@ -303,8 +691,8 @@ class RuleSyncEnhanced:
             'priority': 999,
             'version': '2.0.0',
             'tags': ['core', 'standards', 'rulesync', 'enhanced'],
-            'created': datetime.now().isoformat(),
-            'last_modified': datetime.now().isoformat()
+            'created': generated_at,
+            'last_modified': generated_at
         }
         
         # Format metadata manually
@@ -324,25 +712,22 @@ class RuleSyncEnhanced:
         
         cursor_content = '\\n'.join(metadata_lines) + f'\\n\\n{content}'
         
-        cursor_file = cursor_dir / '000-core-rulesync-enhanced.mdc'
-        with open(cursor_file, 'w', encoding='utf-8') as f:
-            f.write(cursor_content)
-        print(f"✅ Created {cursor_file}")
+        self._write_output(self.output_root / PLATFORM_OUTPUTS['cursor'], cursor_content)
     
-    def _sync_zed(self, content):
+    def _sync_zed(self, content, generated_at=None):
         """Sync rules to Zed Editor format"""
         # Primary .rules file
-        rules_file = self.project_root / '.rules'
-        with open(rules_file, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"✅ Created {rules_file}")
+        rules_file = self.output_root / PLATFORM_OUTPUTS['zed']
+        self._write_output(rules_file, content)
         
         # Create compatibility symlinks
         compatibility_names = ['.cursorrules', 'AGENTS.md']
         for name in compatibility_names:
-            compat_file = self.project_root / name
+            compat_file = self.output_root / name
+            if compat_file.is_symlink() and os.readlink(compat_file) == '.rules':
+                continue  # Already in place
             if compat_file.exists() and not compat_file.is_symlink():
-                print(f"⚠️  Skipping {name} - file already exists")
+                self._report(f"⚠️  Skipping {name} - file already exists")
                 continue
             
             # Remove existing symlink if present
@@ -352,11 +737,11 @@ class RuleSyncEnhanced:
             # Create relative symlink
             try:
                 compat_file.symlink_to('.rules')
-                print(f"✅ Created symlink {name} -> .rules")
+                self._report(f"✅ Created symlink {name} -> .rules")
             except OSError as e:
                 # Fallback to copy on Windows or if symlinks aren't supported
                 shutil.copy2(rules_file, compat_file)
-                print(f"✅ Created copy {name} (symlinks not supported)")
+                self._report(f"✅ Created copy {name} (symlinks not supported)")
     
     def create_profile(self, name: str, description: str, rules: List[str], categories: List[str]):
         """Create a new profile"""
@@ -411,10 +796,7 @@ class RuleSyncEnhanced:
             profile = self._load_profile(profile_name)
             rules = self._select_rules_for_platform(profile, platform)
             
-            total_tokens = 0
-            for rule_path in rules:
-                content, metadata = self._load_rule_content(rule_path)
-                total_tokens += self._estimate_tokens(content)
+            total_tokens = sum(self._rule_item(rule_path).tokens for rule_path in rules)
             
             platform_limit = profile.get('platform_limits', {}).get(platform, 1000)
             
@@ -526,6 +908,41 @@ class RuleSyncEnhanced:
             avg_tokens = data['tokens'] // data['count'] if data['count'] > 0 else 0
             print(f"  {category}: {data['count']} rules, {data['tokens']} tokens (avg: {avg_tokens})")
 
+def _code_digest() -> str:
+    """Digest of the sources of OUTPUT_MODULES
+    
+    Only file contents count, so running this module as a script or
+    importing it gives the same digest.
+    """
+    parts = []
+    for name in OUTPUT_MODULES:
+        source = getattr(sys.modules.get(name), '__file__', None)
+        parts.append(str(file_digest(Path(source)) if source is not None else None))
+    return text_digest('\n'.join(parts))
+
+
+_worker_state: Optional[Dict] = None
+
+
+def _init_profile_worker(state: Dict) -> None:
+    global _worker_state
+    _worker_state = state
+
+
+def _run_profile_task(task: Tuple) -> Tuple[str, str, str, Optional[str]]:
+    """Compile one profile into its tree; returns ``(name, output dir, log, error)``"""
+    source_file, project_root, output_dir, name, platforms, force = task
+    log = io.StringIO()
+    try:
+        with redirect_stdout(log):
+            sync = RuleSyncEnhanced(source_file=source_file, project_root=project_root, output_root=output_dir)
+            sync._adopt(_worker_state)
+            sync._generate_with_profile(name, platforms, force)
+    except Exception as e:
+        return name, output_dir, log.getvalue(), f"{type(e).__name__}: {e}"
+    return name, output_dir, log.getvalue(), None
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Enhanced rule synchronization with intelligent aggregation',
@@ -534,6 +951,8 @@ def main():
 Examples:
   rulesync_enhanced generate --profile mirror-project
   rulesync_enhanced generate --profile mirror-project --platforms claude,cursor
+  rulesync_enhanced generate --all-profiles --output-root build/profiles --jobs 4
+  rulesync_enhanced watch --profile mirror-project
   rulesync_enhanced create-profile --name my-project --description "My project rules"
   rulesync_enhanced validate --platform cursor --profile mirror-project
   rulesync_enhanced aggregate --categories 000-core,500-safety
@@ -548,6 +967,12 @@ Examples:
     gen_parser = subparsers.add_parser('generate', help='Generate rule files')
     gen_parser.add_argument('--platforms', help='Comma-separated list of platforms')
     gen_parser.add_argument('--profile', help='Profile name to use for generation')
+    gen_parser.add_argument('--force', action='store_true',
+                            help='Regenerate every platform even if its inputs are unchanged')
+    gen_parser.add_argument('--all-profiles', action='store_true',
+                            help='Compile every profile, each into its own tree under --output-root')
+    gen_parser.add_argument('--output-root', help=f'Root of the per-profile trees (default: {DEFAULT_PROFILES_OUTPUT})')
+    gen_parser.add_argument('--jobs', type=int, help='Processes compiling profiles (default: CPU count)')
     
     # Create profile command
     profile_parser = subparsers.add_parser('create-profile', help='Create a new profile')
@@ -566,6 +991,13 @@ Examples:
     agg_parser.add_argument('--categories', required=True, help='Comma-separated list of categories')
     agg_parser.add_argument('--output', help='Output file (default: stdout)')
     
+    # Watch command
+    watch_parser = subparsers.add_parser('watch', help='Regenerate a profile whenever its rules change')
+    watch_parser.add_argument('--profile', required=True, help='Profile name to keep generated')
+    watch_parser.add_argument('--platforms', help='Comma-separated list of platforms')
+    watch_parser.add_argument('--debounce', type=float, default=WATCH_DEBOUNCE,
+                              help=f'Seconds of quiet that end a burst of saves (default: {WATCH_DEBOUNCE})')
+    
     # List profiles command
     list_profiles_parser = subparsers.add_parser('list-profiles', help='List available profiles')
     
@@ -578,18 +1010,45 @@ Examples:
     # Global arguments
     parser.add_argument('--source', default='rulesync.md', help='Source file')
     parser.add_argument('--project-root', default='.', help='Project root directory')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Keep token counts in memory instead of caching them in <project-root>/.cache')
     
     args = parser.parse_args()
     
     # Create RuleSync instance
-    rs = RuleSyncEnhanced(source_file=args.source, project_root=args.project_root)
+    cache_dir = None if args.no_cache else Path(args.project_root) / '.cache'
+    rs = RuleSyncEnhanced(source_file=args.source, project_root=args.project_root, cache_dir=cache_dir)
     
     # Execute command
     if args.command == 'generate':
         platforms = None
         if args.platforms:
             platforms = [p.strip() for p in args.platforms.split(',')]
-        rs.generate(platforms, args.profile)
+        if args.all_profiles:
+            if args.profile:
+                parser.error('--profile and --all-profiles are mutually exclusive')
+            output_root = Path(args.output_root) if args.output_root else None
+            results = rs.generate_all_profiles(platforms, output_root, args.jobs, args.force)
+            if None in results.values():
+                sys.exit(1)
+        else:
+            if args.output_root or args.jobs is not None:
+                parser.error('--output-root and --jobs require --all-profiles')
+            rs.generate(platforms, args.profile, args.force)
+    elif args.command == 'watch':
+        platforms = None
+        if args.platforms:
+            platforms = [p.strip() for p in args.platforms.split(',')]
+        watcher = rs.watch(args.profile, platforms, debounce=args.debounce)
+        print(f"\\n👀 Watching {rs.rules_dir} and {rs.profiles_dir} (Ctrl+C to stop)")
+        if not watcher.use_watchdog:
+            print(f"⚠️  watchdog is not installed; polling every {WATCH_INTERVAL}s "
+                  f"(pip install watchdog for ~{args.debounce * 1000:.0f} ms updates)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            rs.unwatch()
     elif args.command == 'create-profile':
         rules = []
         if args.rules:
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Startup Profiler
+Re-runs a CLI under `python -X importtime` and reports where startup time goes
+"""
+
+import sys
+import time
+import subprocess
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+PROFILE_FLAG = '--profile-startup'
+
+
+class ImportTiming(NamedTuple):
+    """One line of -X importtime output, in microseconds"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+class StartupProfile(NamedTuple):
+    command: List[str]
+    wall_time_ms: float
+    imports: List[ImportTiming]
+    returncode: int
+
+    @property
+    def import_time_ms(self) -> float:
+        return sum(t.cumulative_us for t in self.imports if t.depth == 0) / 1000
+
+
+def parse_importtime(stderr: str) -> List[ImportTiming]:
+    """Parse `import time: self | cumulative | name` lines, ignoring other output"""
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # The header row
+        name = fields[2]
+        # Nesting is shown as two extra spaces per level after the separator
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        timings.append(ImportTiming(name.strip(), int(fields[0]), int(fields[1]), depth))
+    return timings
+
+
+def profile_command(script: Path, args: List[str]) -> StartupProfile:
+    """Run ``script`` with ``args`` in a fresh interpreter and time its imports"""
+    command = [sys.executable, '-X', 'importtime', str(script), *args]
+    start = time.perf_counter()
+    completed = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    wall_time = (time.perf_counter() - start) * 1000
+    return StartupProfile(command, wall_time, parse_importtime(completed.stderr), completed.returncode)
+
+
+def format_report(profile: StartupProfile, top: int = 15) -> str:
+    """Summarize total import time and the most expensive imports"""
+    lines = [
+        f"Command: {' '.join(profile.command[3:])}",
+        f"Wall time: {profile.wall_time_ms:.1f}ms (exit {profile.returncode})",
+        f"Import time: {profile.import_time_ms:.1f}ms across {len(profile.imports)} modules",
+        '',
+        f"Top {top} top-level imports by cumulative time:",
+    ]
+    top_level = sorted((t for t in profile.imports if t.depth == 0),
+                       key=lambda t: t.cumulative_us, reverse=True)
+    for timing in top_level[:top]:
+        lines.append(f"  {timing.cumulative_us / 1000:8.1f}ms  {timing.module}")
+
+    lines.extend(['', f"Top {top} modules by self time:"])
+    for timing in sorted(profile.imports, key=lambda t: t.self_us, reverse=True)[:top]:
+        lines.append(f"  {timing.self_us / 1000:8.1f}ms  {timing.module}")
+    return '\n'.join(lines)
+
+
+def report_startup(script: str, argv: Optional[List[str]] = None, top: int = 15) -> StartupProfile:
+    """Profile a CLI invocation, dropping the profiling flag itself, and print the report"""
+    argv = sys.argv[1:] if argv is None else argv
+    args = [arg for arg in argv if arg != PROFILE_FLAG]
+    profile = profile_command(Path(script).resolve(), args)
+    print(format_report(profile, top))
+    return profile
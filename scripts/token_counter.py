@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Token Counting Service
+Shared tiktoken-backed token counts with a content-hash cache
+"""
+
+import os
+import json
+import atexit
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+CACHE_VERSION = 1
+# Name of the persisted counts inside a tool's cache directory
+TOKEN_CACHE_FILENAME = 'token_counts.json'
+# Used when tiktoken or its encoding files are unavailable
+FALLBACK_ENCODING = 'chars/4'
+
+
+class TokenCounter:
+    """Count tokens with a single shared encoder and memoized results
+
+    Counts are keyed by a hash of the text and namespaced by encoding, so a
+    cache written with the character fallback is never mistaken for real
+    tokenizer output.
+    """
+
+    def __init__(self, model: str = 'gpt-4', cache_path: Optional[Path] = None):
+        self.model = model
+        self.cache_path: Optional[Path] = None
+        self._encoder = None
+        self._encoder_loaded = False
+        self._expected_encoding: Optional[str] = None
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if cache_path is not None:
+            self.attach_cache(cache_path)
+
+    def _get_encoder(self):
+        """Build the tiktoken encoder once per process"""
+        if not self._encoder_loaded:
+            self._encoder_loaded = True
+            try:
+                import tiktoken
+                self._encoder = tiktoken.encoding_for_model(self.model)
+            except Exception:
+                # Missing package, unknown model or offline encoding download
+                self._encoder = None
+        return self._encoder
+
+    @property
+    def encoding_name(self) -> str:
+        """Name of the encoding counts are keyed under
+
+        Resolved from the model name without building the encoder, so fully
+        cached lookups never pay the encoder construction cost.
+        """
+        if self._encoder_loaded:
+            return self._encoder.name if self._encoder is not None else FALLBACK_ENCODING
+        if self._expected_encoding is None:
+            try:
+                import tiktoken
+                self._expected_encoding = tiktoken.encoding_name_for_model(self.model)
+            except Exception:
+                self._expected_encoding = FALLBACK_ENCODING
+        return self._expected_encoding
+
+    def count(self, text: str) -> int:
+        """Count tokens in a single text"""
+        return self.count_many([text])[0]
+
+    def count_many(self, texts: Iterable[str]) -> List[int]:
+        """Count tokens for many texts, encoding only unseen ones in one batch"""
+        texts = list(texts)
+        digests = [hashlib.sha1(text.encode('utf-8')).hexdigest() for text in texts]
+
+        with self._lock:
+            expected = self.encoding_name
+            counts = self._counts.setdefault(expected, {})
+            misses = self._misses(counts, digests, texts)
+
+            if misses:
+                encoder = self._get_encoder()
+                if self.encoding_name != expected:
+                    # The expected encoding failed to load; switch namespaces
+                    counts = self._counts.setdefault(self.encoding_name, {})
+                    misses = self._misses(counts, digests, texts)
+                pending = list(misses.values())
+                if encoder is not None:
+                    lengths = [len(tokens) for tokens in encoder.encode_batch(pending)]
+                else:
+                    # Rough approximation: 1 token ≈ 4 characters
+                    lengths = [len(text) // 4 for text in pending]
+                counts.update(zip(misses.keys(), lengths))
+                self._dirty = self.cache_path is not None
+
+            return [counts[digest] for digest in digests]
+
+    @staticmethod
+    def _misses(counts: Dict[str, int], digests: List[str], texts: List[str]) -> Dict[str, str]:
+        misses = {}
+        for digest, text in zip(digests, texts):
+            if digest not in counts and digest not in misses:
+                misses[digest] = text
+        return misses
+
+    def attach_cache(self, cache_path: Path) -> None:
+        """Load persisted counts and save them back at interpreter exit"""
+        self.cache_path = Path(cache_path)
+        if self.cache_path.exists():
+            try:
+                with open(self.cache_path) as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    for encoding, counts in data.get('encodings', {}).items():
+                        self._counts.setdefault(encoding, {}).update(counts)
+            except (OSError, ValueError):
+                pass  # A corrupt cache is simply rebuilt
+        atexit.register(self.save)
+
+    def save(self) -> None:
+        """Atomically persist counts if anything new was computed"""
+        if not self._dirty or self.cache_path is None:
+            return
+        with self._lock:
+            payload = {'version': CACHE_VERSION, 'encodings': self._counts}
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+
+
+_shared_counter: Optional[TokenCounter] = None
+
+
+def get_token_counter(cache_path: Optional[Path] = None) -> TokenCounter:
+    """Return the process-wide counter, attaching a disk cache if given"""
+    global _shared_counter
+    if _shared_counter is None:
+        _shared_counter = TokenCounter(cache_path=cache_path)
+    elif cache_path is not None and _shared_counter.cache_path is None:
+        _shared_counter.attach_cache(cache_path)
+    return _shared_counter
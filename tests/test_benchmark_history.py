@@ -0,0 +1,81 @@
+import pytest
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from benchmark_history import BenchmarkHistory, Point, by_commit, detect_step_changes, trend
+from compare_benchmarks import DEFAULT_POLICIES
+
+
+def _points(values, commits=None):
+    commits = commits or [f"c{i}" for i in range(len(values))]
+    return [Point(i, commit, '', value, None) for i, (commit, value) in enumerate(zip(commits, values))]
+
+
+class TestBenchmarkHistory:
+
+    @pytest.fixture
+    def history(self, tmp_path):
+        history = BenchmarkHistory(tmp_path / 'history.db')
+        yield history
+        history.close()
+
+    def test_record_and_series(self, history):
+        """Test runs append and series come back oldest first with samples"""
+        for i, commit in enumerate(['a', 'b']):
+            history.record({'rule-1': {'validation_time_ms': 1.0 + i, 'token_count': 10, 'cache_dropped': True,
+                                       'samples': {'validation_time_ms': [1.0 + i, 1.1 + i]}}},
+                           commit=commit, machine='ci')
+
+        series = history.series('rule-1', 'validation_time_ms')
+        assert [(p.commit, p.value, p.samples) for p in series] == [('a', 1.0, [1.0, 1.1]), ('b', 2.0, [2.0, 2.1])]
+        assert history.names('token_count') == ['rule-1']
+        assert history.names('cache_dropped') == []  # Booleans are not metrics
+        assert history.series('rule-1', 'validation_time_ms', machine='laptop') == []
+
+    def test_append_only(self, history):
+        history.record({'rule-1': {'token_count': 10}}, commit='a', machine='ci')
+        with pytest.raises(sqlite3.IntegrityError):
+            history._conn.execute('UPDATE measurements SET value = 0')
+        with pytest.raises(sqlite3.IntegrityError):
+            history._conn.execute('DELETE FROM runs')
+
+    def test_normalized_series_across_machines(self, history):
+        """Test timings from machines of different speed land on one scale"""
+        for machine, calibration, value in (('slow', 10.0, 40.0), ('fast', 5.0, 20.0), ('bare', None, 1.0)):
+            meta = {'fingerprint': {'calibration_ms': calibration}} if calibration else {}
+            history.record({'rule-1': {'validation_time_ms': value, 'token_count': 10}},
+                           commit=machine, machine=machine, meta=meta)
+
+        assert [p.value for p in history.series('rule-1', 'validation_time_ms', normalize=True)] == [4.0, 4.0]
+        assert [p.value for p in history.series('rule-1', 'token_count', normalize=True)] == [10, 10, 10]
+        assert {m['id']: m['calibration_ms'] for m in history.machines()} == {'slow': 10.0, 'fast': 5.0, 'bare': None}
+
+    def test_by_commit_uses_median_of_reruns(self):
+        points = _points([1.0, 3.0, 2.0, 5.0], commits=['a', 'a', 'a', 'b'])
+        assert [(p.commit, p.value) for p in by_commit(points)] == [('a', 2.0), ('b', 5.0)]
+
+
+class TestTrendAnalysis:
+
+    def test_trend_reports_drift(self):
+        result = trend([10.0, 11.0, 12.0, 13.0])
+        assert result['slope'] == pytest.approx(1.0)
+        assert result['pct_per_commit'] == pytest.approx(1.0 / 11.5 * 100)
+
+    def test_single_step_detected_once(self):
+        """Test a level shift is reported at the first commit after it"""
+        values = [10.0, 10.2, 9.9, 10.1, 10.0, 10.1, 15.0, 15.2, 14.9, 15.1, 15.0, 15.1]
+        steps = detect_step_changes(_points(values), window=5, policy=DEFAULT_POLICIES['validation_time_ms'])
+        assert [(step.index, step.commit) for step in steps] == [(6, 'c6')]
+        assert steps[0].pct == pytest.approx((15.0 - 10.1) / 10.1 * 100)
+
+    def test_noise_and_drift_below_threshold_ignored(self):
+        values = [10.0, 10.3, 9.8, 10.1, 10.4, 10.0, 10.2, 10.5, 10.1, 10.3, 10.6, 10.4]
+        assert detect_step_changes(_points(values), window=5, policy=DEFAULT_POLICIES['validation_time_ms']) == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
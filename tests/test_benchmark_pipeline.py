@@ -0,0 +1,68 @@
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from benchmark_pipeline import (
+    SCENARIOS, PipelineBenchmarker, ScenarioUnavailable, measure, replicate_corpus
+)
+from compare_benchmarks import compare_benchmarks
+
+
+class TestPipelineBenchmark:
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        source = tmp_path / 'source'
+        core = source / '000-core'
+        core.mkdir(parents=True)
+        (core / '001-first.mdc').write_text('# First\n\nBody')
+        (core / '001-first.yaml').write_text('description: First\nversion: 1.0.0\ntags:\n- foundational\n')
+        (core / '002-second.mdc').write_text('---\ndescription: Second\n---\n# Second')
+        return source
+
+    def test_replicate_corpus_cycles_sources(self, source, tmp_path):
+        """Test corpora reach the requested size with renamed copies"""
+        rules_dir = replicate_corpus(tmp_path / 'project', 5, source=source)
+        names = sorted(path.name for path in (rules_dir / '000-core').iterdir())
+        assert names == ['001-first-r1.mdc', '001-first-r1.yaml', '001-first-r2.mdc', '001-first-r2.yaml',
+                         '001-first.mdc', '001-first.yaml', '002-second-r1.mdc', '002-second.mdc']
+
+    def test_measure_output_compares(self):
+        """Test results are in the format compare_benchmarks reads"""
+        result = measure(lambda: sum(range(1000)), repeats=5, warmup=1)
+        assert len(result['samples']['validation_time_ms']) == 5
+        assert result['validation_time_ms'] == result['stats']['validation_time_ms']['median']
+
+        comparison = compare_benchmarks({'loader@10': result}, {'loader@10': result})
+        assert comparison['rules']['loader@10']['metrics']['validation_time_ms']['method'] == 'mann-whitney'
+        assert comparison['regressions'] == []
+
+    def test_scenarios_run_per_size(self, tmp_path):
+        """Test each scenario and size gets its own entry"""
+        benchmarker = PipelineBenchmarker(sizes=[3, 6], scenarios=['loader', 'docs'],
+                                          repeats=2, warmup=0, work_dir=tmp_path)
+        results = benchmarker.run()
+
+        assert list(results) == ['loader@3', 'docs@3', 'loader@6', 'docs@6']
+        assert results['loader@6']['rule_count'] == 6
+        assert all(len(r['samples']['validation_time_ms']) == 2 for r in results.values())
+
+    def test_unavailable_scenario_skipped(self, source, tmp_path):
+        """Test evolution is reported, not raised, on a corpus it cannot use"""
+        replicate_corpus(tmp_path / 'project', 2, source=source)
+        with pytest.raises(ScenarioUnavailable):
+            SCENARIOS['evolution'].setup(tmp_path / 'project')
+
+        benchmarker = PipelineBenchmarker(sizes=[2], scenarios=['evolution'], repeats=1, work_dir=tmp_path)
+        assert benchmarker.run() == {}
+        assert list(benchmarker.skipped) == ['evolution@2']
+
+    def test_unknown_scenario_rejected(self):
+        with pytest.raises(ValueError):
+            PipelineBenchmarker(scenarios=['missing'])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
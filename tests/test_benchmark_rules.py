@@ -96,6 +96,32 @@ author: "Test"
         assert result.file_size_bytes == len(mock_rule_content.encode())
         assert result.memory_usage_kb >= 0
     
+    def test_benchmark_rule_sampled(self, tmp_path, mock_rule_content):
+        """Test statistical mode reports medians, intervals and raw samples"""
+        rule_path = tmp_path / 'test-rule.mdc'
+        rule_path.write_text(mock_rule_content)
+        rule_path.with_suffix('.yaml').write_text('version: 1.0.0\n')
+        
+        benchmarker = RuleBenchmarker(tmp_path, repeats=8, warmup=1)
+        result = benchmarker.benchmark_rule(rule_path)
+        
+        assert result.repeats == 8
+        assert set(result.samples) == {'cold_load_time_ms', 'load_time_ms', 'parse_time_ms', 'validation_time_ms'}
+        assert all(len(values) == 8 for values in result.samples.values())
+        load = result.stats['load_time_ms']
+        assert load['n'] + load['outliers'] == 8
+        assert load['ci_low'] <= load['median'] <= load['ci_high']
+        assert result.load_time_ms == load['median']
+        assert result.cold_load_time_ms == result.stats['cold_load_time_ms']['median']
+        assert result.line_count == mock_rule_content.count('\n') + 1
+        
+        benchmarker.results = [result]
+        output_file = tmp_path / 'baseline.json'
+        benchmarker.save_baseline(output_file)
+        saved = json.loads(output_file.read_text())['test-rule']
+        assert len(saved['samples']['validation_time_ms']) == 8
+        assert saved['stats']['parse_time_ms']['confidence'] == 0.95
+    
     def test_benchmark_all_rules(self, tmp_path):
         """Test benchmarking all rules in directory"""
         rules_dir = tmp_path / '.cursorrules'
@@ -117,6 +143,25 @@ author: "Test"
         assert 'rule1' in rule_names
         assert 'rule2' in rule_names
     
+    def test_benchmark_all_sharded(self, tmp_path):
+        """Test worker shards merge back in serial order with the machine recorded"""
+        rules_dir = tmp_path / 'rules'
+        (rules_dir / '000-core').mkdir(parents=True)
+        for i in range(5):
+            (rules_dir / '000-core' / f'00{i}-rule.mdc').write_text(f'# Rule {i}\n' + 'line\n' * i)
+        
+        serial = RuleBenchmarker(rules_dir)
+        serial.benchmark_all()
+        sharded = RuleBenchmarker(rules_dir, workers=2)
+        sharded.benchmark_all()
+        
+        assert [r.rule_name for r in sharded.results] == [r.rule_name for r in serial.results]
+        assert [r.line_count for r in sharded.results] == [r.line_count for r in serial.results]
+        report = sharded.generate_report()
+        assert report["summary"]["workers"] == 2
+        assert report["machine"]["id"] == serial.fingerprint["id"]
+        assert report["normalized"]["avg_load_time"] > 0
+    
     def test_generate_report(self, tmp_path):
         """Test report generation"""
         benchmarker = RuleBenchmarker(tmp_path)
@@ -0,0 +1,41 @@
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from benchmark_stats import percentile, reject_outliers, median_confidence_interval, summarize
+
+
+class TestBenchmarkStats:
+
+    def test_percentile_interpolates(self):
+        assert percentile([1, 2, 3, 4], 50) == 2.5
+        assert percentile([1, 2, 3, 4], 100) == 4
+        assert percentile([7], 95) == 7
+
+    def test_outliers_rejected_by_iqr_fence(self):
+        """Test a straggler far outside the quartiles is dropped"""
+        kept, rejected = reject_outliers([1.0, 1.1, 0.9, 1.05, 0.95, 25.0])
+        assert rejected == [25.0]
+        assert kept == [0.9, 0.95, 1.0, 1.05, 1.1]
+        assert reject_outliers([1, 100]) == ([1, 100], [])
+
+    def test_median_interval_from_order_statistics(self):
+        """Test the binomial ranks match the textbook n=10 interval"""
+        samples = list(range(1, 11))
+        assert median_confidence_interval(samples) == (2, 9)
+        assert median_confidence_interval([1, 2, 3]) == (1, 3)
+
+    def test_summary(self):
+        summary = summarize([1.0, 2.0, 3.0, 4.0, 5.0, 100.0])
+        assert summary['n'] == 5
+        assert summary['outliers'] == 1
+        assert summary['median'] == 3.0
+        assert summary['min'] == 1.0
+        assert summary['ci_low'] <= summary['median'] <= summary['ci_high']
+        assert summarize([2.0])['stddev'] == 0.0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,43 @@
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from build_manifest import BuildManifest, file_digest, write_if_changed
+
+
+class TestBuildManifest:
+
+    def test_write_if_changed(self, tmp_path):
+        path = tmp_path / 'out' / 'rules.md'
+        assert write_if_changed(path, 'one')
+        mtime = path.stat().st_mtime_ns
+        assert not write_if_changed(path, 'one')
+        assert path.stat().st_mtime_ns == mtime
+        assert write_if_changed(path, 'two')
+        assert path.read_text() == 'two'
+        assert [p.name for p in path.parent.iterdir()] == ['rules.md']  # No temp files left behind
+
+    def test_current_only_with_same_inputs_and_intact_files(self, tmp_path):
+        output = tmp_path / 'rules.md'
+        write_if_changed(output, 'content')
+        manifest = BuildManifest(tmp_path / 'manifest.json')
+        manifest.put('claude', {'inputs': {'rule': 'a'}, 'files': {'rules.md': file_digest(output)}})
+        manifest.save()
+
+        reloaded = BuildManifest(tmp_path / 'manifest.json')
+        assert reloaded.is_current('claude', {'rule': 'a'}, {'rules.md': output})
+        assert not reloaded.is_current('claude', {'rule': 'b'}, {'rules.md': output})
+        assert not reloaded.is_current('codex', {'rule': 'a'}, {'rules.md': output})
+        output.write_text('edited')
+        assert not reloaded.is_current('claude', {'rule': 'a'}, {'rules.md': output})
+
+    def test_corrupt_manifest_is_ignored(self, tmp_path):
+        path = tmp_path / 'manifest.json'
+        path.write_text('{not json')
+        assert BuildManifest(path).entries == {}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,139 @@
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'validation'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'rules'))
+
+from checks import REGISTRY, METADATA_CHECKS, CONTENT, CheckRegistry, Findings, RuleInput, changed_fields
+from rule_validator import EnhancedRuleValidator
+from validate_rules import RuleValidator
+
+
+CONFIG = {
+    'max_lines': 3,
+    'warn_lines': 2,
+    'max_tokens': 5,
+    'approved_tags': ['foundational'],
+    'required_metadata': ['version', 'tags'],
+}
+
+
+class TestCheckEngine:
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        (tmp_path / 'present.mdc').write_text('# Present')
+        return REGISTRY.compile(CONFIG, METADATA_CHECKS, rules_dir=tmp_path)
+
+    def test_findings_in_check_order(self, engine):
+        """Test each check reports its own messages and metrics"""
+        rule = RuleInput('001-rule', 'core', {
+            'version': '1.0',
+            'tags': ['foundational', 'unknown'],
+            'dependencies': ['present.mdc', 'missing.mdc'],
+            'conflicts': [{'rule': 'other'}],
+        }, 'a\nb\nc\nd')
+        findings = engine.run(rule)
+
+        assert list(findings) == list(METADATA_CHECKS)
+        assert findings['version_format'].errors == ['Invalid version format: 1.0']
+        assert findings['approved_tags'].warnings == ["Unknown tags: {'unknown'}"]
+        assert findings['content_size'].errors == ['Rule exceeds maximum lines: 4 > 3']
+        assert findings['content_size'].metrics == {'line_count': 4}
+        assert findings['dependencies_exist'].errors == ['Dependency not found: missing.mdc']
+        assert findings['conflict_resolution'].warnings == ['Conflict without resolution strategy: other']
+
+    def test_settings_compiled_once(self, engine):
+        """Test tag sets and field lists are built at compile time"""
+        assert engine.approved_tags == frozenset(['foundational'])
+        assert engine.needs['required_metadata'] == {'version', 'tags'}
+        assert [check.name for check in engine.select({'tags'})] == ['required_metadata', 'approved_tags']
+
+    def test_unchanged_checks_reuse_previous(self, engine):
+        """Test only checks reading a changed input run again"""
+        rule = RuleInput('001-rule', 'core', {'version': '1.0.0', 'tags': []}, 'body')
+        previous = {name: Findings(warnings=[f'old {name}']) for name in METADATA_CHECKS}
+
+        findings = engine.run(rule, changed={CONTENT}, previous=previous)
+
+        rerun = [name for name, found in findings.items() if found is not previous[name]]
+        assert rerun == ['content_size', 'token_budget']
+        assert findings['version_format'].warnings == ['old version_format']
+
+    def test_partial_findings_kept_on_error(self, engine):
+        """Test checks that ran before a failing one keep their findings"""
+        findings = {}
+        with pytest.raises(TypeError):
+            engine.run(RuleInput('001-rule', 'core', {'dependencies': 3}, 'body'), findings=findings)
+        assert findings['required_metadata'].errors == [
+            'Missing required metadata field: version',
+            'Missing required metadata field: tags'
+        ]
+
+    def test_duplicate_registration_rejected(self):
+        registry = CheckRegistry()
+        registry.register('a', needs=(), phase='p')(lambda engine, rule, findings: None)
+        with pytest.raises(ValueError):
+            registry.register('a', needs=(), phase='p')(lambda engine, rule, findings: None)
+
+    def test_changed_fields(self):
+        assert changed_fields({'a': 1, 'b': 2}, {'a': 1, 'b': 3, 'c': 4}) == {'b', 'c'}
+        assert changed_fields(None, {'a': 1}) is None
+
+
+class TestValidatorIntegration:
+
+    @pytest.fixture
+    def rules_dir(self, tmp_path):
+        rules_dir = tmp_path / 'rules'
+        core = rules_dir / '000-core'
+        core.mkdir(parents=True)
+        for i in range(3):
+            (core / f'00{i}-rule.mdc').write_text(f'# Rule {i}\n\nBody {i}')
+            (core / f'00{i}-rule.yaml').write_text(f'description: Rule {i}\nversion: 1.0.{i}\ntags:\n- foundational\n')
+        return rules_dir
+
+    def test_stale_entry_reruns_affected_checks_only(self, rules_dir, tmp_path):
+        """Test a content edit reruns content checks and reuses metadata findings"""
+        cache_dir = tmp_path / '.cache'
+        cold = EnhancedRuleValidator(rules_dir, cache_dir=cache_dir).validate_all()
+        (rules_dir / '000-core' / '001-rule.mdc').write_text('# Rule 1\n\nEdited body')
+
+        validator = EnhancedRuleValidator(rules_dir, cache_dir=cache_dir)
+        engine = validator.check_engine
+        ran = []
+        real_run = engine.run
+
+        def tracking_run(rule, changed=None, *args, **kwargs):
+            findings = real_run(rule, changed, *args, **kwargs)
+            ran.append((rule.name, sorted(check.name for check in engine.select(changed))))
+            return findings
+
+        with patch.object(engine, 'run', tracking_run):
+            warm = validator.validate_all()
+
+        assert ran == [('001-rule', ['content_size', 'token_budget'])]
+        assert [r['errors'] for r in warm['results']] == [r['errors'] for r in cold['results']]
+        assert [r['warnings'] for r in warm['results']] == [r['warnings'] for r in cold['results']]
+
+    def test_structure_checks_shared_with_rule_validator(self, tmp_path):
+        """Test validate_rules.py reports naming and phase issues via the registry"""
+        rules_dir = tmp_path / 'rules'
+        (rules_dir / '100-cognitive').mkdir(parents=True)
+        (rules_dir / '100-cognitive' / '100-ok.mdc').write_text('Use a divergent phase')
+        (rules_dir / '100-cognitive' / 'Bad_Name.mdc').write_text('plain')
+
+        validator = RuleValidator(str(rules_dir))
+        validator.validate()
+
+        assert validator.warnings == [
+            'Non-standard naming: Bad_Name (expected: NNN-kebab-case)',
+            'Category mismatch: Bad_Name in 100-cognitive'
+        ]
+        assert validator.errors == ['Phase-based rules found but divergence-convergence orchestrator missing']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -7,7 +7,8 @@ from unittest.mock import patch, mock_open, MagicMock
 
 sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
 
-from compare_benchmarks import load_metrics, compare_metrics
+from compare_benchmarks import (load_metrics, load_policies, compare_metrics, compare_benchmarks,
+                                MetricPolicy)
 
 
 class TestCompareBenchmarks:
@@ -158,6 +159,67 @@ class TestCompareBenchmarks:
         assert isinstance(report, str)
         assert len(report) > 0
     
+    def test_empty_baseline(self, current_data):
+        """Test an empty baseline reports every rule as new instead of crashing"""
+        report = compare_metrics({}, current_data)
+        assert '## 🆕 New Rules' in report
+        assert compare_benchmarks({}, current_data)['summary']['new_rules'] == 3
+    
+    def test_missing_metrics_tolerated(self):
+        """Test rules lacking a metric are compared on the rest"""
+        baseline = {"rule1": {"token_count": 100}}
+        current = {"rule1": {"token_count": 150, "validation_time_ms": 1.0}}
+        
+        comparison = compare_benchmarks(baseline, current)
+        assert comparison['regressions'] == ['rule1']
+        assert set(comparison['rules']['rule1']['metrics']) == {'token_count'}
+        assert 'rule1' in compare_metrics(baseline, current)
+    
+    def test_sub_millisecond_change_ignored(self):
+        """Test a large relative change below the absolute threshold is noise"""
+        baseline = {"rule1": {"token_count": 100, "validation_time_ms": 0.1}}
+        current = {"rule1": {"token_count": 100, "validation_time_ms": 0.3}}
+        
+        assert compare_benchmarks(baseline, current)['regressions'] == []
+    
+    def test_samples_require_significance(self):
+        """Test overlapping samples are not flagged but a consistent shift is"""
+        noise = [3.0, 1.0, 2.9, 1.1, 3.2, 0.9, 3.1, 1.2]
+        baseline = {"rule1": {"token_count": 100, "validation_time_ms": 2.0,
+                              "samples": {"validation_time_ms": noise}}}
+        jittery = {"rule1": {"token_count": 100, "validation_time_ms": 3.0,
+                             "samples": {"validation_time_ms": [x + 0.2 for x in noise]}}}
+        slower = {"rule1": {"token_count": 100, "validation_time_ms": 6.0,
+                            "samples": {"validation_time_ms": [x + 4 for x in noise]}}}
+        
+        jitter = compare_benchmarks(baseline, jittery)['rules']['rule1']['metrics']['validation_time_ms']
+        assert jitter['method'] == 'mann-whitney'
+        assert jitter['verdict'] == 'unchanged'
+        
+        slowdown = compare_benchmarks(baseline, slower)['rules']['rule1']['metrics']['validation_time_ms']
+        assert slowdown['verdict'] == 'regression'
+        assert slowdown['p_value'] < 0.05
+        assert slowdown['median_delta_ci'][0] > 0
+    
+    def test_policy_overrides(self, tmp_path, baseline_data, current_data):
+        """Test per-metric policies loaded from JSON change the verdicts"""
+        policy_file = tmp_path / 'policies.json'
+        policy_file.write_text(json.dumps({"validation_time_ms": {"relative": 0.5},
+                                           "line_count": {"relative": 0.1, "absolute": 5}}))
+        policies = load_policies(str(policy_file))
+        
+        assert policies['validation_time_ms'] == MetricPolicy(relative=0.5, absolute=0.5, noisy=True)
+        comparison = compare_benchmarks(baseline_data, current_data, policies)
+        assert comparison['regressions'] == ['rule2']
+        assert comparison['rules']['rule2']['metrics']['line_count']['verdict'] == 'regression'
+        assert comparison['rules']['rule2']['metrics']['validation_time_ms']['verdict'] == 'unchanged'
+    
+    def test_json_output_is_serializable(self, baseline_data, current_data):
+        comparison = compare_benchmarks(baseline_data, current_data)
+        assert json.loads(json.dumps(comparison))['summary'] == {
+            'improvements': 0, 'regressions': 1, 'new_rules': 1, 'removed_rules': 0
+        }
+    
     @patch('sys.argv', ['compare_benchmarks.py', 'baseline.json', 'current.json'])
     def test_main_execution(self, tmp_path, baseline_data, current_data, monkeypatch):
         """Test main script execution"""
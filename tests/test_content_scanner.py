@@ -0,0 +1,59 @@
+import pytest
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'validation'))
+
+from content_scanner import ContentScanner, PatternScanner
+
+
+class TestPatternScanner:
+
+    def test_overlapping_matches(self):
+        """Test patterns sharing prefixes and suffixes are all reported"""
+        scanner = PatternScanner([(word, word, True) for word in ('he', 'she', 'his', 'hers')])
+        found = [(start, pattern.literal) for start, pattern in scanner.matches('ushers')]
+        assert found == [(1, 'she'), (2, 'he'), (2, 'hers')]
+
+    def test_case_sensitivity_per_pattern(self):
+        """Test only case-insensitive patterns match across case"""
+        scanner = PatternScanner([('Divergent', 'loose', False), ('internal_thought', 'strict', True)])
+        assert scanner.labels('A DIVERGENT Internal_Thought') == {'loose'}
+        assert scanner.labels('divergent internal_thought') == {'loose', 'strict'}
+
+    def test_labels_agree_with_matches(self):
+        """Test the substring checks and positional matches find the same patterns"""
+        scanner = PatternScanner([('Divergent', 'loose', False), ('internal_thought', 'strict', True),
+                                  ('gent', 'suffix', False)])
+        for text in ('İ DIVERGENT internal_thought', 'divergen', 'İİ divergENT'):
+            found = scanner.matches(text)
+            assert scanner.labels(text) == {pattern.label for _, pattern in found}
+            assert all(text[start:start + len(pattern.literal)].lower() == pattern.literal.lower()
+                       for start, pattern in found)
+
+    def test_empty_pattern_rejected(self):
+        with pytest.raises(ValueError):
+            PatternScanner([('', 'empty', True)])
+
+
+class TestContentScanner:
+
+    def test_features_match_substring_checks(self):
+        """Test one scan finds what the separate regex and substring checks did"""
+        text = ('See @Rule:103-divergence-convergence and @Rule:x.y, @Rule: none.\n'
+                'Use a Divergence Phase, then internal_thought / user_facing_response.')
+        features = ContentScanner().features(text)
+
+        assert list(features.references) == re.findall(r'@Rule:([a-zA-Z0-9\-_.]+)', text)
+        assert features.labels == {'reference', 'divergence-convergence', 'divergence',
+                                   'internal_thought', 'user_facing_response'}
+
+    def test_no_features(self):
+        features = ContentScanner().features('Plain rule body')
+        assert features.references == ()
+        assert features.labels == frozenset()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
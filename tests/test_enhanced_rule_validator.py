@@ -0,0 +1,253 @@
+import pytest
+import sys
+import builtins
+import subprocess
+from collections import Counter
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'validation'))
+
+import rule_validator
+from rule_validator import EnhancedRuleValidator, DependencyGraph, changed_rule_files
+
+
+def _strip_timings(report):
+    """Drop fields that vary between runs"""
+    results = []
+    for result in report['results']:
+        result = dict(result)
+        result.pop('performance', None)
+        results.append(result)
+    return results
+
+
+class TestEnhancedRuleValidator:
+
+    @pytest.fixture
+    def rules_dir(self, tmp_path):
+        """Create a rules tree with valid, invalid and orphaned rules"""
+        rules_dir = tmp_path / 'rules'
+        core = rules_dir / '000-core'
+        core.mkdir(parents=True)
+        for i in range(6):
+            (core / f'00{i}-rule.mdc').write_text(f'# Rule {i}\n\n## Section\nBody {i}')
+            (core / f'00{i}-rule.yaml').write_text(
+                f'description: Rule {i}\nversion: 1.0.{i}\ntags:\n- foundational\n'
+                f'dependencies:\n- 00{(i + 1) % 6}-rule\n'
+            )
+        (core / '006-broken.mdc').write_text('no heading')
+        (core / '006-broken.yaml').write_text('version: not-semver\n')
+        (core / '007-orphan.mdc').write_text('# Orphan')
+        (core / '_category.yaml').write_text('name: core\n')
+        return rules_dir
+
+    def test_parallel_matches_serial(self, rules_dir):
+        """Test the process pool produces the same report as a serial run"""
+        serial = EnhancedRuleValidator(rules_dir).validate_all(workers=1)
+        parallel = EnhancedRuleValidator(rules_dir).validate_all(workers=2)
+
+        assert _strip_timings(parallel) == _strip_timings(serial)
+        assert parallel['error_count'] == serial['error_count']
+        assert parallel['dependency_cycles'] == serial['dependency_cycles']
+        assert len(serial['dependency_cycles']) == 1
+
+    def test_each_file_read_once(self, rules_dir):
+        """Test validation and graph building share a single read per file"""
+        validator = EnhancedRuleValidator(rules_dir)
+        real_open = builtins.open
+        reads = Counter()
+
+        def counting_open(path, *args, **kwargs):
+            if Path(path).suffix in ('.mdc', '.yaml'):
+                reads[Path(path).name] += 1
+            return real_open(path, *args, **kwargs)
+
+        with patch('builtins.open', counting_open):
+            validator.validate_all()
+
+        assert reads['000-rule.mdc'] == 1
+        assert reads['000-rule.yaml'] == 1
+        assert max(reads.values()) == 1
+
+    def test_missing_metadata_reported(self, rules_dir):
+        """Test rules without a YAML sidecar are reported"""
+        report = EnhancedRuleValidator(rules_dir).validate_all(workers=2)
+
+        assert len(report['results']) == 8
+        orphan = next(r for r in report['results'] if r['rule'] == '007-orphan.mdc')
+        assert orphan['errors'] == ['Missing metadata file: 007-orphan.yaml']
+
+    def test_cache_reuses_unchanged_results(self, rules_dir, tmp_path):
+        """Test a warm run validates nothing and reports the same results"""
+        cache_dir = tmp_path / '.cache'
+        cold = EnhancedRuleValidator(rules_dir, cache_dir=cache_dir).validate_all()
+
+        warm = EnhancedRuleValidator(rules_dir, cache_dir=cache_dir)
+        with patch.object(warm, '_validate_source', side_effect=AssertionError('validated')):
+            report = warm.validate_all()
+
+        assert _strip_timings(report) == _strip_timings(cold)
+        assert report['dependency_cycles'] == cold['dependency_cycles']
+
+    def test_cache_invalidation(self, rules_dir, tmp_path):
+        """Test edits, dependency targets and config changes invalidate entries"""
+        cache_dir = tmp_path / '.cache'
+        core = rules_dir / '000-core'
+        (core / '001-rule.yaml').write_text('description: Rule 1\nversion: 1.0.1\ndependencies:\n- extra.mdc\n')
+        EnhancedRuleValidator(rules_dir, cache_dir=cache_dir).validate_all()
+
+        def revalidated(configure=None):
+            validator = EnhancedRuleValidator(rules_dir, cache_dir=cache_dir)
+            if configure:
+                configure(validator)
+            with patch.object(validator, '_validate_source', wraps=validator._validate_source) as source:
+                validator.validate_all()
+            return sorted(call.args[0].name for call in source.call_args_list)
+
+        assert revalidated() == []
+
+        (core / '002-rule.mdc').write_text('# Rule 2 edited')
+        assert revalidated() == ['002-rule.mdc']
+
+        (rules_dir / 'extra.mdc').write_text('# Now exists')
+        assert revalidated() == ['001-rule.mdc']
+
+        (rules_dir.parent / 'validation').mkdir()
+        (rules_dir.parent / 'validation' / 'config.yaml').write_text('max_lines: 10\n')
+        assert len(revalidated()) == 7
+
+    def test_check_code_invalidates_cache(self, rules_dir, tmp_path, monkeypatch):
+        """Test editing check code changes the fingerprint cached results are keyed by"""
+        before = EnhancedRuleValidator(rules_dir)._fingerprint()
+        edited = tmp_path / 'checks.py'
+        edited.write_text(Path(sys.modules['checks'].__file__).read_text() + '\n# edited\n')
+        monkeypatch.setattr(sys.modules['checks'], '__file__', str(edited))
+        assert EnhancedRuleValidator(rules_dir)._fingerprint() != before
+
+    def test_token_counts_follow_cache_dir(self, rules_dir, tmp_path, monkeypatch):
+        """Test token counts are only persisted when a cache directory is given"""
+        import token_counter
+        monkeypatch.setattr(token_counter, '_shared_counter', None)
+        validator = EnhancedRuleValidator(rules_dir)
+        validator.validate_all()
+        validator.token_counter.save()
+        assert validator.token_counter.cache_path is None
+        assert not (rules_dir.parent / '.cache').exists()
+
+        monkeypatch.setattr(token_counter, '_shared_counter', None)
+        validator = EnhancedRuleValidator(rules_dir, cache_dir=tmp_path / 'cache')
+        validator.validate_all()
+        validator.token_counter.save()
+        assert (tmp_path / 'cache' / token_counter.TOKEN_CACHE_FILENAME).exists()
+
+    def test_changed_scope_includes_dependents(self, rules_dir):
+        """Test only changed rules and rules depending on them are validated"""
+        core = rules_dir / '000-core'
+        for i in range(6):
+            (core / f'00{i}-rule.yaml').write_text(f'description: Rule {i}\nversion: 1.0.{i}\n')
+        (core / '001-rule.yaml').write_text('description: Rule 1\nversion: 1.0.1\ndependencies:\n- 000-rule\n')
+        (core / '002-rule.yaml').write_text('description: Rule 2\nversion: 1.0.2\ndependencies:\n- 001-rule\n')
+
+        report = EnhancedRuleValidator(rules_dir).validate_all(changed={core / '000-rule.mdc'})
+
+        assert [r['rule'] for r in report['results']] == ['000-rule.mdc', '001-rule.mdc', '002-rule.mdc']
+
+        report = EnhancedRuleValidator(rules_dir).validate_all(changed={rules_dir / 'config.yaml'})
+        assert report['total_rules'] == 0  # Not the validator's config, so no rule is affected
+
+        report = EnhancedRuleValidator(rules_dir).validate_all(
+            changed={rules_dir.parent / 'validation' / 'config.yaml'})
+        assert report['total_rules'] == 8
+
+    def test_changed_rule_files_from_git(self, rules_dir):
+        """Test modified and untracked files are picked up from git"""
+        repo = rules_dir.parent
+        git = lambda *args: subprocess.run(['git', *args], cwd=repo, check=True, capture_output=True)
+        git('init', '-q')
+        git('-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-q', '--allow-empty', '-m', 'empty')
+        git('add', 'rules')
+        git('-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-q', '-m', 'rules')
+
+        (rules_dir / '000-core' / '003-rule.yaml').write_text('version: 2.0.0\n')
+        (rules_dir / '000-core' / '008-new.mdc').write_text('# New')
+
+        changed = {path.relative_to(repo).as_posix() for path in changed_rule_files(rules_dir)}
+        assert changed == {'rules/000-core/003-rule.yaml', 'rules/000-core/008-new.mdc'}
+        assert changed_rule_files(rules_dir, since='HEAD~1') == set(rules_dir.rglob('*.*'))
+
+
+    def test_changed_only_without_git_exits_cleanly(self, monkeypatch, capsys):
+        """Test git failures end the CLI with a message instead of a traceback"""
+        def fail(rules_dir, since):
+            raise subprocess.CalledProcessError(128, ['git'], stderr='fatal: not a git repository\n')
+        monkeypatch.setattr(rule_validator, 'changed_rule_files', fail)
+        monkeypatch.setattr(sys, 'argv', ['rule_validator.py', '--changed-only', '--no-cache'])
+        with pytest.raises(SystemExit) as exit_info:
+            rule_validator.main()
+        assert exit_info.value.code == 2
+        assert 'not a git repository' in capsys.readouterr().err
+
+class TestDependencyGraph:
+
+    @pytest.fixture
+    def graph(self):
+        """a -> b -> c -> a is a cycle; c also depends on the chain d -> e"""
+        graph = DependencyGraph()
+        for rule, dep in [('a', 'b'), ('b', 'c'), ('c', 'a'), ('c', 'd'),
+                          ('d', 'e'), ('x', 'a'), ('y', 'x'), ('e', 'e')]:
+            graph.add_edge(rule, dep)
+        return graph
+
+    def test_cycle_witnesses(self, graph):
+        """Test one shortest witness is reported per cyclic component"""
+        assert sorted(graph.find_cycles()) == [['a', 'b', 'c'], ['e']]
+        assert len(graph.find_cycles(max_cycles=1)) == 1
+
+    def test_components_in_dependency_order(self, graph):
+        """Test every component follows the components it depends on"""
+        order = {}
+        for number, component in enumerate(graph.strongly_connected_components()):
+            for rule in component:
+                order[rule] = number
+        for rule, deps in graph.successors.items():
+            assert all(order[dep] <= order[rule] for dep in deps)
+
+    def test_depth_over_condensation(self, graph):
+        """Test depth is the longest chain, with a cycle counted as one level"""
+        depths = {rule: graph.get_dependency_depth(rule) for rule in 'abcdexy'}
+        assert depths == {'a': 2, 'b': 2, 'c': 2, 'd': 1, 'e': 0, 'x': 3, 'y': 4}
+        assert graph.get_dependency_depth('missing') == 0
+
+    def test_tree_cuts_cycles_and_shares_subtrees(self, graph):
+        """Test trees terminate on cycles and reuse shared, read-only subtrees"""
+        tree = graph.get_dependency_tree('y')
+        assert tree == {'x': {'a': {'b': {'c': {'a': {}, 'd': {'e': {'e': {}}}}}}}}
+        with pytest.raises(TypeError):
+            tree['x']['a']['b']['c']['d']['extra'] = {}
+
+        graph.add_edge('z', 'd')
+        assert graph.get_dependency_tree('z')['d'] is graph.get_dependency_tree('c')['d']
+
+    def test_components_are_copies(self, graph):
+        graph.strongly_connected_components()[0].append('intruder')
+        assert 'intruder' not in sum(graph.strongly_connected_components(), [])
+
+    def test_dependents(self, graph):
+        """Test transitive dependents follow reverse edges"""
+        assert graph.get_dependents('d') == {'a', 'b', 'c', 'x', 'y'}
+        assert graph.get_dependents('y') == set()
+
+    def test_long_chain_without_recursion(self):
+        """Test deep graphs are analyzed without hitting the recursion limit"""
+        graph = DependencyGraph()
+        for i in range(sys.getrecursionlimit() * 2):
+            graph.add_edge(f'r{i}', f'r{i + 1}')
+
+        assert graph.find_cycles() == []
+        assert graph.get_dependency_depth('r0') == sys.getrecursionlimit() * 2
+        assert list(graph.get_dependency_tree('r0')) == ['r1']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
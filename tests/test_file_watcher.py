@@ -0,0 +1,142 @@
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from file_watcher import FileWatcher, FileChange, coalesce, _DirtyPathHandler
+
+
+class TestFileWatcher:
+
+    @pytest.fixture
+    def rules_dir(self, tmp_path):
+        rules_dir = tmp_path / 'rules'
+        (rules_dir / '000-core').mkdir(parents=True)
+        (rules_dir / '000-core' / 'rule1.mdc').write_text('# Rule 1')
+        (rules_dir / '000-core' / 'rule1.yaml').write_text('version: 1.0.0')
+        (rules_dir / '000-core' / 'notes.txt').write_text('ignored')
+        return rules_dir
+
+    def test_snapshot_filters_suffixes(self, rules_dir):
+        """Test only watched suffixes are tracked"""
+        watcher = FileWatcher([rules_dir], use_watchdog=False)
+        names = sorted(path.name for path in watcher.snapshot())
+        assert names == ['rule1.mdc', 'rule1.yaml']
+
+    def test_poll_detects_changes(self, rules_dir):
+        """Test created, modified and deleted files are reported"""
+        watcher = FileWatcher([rules_dir], use_watchdog=False)
+        core = rules_dir / '000-core'
+
+        (core / 'rule1.mdc').write_text('# Rule 1 edited')
+        (core / 'rule2.mdc').write_text('# Rule 2')
+        (core / 'rule1.yaml').unlink()
+
+        changes = watcher.poll()
+        assert changes == [
+            FileChange(core / 'rule1.mdc', 'modified'),
+            FileChange(core / 'rule1.yaml', 'deleted'),
+            FileChange(core / 'rule2.mdc', 'created'),
+        ]
+        assert watcher.poll() == []
+
+    def test_poll_specific_paths(self, rules_dir):
+        """Test polling a dirty set only stats those paths"""
+        watcher = FileWatcher([rules_dir], use_watchdog=False)
+        core = rules_dir / '000-core'
+        (core / 'rule1.mdc').write_text('# changed')
+        (core / 'rule1.yaml').write_text('version: 2.0.0')
+
+        assert watcher.poll([core / 'rule1.mdc', core / 'notes.txt']) == [
+            FileChange(core / 'rule1.mdc', 'modified')
+        ]
+
+    def test_coalesce(self, tmp_path):
+        """Test bursts collapse into net changes"""
+        a, b, c = tmp_path / 'a.mdc', tmp_path / 'b.mdc', tmp_path / 'c.mdc'
+        changes = coalesce([
+            FileChange(a, 'created'), FileChange(a, 'modified'),
+            FileChange(b, 'created'), FileChange(b, 'deleted'),
+            FileChange(c, 'deleted'), FileChange(c, 'created'),
+        ])
+        assert changes == [FileChange(a, 'created'), FileChange(c, 'modified')]
+
+    def test_background_polling_with_debounce(self, rules_dir):
+        """Test the watch thread delivers a coalesced batch"""
+        watcher = FileWatcher([rules_dir], interval=0.01, debounce=0.02, use_watchdog=False)
+        batches = []
+        delivered = threading.Event()
+
+        def on_change(changes):
+            batches.append(changes)
+            delivered.set()
+
+        watcher.start(on_change)
+        try:
+            (rules_dir / '000-core' / 'rule3.mdc').write_text('# Rule 3')
+            assert delivered.wait(5)
+        finally:
+            watcher.stop()
+
+        assert batches[0] == [FileChange(rules_dir / '000-core' / 'rule3.mdc', 'created')]
+
+    def test_failed_callback_keeps_watching(self, rules_dir):
+        """Test an exception from one batch does not stop later deliveries"""
+        watcher = FileWatcher([rules_dir], interval=0.01, use_watchdog=False)
+        batches = []
+        delivered = threading.Event()
+
+        def on_change(changes):
+            batches.append(changes)
+            if len(batches) == 1:
+                raise ValueError('bad batch')
+            delivered.set()
+
+        watcher.start(on_change)
+        try:
+            core = rules_dir / '000-core'
+            (core / 'rule3.mdc').write_text('# Rule 3')
+            deadline = time.time() + 5
+            while not batches and time.time() < deadline:
+                time.sleep(0.01)
+            (core / 'rule4.mdc').write_text('# Rule 4')
+            assert delivered.wait(5)
+        finally:
+            watcher.stop()
+
+        assert batches[-1] == [FileChange(rules_dir / '000-core' / 'rule4.mdc', 'created')]
+
+    def test_mark_dirty_wakes_watchdog_mode(self, rules_dir):
+        """Test dirty paths from filesystem events are re-checked"""
+        watcher = FileWatcher([rules_dir], use_watchdog=False)
+        watcher._observer = MagicMock()  # behave as if watchdog were running
+        rule = rules_dir / '000-core' / 'rule1.mdc'
+        rule.write_text('# edited')
+
+        watcher.mark_dirty([rule, rules_dir / '000-core' / 'notes.txt'])
+        assert watcher._next_batch() == [FileChange(rule, 'modified')]
+
+    def test_directory_move_rescans_both_subtrees(self, rules_dir):
+        """Test moving a directory reports its files as deleted and created"""
+        watcher = FileWatcher([rules_dir], use_watchdog=False)
+        watcher._observer = MagicMock()
+        src, dest = rules_dir / '000-core', rules_dir / '100-core'
+        src.rename(dest)
+
+        event = SimpleNamespace(event_type='moved', is_directory=True, src_path=str(src), dest_path=str(dest))
+        _DirtyPathHandler(watcher).on_any_event(event)
+        assert watcher._next_batch() == [
+            FileChange(src / 'rule1.mdc', 'deleted'),
+            FileChange(src / 'rule1.yaml', 'deleted'),
+            FileChange(dest / 'rule1.mdc', 'created'),
+            FileChange(dest / 'rule1.yaml', 'created'),
+        ]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
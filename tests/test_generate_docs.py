@@ -235,7 +235,8 @@ performance:
                 
                 mock_generate.assert_called_with(
                     '/custom/rules',
-                    str(Path(__file__).parent.parent / 'docs' / 'generated')
+                    str(Path(__file__).parent.parent / 'docs' / 'generated'),
+                    draw_graph=True
                 )
 
 
@@ -0,0 +1,113 @@
+import pytest
+import sys
+import json
+import cProfile
+import pstats
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'validation'))
+
+from instrumentation import (
+    Instrumentation, PhaseHistogram, collapsed_stacks, combine_profiles
+)
+from rule_validator import EnhancedRuleValidator
+
+
+def _leaf(n):
+    return sum(range(n))
+
+
+def _branch():
+    return _leaf(20000) + _leaf(40000)
+
+
+class TestInstrumentation:
+
+    def test_histogram_percentiles_and_merge(self):
+        """Test bucket counts, percentile bounds and merging"""
+        fast, slow = PhaseHistogram(), PhaseHistogram()
+        for _ in range(95):
+            fast.record(0.2)
+        for _ in range(5):
+            slow.record(40.0)
+        fast.merge(slow)
+
+        data = fast.to_dict()
+        assert data['count'] == 100
+        assert data['p50_ms'] == 0.25
+        assert data['p95_ms'] == 0.25
+        assert fast.percentile(99) == 40.0
+        assert data['buckets'] == {'<=0.25ms': 95, '<=50ms': 5}
+
+    def test_phase_scope_records_allocations(self):
+        """Test tracemalloc attributes allocations to the phase that made them"""
+        instrumentation = Instrumentation(trace_allocations=True)
+        instrumentation.start()
+        with instrumentation.phase('content_checks') as scope:
+            retained = [bytearray(1024) for _ in range(100)]
+        with instrumentation.phase('metadata_checks'):
+            pass
+        instrumentation.stop()
+
+        report = instrumentation.to_dict()
+        assert scope.peak_bytes >= 100 * 1024
+        assert report['allocations']['content_checks']['net_bytes'] >= 100 * 1024
+        assert report['allocations']['metadata_checks']['net_bytes'] < 1024
+        assert list(report['phases']) == ['metadata_checks', 'content_checks']
+        assert retained
+
+    def test_collapsed_stacks_follow_call_paths(self):
+        """Test self time is attributed to full caller chains"""
+        profiler = cProfile.Profile()
+        profiler.enable()
+        _branch()
+        profiler.disable()
+
+        stacks = collapsed_stacks(combine_profiles(profiler))
+        leaf_paths = [stack for stack in stacks if stack.split(';')[-1].startswith('<built-in method builtins.sum>')]
+        assert any('_branch (test_instrumentation.py' in path and '_leaf (' in path for path in leaf_paths)
+
+    def test_combine_profiles_merges_worker_stats(self):
+        """Test raw stats dicts from other processes are merged"""
+        worker = cProfile.Profile()
+        worker.enable()
+        _leaf(1000)
+        worker.disable()
+        worker.create_stats()
+
+        combined = combine_profiles(None, [worker.stats, worker.stats])
+        leaf = next(value for key, value in combined.stats.items() if key[2] == '_leaf')
+        assert leaf[1] == 2
+
+    def test_validator_profile_dump(self, tmp_path):
+        """Test validate_all writes phases, pstats and collapsed stacks across workers"""
+        rules_dir = tmp_path / 'rules' / '000-core'
+        rules_dir.mkdir(parents=True)
+        for i in range(4):
+            (rules_dir / f'00{i}-rule.mdc').write_text(f'# Rule {i}')
+            (rules_dir / f'00{i}-rule.yaml').write_text(f'description: Rule {i}\nversion: bad\n')
+
+        validator = EnhancedRuleValidator(tmp_path / 'rules', profile=True)
+        report = validator.validate_all(workers=2)
+        written = validator.write_profile(tmp_path / 'profile')
+
+        phases = report['instrumentation']['phases']
+        assert phases['yaml_decode']['count'] == 4
+        assert phases['fix_suggestions']['count'] == 4
+        assert json.loads(written['phases'].read_text())['phases'].keys() == phases.keys()
+        functions = {key[2] for key in pstats.Stats(str(written['pstats'])).stats}
+        assert '_validate_source' in functions
+        assert written['collapsed'].read_text().strip()
+
+    def test_profiling_off_by_default(self, tmp_path):
+        """Test no cProfile profiler is created unless requested"""
+        (tmp_path / 'rules').mkdir()
+        validator = EnhancedRuleValidator(tmp_path / 'rules')
+        validator.validate_all()
+
+        assert validator._profiler is None
+        assert validator.profile_stats() is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
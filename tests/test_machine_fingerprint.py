@@ -0,0 +1,37 @@
+import os
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from machine_fingerprint import allowed_cpus, fingerprint_id, machine_fingerprint, pin_to_cpu
+
+
+class TestMachineFingerprint:
+
+    def test_fingerprint_fields(self):
+        fingerprint = machine_fingerprint(calibration=True)
+        assert {'cpu_model', 'governor', 'python', 'libyaml', 'id'} <= set(fingerprint)
+        assert fingerprint['calibration_ms'] > 0
+
+    def test_id_ignores_per_run_fields(self):
+        """Test CPU counts and calibration do not change the machine id"""
+        fingerprint = machine_fingerprint()
+        varied = dict(fingerprint, cpu_count=999, allowed_cpus=1, calibration_ms=1.0)
+        assert fingerprint_id(varied) == fingerprint['id']
+        assert fingerprint_id(dict(fingerprint, python='0.0.0')) != fingerprint['id']
+
+    @pytest.mark.skipif(not hasattr(os, 'sched_setaffinity'), reason="CPU affinity not supported")
+    def test_pin_to_allowed_cpu(self):
+        original = allowed_cpus()
+        cpu = min(original)
+        try:
+            assert pin_to_cpu(cpu)
+            assert allowed_cpus() == {cpu}
+        finally:
+            os.sched_setaffinity(0, original)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
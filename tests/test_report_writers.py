@@ -0,0 +1,98 @@
+import pytest
+import sys
+import json
+from io import StringIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'validation'))
+
+from report_writers import (
+    ReportWriter, NdjsonReportWriter, SarifReportWriter, HtmlReportWriter, sarif_rule_for
+)
+from rule_validator import ValidationResult, ReportSummary, EnhancedRuleValidator
+
+
+def _results(tmp_path):
+    return [
+        ValidationResult(rule_path=tmp_path / 'rules' / 'a.mdc'),
+        ValidationResult(rule_path=tmp_path / 'rules' / 'b.mdc', passed=False,
+                         errors=['Invalid version format: x', 'Missing required metadata field: tags'],
+                         warnings=['Unknown tags: {<script>}']),
+    ]
+
+
+def _write(writer, results):
+    summary = ReportSummary(collect_fixes=False)
+    writer.begin('2024-01-01T00:00:00')
+    for result in results:
+        summary.add(result)
+        writer.write_result(result)
+    writer.end(summary.to_dict())
+
+
+class TestReportWriters:
+
+    def test_writers_must_implement_write_result(self):
+        with pytest.raises(TypeError):
+            ReportWriter(StringIO())
+
+    def test_ndjson_one_line_per_result(self, tmp_path):
+        """Test each result is a line followed by the summary"""
+        stream = StringIO()
+        _write(NdjsonReportWriter(stream, base_dir=tmp_path), _results(tmp_path))
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [r['type'] for r in records] == ['result', 'result', 'summary']
+        assert records[1]['path'] == 'rules/b.mdc'
+        assert records[1]['status'] == 'FAIL'
+        assert records[2]['error_count'] == 2
+
+    def test_sarif_log(self, tmp_path):
+        """Test the streamed SARIF document is valid and references its rules"""
+        stream = StringIO()
+        _write(SarifReportWriter(stream, base_dir=tmp_path), _results(tmp_path))
+
+        log = json.loads(stream.getvalue())
+        run = log['runs'][0]
+        assert log['version'] == '2.1.0'
+        assert [(r['ruleId'], r['level']) for r in run['results']] == [
+            ('RV003', 'error'), ('RV002', 'error'), ('RV004', 'warning')
+        ]
+        assert run['results'][0]['locations'][0]['physicalLocation']['artifactLocation']['uri'] == 'rules/b.mdc'
+        assert [r['id'] for r in run['tool']['driver']['rules']] == ['RV002', 'RV003', 'RV004']
+        assert run['invocations'][0]['properties']['total_rules'] == 2
+
+    def test_sarif_unclassified_message(self):
+        assert sarif_rule_for('Something new') == ('RV999', 'unclassified')
+
+    def test_html_rows_are_escaped(self, tmp_path):
+        """Test rows are written incrementally and issue text is escaped"""
+        stream = StringIO()
+        _write(HtmlReportWriter(stream), _results(tmp_path))
+
+        html = stream.getvalue()
+        assert html.count('<td class="error">FAIL</td>') == 1
+        assert '&lt;script&gt;' in html
+        assert '<li>Total Rules: 2</li>' in html
+
+    def test_validate_all_streams_without_retaining_results(self, tmp_path):
+        """Test a streaming run writes every rule and keeps no results in memory"""
+        rules_dir = tmp_path / 'rules' / '000-core'
+        rules_dir.mkdir(parents=True)
+        for i in range(5):
+            (rules_dir / f'00{i}-rule.mdc').write_text(f'# Rule {i}')
+            (rules_dir / f'00{i}-rule.yaml').write_text(f'description: Rule {i}\nversion: 1.0.{i}\n')
+
+        validator = EnhancedRuleValidator(tmp_path / 'rules')
+        stream = StringIO()
+        summary = validator.validate_all(workers=2, writer=NdjsonReportWriter(stream))
+
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 6
+        assert validator.results == []
+        assert summary['total_rules'] == 5
+        assert 'results' not in summary
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
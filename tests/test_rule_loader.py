@@ -0,0 +1,224 @@
+import pytest
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'validation'))
+
+from rule_loader import RuleLoader, CACHE_FILENAME
+
+
+class TestRuleLoader:
+
+    @pytest.fixture
+    def rules_dir(self, tmp_path):
+        """Create a small rules tree with split-YAML and frontmatter rules"""
+        rules_dir = tmp_path / 'rules'
+        (rules_dir / '000-core').mkdir(parents=True)
+        (rules_dir / '100-cognitive').mkdir(parents=True)
+
+        (rules_dir / '000-core' / '001-alpha.mdc').write_text('# Alpha\nAlpha body text')
+        (rules_dir / '000-core' / '001-alpha.yaml').write_text(
+            'version: 1.0.0\ncategory: 000-core\ntags:\n- foundational\n'
+            'dependencies:\n- 101-beta\n'
+        )
+        (rules_dir / '100-cognitive' / '101-beta.mdc').write_text(
+            '---\nversion: 2.0.0\ncategory: 100-cognitive\ntags:\n- reasoning\n---\n# Beta\nBeta body'
+        )
+        return rules_dir
+
+    def test_load_yaml_first(self, rules_dir):
+        """Test metadata comes from the YAML sidecar when present"""
+        loader = RuleLoader(rules_dir)
+        rule = loader.load_rule(rules_dir / '000-core' / '001-alpha.mdc')
+
+        assert rule.name == '001-alpha'
+        assert rule.version == '1.0.0'
+        assert rule.content == '# Alpha\nAlpha body text'
+
+    def test_load_frontmatter_fallback(self, rules_dir):
+        """Test frontmatter is parsed when no YAML sidecar exists"""
+        loader = RuleLoader(rules_dir)
+        rule = loader.load_rule(rules_dir / '100-cognitive' / '101-beta.mdc')
+
+        assert rule.version == '2.0.0'
+        assert rule.category == '100-cognitive'
+        assert rule.content == '# Beta\nBeta body'
+
+    def test_persistent_cache_skips_yaml_on_warm_run(self, rules_dir, tmp_path):
+        """Test a warm loader never calls the YAML parser"""
+        cache_dir = tmp_path / '.cache'
+        cold = RuleLoader(rules_dir, cache_dir=cache_dir)
+        cold_rules = cold.load_all()
+        cold.close()
+
+        assert (cache_dir / CACHE_FILENAME).exists()
+
+        warm = RuleLoader(rules_dir, cache_dir=cache_dir)
+        with patch('rule_loader._load_yaml_text', side_effect=AssertionError('parsed')):
+            warm_rules = warm.load_all()
+        warm.close()
+
+        assert set(warm_rules) == set(cold_rules)
+        for name, rule in cold_rules.items():
+            assert warm_rules[name].metadata == rule.metadata
+            assert warm_rules[name].content == rule.content
+
+    def test_persistent_cache_content_hash_fallback(self, rules_dir, tmp_path):
+        """Test a touched but unchanged file is served from the cache"""
+        cache_dir = tmp_path / '.cache'
+        RuleLoader(rules_dir, cache_dir=cache_dir).load_all()
+
+        yaml_path = rules_dir / '000-core' / '001-alpha.yaml'
+        st = yaml_path.stat()
+        os.utime(yaml_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        warm = RuleLoader(rules_dir, cache_dir=cache_dir)
+        with patch('rule_loader._load_yaml_text', side_effect=AssertionError('parsed')):
+            rule = warm.load_rule(rules_dir / '000-core' / '001-alpha.mdc')
+        assert rule.version == '1.0.0'
+
+    def test_persistent_cache_detects_changes(self, rules_dir, tmp_path):
+        """Test edited rules are re-parsed"""
+        cache_dir = tmp_path / '.cache'
+        RuleLoader(rules_dir, cache_dir=cache_dir).load_all()
+
+        yaml_path = rules_dir / '000-core' / '001-alpha.yaml'
+        yaml_path.write_text('version: 1.1.0\ncategory: 000-core\n')
+
+        warm = RuleLoader(rules_dir, cache_dir=cache_dir)
+        rule = warm.load_rule(rules_dir / '000-core' / '001-alpha.mdc')
+        assert rule.version == '1.1.0'
+
+    def test_search_by_tag_and_category(self, rules_dir):
+        """Test tag and category queries"""
+        loader = RuleLoader(rules_dir)
+
+        assert list(loader.search_by_tag('reasoning')) == ['101-beta']
+        assert list(loader.load_category('000-core')) == ['001-alpha']
+        assert loader.load_category('999-missing') == {}
+
+    def test_queries_share_single_scan(self, rules_dir):
+        """Test the tree is walked once across all query methods"""
+        loader = RuleLoader(rules_dir)
+        with patch.object(loader, '_scan', wraps=loader._scan) as scan:
+            loader.load_all()
+            loader.search_by_tag('foundational')
+            loader.load_category('100-cognitive')
+            loader.get_dependency_graph()
+        assert scan.call_count == 1
+
+        loader.refresh()
+        assert set(loader.load_all()) == {'001-alpha', '101-beta'}
+
+    def test_dependency_graph_list_form(self, rules_dir):
+        """Test plain-list dependencies are included in the graph"""
+        graph = RuleLoader(rules_dir).get_dependency_graph()
+
+        assert graph == {'001-alpha': {'101-beta'}, '101-beta': set()}
+
+    def test_rule_body_is_lazy(self, rules_dir):
+        """Test metadata queries never read rule bodies"""
+        loader = RuleLoader(rules_dir)
+        rules = loader.load_all()
+
+        assert not any(rule.content_loaded for rule in rules.values())
+        assert not hasattr(rules['001-alpha'], '__dict__')
+
+        assert rules['101-beta'].content == '# Beta\nBeta body'
+        assert rules['101-beta'].content_loaded
+        assert not rules['001-alpha'].content_loaded
+
+    def test_parallel_loading_matches_serial(self, rules_dir):
+        """Test process-pool loading returns identical rules"""
+        for i in range(10):
+            (rules_dir / '100-cognitive' / f'1{i:02d}-extra.mdc').write_text(
+                f'---\nversion: 1.0.{i}\ntags:\n- reasoning\n---\nBody {i}'
+            )
+
+        serial = RuleLoader(rules_dir).load_all()
+        parallel = RuleLoader(rules_dir, workers=2).load_all()
+
+        assert list(parallel) == list(serial)
+        for name, rule in serial.items():
+            assert parallel[name] == rule
+
+    def test_apply_changes_updates_indexes(self, rules_dir):
+        """Test edits are re-indexed in place without a rescan"""
+        loader = RuleLoader(rules_dir)
+        loader.load_all()
+        events = []
+        loader.subscribe(events.append)
+
+        beta = rules_dir / '100-cognitive' / '101-beta.mdc'
+        beta.write_text('---\nversion: 2.1.0\ntags:\n- safety\ndependencies:\n- 001-alpha\n---\nNew')
+        gamma = rules_dir / '100-cognitive' / '102-gamma.mdc'
+        gamma.write_text('# Gamma')
+        (rules_dir / '000-core' / '001-alpha.mdc').unlink()
+
+        with patch.object(loader, '_scan', side_effect=AssertionError('rescanned')):
+            loader.apply_changes([beta, gamma, rules_dir / '000-core' / '001-alpha.yaml'])
+
+            assert [(e.kind, e.name) for e in events] == [
+                ('deleted', '001-alpha'), ('modified', '101-beta'), ('created', '102-gamma')
+            ]
+            assert loader.search_by_tag('reasoning') == {}
+            assert list(loader.search_by_tag('safety')) == ['101-beta']
+            assert loader.load_category('000-core') == {}
+            assert loader.get_dependency_graph() == {'101-beta': {'001-alpha'}, '102-gamma': set()}
+            assert loader.load_all()['101-beta'].content == 'New'
+
+    def test_watch_reflects_edits(self, rules_dir):
+        """Test the polling watcher applies edits in the background"""
+        loader = RuleLoader(rules_dir)
+        changed = threading.Event()
+        loader.subscribe(lambda event: changed.set())
+        loader.watch(interval=0.01, use_watchdog=False)
+        try:
+            (rules_dir / '000-core' / '001-alpha.yaml').write_text('version: 3.0.0\n')
+            assert changed.wait(5)
+            assert loader.load_all()['001-alpha'].version == '3.0.0'
+        finally:
+            loader.close()
+
+    def test_bad_save_keeps_previous_rule(self, rules_dir):
+        """Test a rule that fails to parse keeps its last good version"""
+        loader = RuleLoader(rules_dir)
+        loader.load_all()
+        events = []
+        loader.subscribe(events.append)
+        alpha = rules_dir / '000-core' / '001-alpha.yaml'
+
+        for broken in ('version: [1.0', 'version'):
+            alpha.write_text(broken)
+            assert loader.apply_changes([alpha]) == []
+            assert loader.load_all()['001-alpha'].version == '1.0.0'
+            assert list(loader.search_by_tag('foundational')) == ['001-alpha']
+
+        alpha.write_text('version: 1.1.0\n')
+        loader.apply_changes([alpha])
+        assert [(e.kind, e.name) for e in events] == [('modified', '001-alpha')]
+        assert loader.load_all()['001-alpha'].version == '1.1.0'
+
+    def test_watch_survives_bad_save(self, rules_dir):
+        """Test the watcher keeps running after a save that fails to parse"""
+        loader = RuleLoader(rules_dir)
+        changed = threading.Event()
+        loader.subscribe(lambda event: changed.set())
+        loader.watch(interval=0.01, use_watchdog=False)
+        try:
+            alpha = rules_dir / '000-core' / '001-alpha.yaml'
+            alpha.write_text('version: [1.0')
+            time.sleep(0.1)
+            alpha.write_text('version: 3.0.0\n')
+            assert changed.wait(5)
+            assert loader.load_all()['001-alpha'].version == '3.0.0'
+        finally:
+            loader.close()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,77 @@
+import itertools
+import pytest
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from rule_packing import PackItem, pack
+
+
+def _brute_force(items, budget):
+    best = 0.0
+    for size in range(len(items) + 1):
+        for subset in itertools.combinations(items, size):
+            if sum(item.tokens for item in subset) <= budget:
+                best = max(best, sum(item.value for item in subset))
+    return best
+
+
+class TestRulePacking:
+
+    def test_everything_fits(self):
+        items = [PackItem('a', 10, 1.0), PackItem('b', 20, 2.0)]
+        result = pack(items, 100)
+        assert result.method == 'all'
+        assert result.selected == ('a', 'b')
+        assert result.tokens == 30
+
+    def test_dp_matches_brute_force(self):
+        """Test independent rules are packed optimally"""
+        rng = random.Random(5)
+        for _ in range(50):
+            items = [PackItem(f"r{i}", rng.randint(0, 60), round(rng.random() * 100, 2))
+                     for i in range(rng.randint(1, 9))]
+            budget = rng.randint(0, 150)
+            result = pack(items, budget)
+            assert result.tokens <= budget
+            assert result.value == pytest.approx(_brute_force(items, budget))
+
+    def test_value_beats_density(self):
+        """Test one valuable large rule wins over several cheap ones"""
+        items = [PackItem('big', 90, 100.0)] + [PackItem(f"small-{i}", 10, 10.0) for i in range(5)]
+        assert pack(items, 100).selected == ('big', 'small-0')
+
+    def test_requirements_packed_together(self):
+        items = [PackItem('base', 50, 0.0), PackItem('feature', 30, 10.0, ('base',)),
+                 PackItem('other', 60, 8.0), PackItem('orphan', 5, 50.0, ('missing',))]
+        result = pack(items, 100)
+        assert result.selected == ('base', 'feature')
+        assert 'orphan' not in result.selected  # Unknown requirement makes it infeasible
+
+    def test_requirements_only_packed_with_dependant(self):
+        """Test a requirement without value of its own is dropped along with its dependant"""
+        items = [PackItem('big', 900, 100.0, ('dep',)), PackItem('small', 50, 50.0), PackItem('dep', 200, 0.0)]
+        result = pack(items, 1000)
+        assert result.selected == ('small',)
+        assert result.tokens == 50
+
+    def test_greedy_for_large_problems(self):
+        """Test past the DP limit packing stays closed under requirements and within budget"""
+        rng = random.Random(9)
+        items = [PackItem(f"r{i}", rng.randint(50, 3000), rng.choice([0.0, rng.random() * 100]),
+                          (f"r{rng.randrange(i)}",) if i and rng.random() < 0.2 else ())
+                 for i in range(300)]
+        result = pack(items, 7500, dp_cell_limit=1000)
+        assert result.method == 'greedy'
+        assert result.tokens <= 7500
+        selected = set(result.selected)
+        by_key = {item.key: item for item in items}
+        assert all(set(by_key[key].requires) <= selected for key in selected)
+        required = {dep for key in selected for dep in by_key[key].requires}
+        assert all(by_key[key].value > 0 or key in required for key in selected)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,162 @@
+import pytest
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+import rulesync_enhanced
+from rulesync_enhanced import RuleSyncEnhanced
+
+RULES = {
+    '000-core/001-base.mdc': ('Base rule. ' * 40, []),
+    '100-lang/101-python.mdc': ('Python rule. ' * 20, ['001-base']),
+    '100-lang/102-docs.mdc': ('Docs rule. ' * 20, []),
+    '100-lang/103-huge.mdc': ('Huge rule. ' * 400, []),
+}
+
+
+def _profile(name, budget):
+    platforms = {platform: {'include_categories': ['core_rules', 'project_rules'], 'exclude_rules': [],
+                            'token_budget': budget}
+                 for platform in ('gemini', 'codex', 'claude', 'cursor', 'zed')}
+    return {'name': name, 'version': '1.0.0', 'description': name,
+            'core_rules': ['000-core/001-base.mdc'],
+            'project_rules': {'lang': ['100-lang/101-python.mdc', '100-lang/102-docs.mdc', '100-lang/103-huge.mdc']},
+            'platform_optimizations': platforms}
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))  # Keep global platform configs out of reach
+    for rule, (body, dependencies) in RULES.items():
+        path = tmp_path / 'rules' / rule
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"---\n{yaml.safe_dump({'dependencies': dependencies})}---\n{body}\n")
+    (tmp_path / 'profiles').mkdir()
+    for name in ('small', 'large'):
+        profile = _profile(name, 300 if name == 'small' else 10000)
+        (tmp_path / 'profiles' / f"{name}.yaml").write_text(yaml.safe_dump(profile))
+    return tmp_path
+
+
+class TestRuleSyncEnhanced:
+
+    def test_selection_respects_budget_and_dependencies(self, project):
+        sync = RuleSyncEnhanced(project_root=str(project))
+        selected = sync._select_rules_for_platform(sync._load_profile('small'), 'claude')
+        assert '100-lang/103-huge.mdc' not in selected
+        assert '100-lang/101-python.mdc' in selected and '000-core/001-base.mdc' in selected
+
+    def test_profiles_share_rule_loading(self, project, monkeypatch):
+        """Test every rule is tokenized once however many platforms and profiles are generated"""
+        sync = RuleSyncEnhanced(project_root=str(project))
+        counted = []
+        count = sync.token_counter.count
+        monkeypatch.setattr(sync.token_counter, 'count', lambda text: counted.append(text) or count(text))
+
+        sync.generate(profile='small')
+        sync.generate(profile='large')
+
+        assert len(counted) == len(RULES)
+        assert len(sync.selection_cache) == 2  # One packing per distinct budget, not per platform
+        for name in ('GEMINI.md', 'codex.md', 'CLAUDE.md', '.rules', '.cursor/rules/000-core-rulesync-enhanced.mdc'):
+            assert 'large - ' in (project / name).read_text()
+        assert '## 100-lang/103-huge.mdc' in (project / 'CLAUDE.md').read_text()
+
+    def test_unchanged_inputs_skip_generation(self, project, capsys):
+        """Test a rerun writes nothing and a rule edit rebuilds only what it feeds"""
+        RuleSyncEnhanced(project_root=str(project)).generate(profile='large')
+        claude = project / 'CLAUDE.md'
+        first = claude.read_text()
+        mtime = claude.stat().st_mtime_ns
+        capsys.readouterr()
+
+        RuleSyncEnhanced(project_root=str(project)).generate(profile='large')
+        assert capsys.readouterr().out.count('up to date') == 5
+        assert claude.stat().st_mtime_ns == mtime
+
+        RuleSyncEnhanced(project_root=str(project)).generate(profile='large', force=True)
+        assert 'Unchanged' in capsys.readouterr().out
+        assert claude.read_text() == first  # Timestamp kept, so forcing does not churn
+
+        rule = project / 'rules' / '100-lang/102-docs.mdc'
+        rule.write_text(rule.read_text().replace('Docs rule.', 'Docs rules.'))
+        RuleSyncEnhanced(project_root=str(project)).generate(platforms=['claude'], profile='large')
+        assert 'Docs rules.' in claude.read_text()
+
+    def test_generator_code_change_rebuilds(self, project, capsys, monkeypatch):
+        """Test editing packing or rendering code invalidates the manifest"""
+        RuleSyncEnhanced(project_root=str(project)).generate(platforms=['claude'], profile='large')
+        capsys.readouterr()
+        edited = project / 'rule_packing.py'
+        edited.write_text(Path(sys.modules['rule_packing'].__file__).read_text() + '\n# edited\n')
+        monkeypatch.setattr(sys.modules['rule_packing'], '__file__', str(edited))
+
+        RuleSyncEnhanced(project_root=str(project)).generate(platforms=['claude'], profile='large')
+        assert 'up to date' not in capsys.readouterr().out
+
+    def test_edited_output_is_rebuilt(self, project):
+        RuleSyncEnhanced(project_root=str(project)).generate(platforms=['codex'], profile='large')
+        codex = project / 'codex.md'
+        expected = codex.read_text()
+        codex.write_text('edited by hand')
+        RuleSyncEnhanced(project_root=str(project)).generate(platforms=['codex'], profile='large')
+        assert codex.read_text() == expected
+
+    @pytest.mark.parametrize('jobs', [1, 2])
+    def test_all_profiles_compile_into_separate_trees(self, project, jobs, capsys):
+        (project / 'profiles' / 'broken.yaml').write_text('name: [unclosed')
+        sync = RuleSyncEnhanced(project_root=str(project))
+        results = sync.generate_all_profiles(output_root=project / 'out', jobs=jobs)
+        out = capsys.readouterr().out
+        assert out.index('=== large ===') < out.index('=== small ===')  # Logs follow profile order
+
+        assert results == {'broken': None, 'large': project / 'out' / 'large', 'small': project / 'out' / 'small'}
+        assert '## 100-lang/103-huge.mdc' in (project / 'out' / 'large' / 'CLAUDE.md').read_text()
+        assert '## 100-lang/103-huge.mdc' not in (project / 'out' / 'small' / 'CLAUDE.md').read_text()
+        assert not (project / 'CLAUDE.md').exists()
+
+    @pytest.mark.parametrize('option', [['--output-root', 'out'], ['--jobs', '2']])
+    def test_profile_tree_options_require_all_profiles(self, project, monkeypatch, option):
+        monkeypatch.setattr(sys, 'argv', ['rulesync_enhanced', '--project-root', str(project),
+                                          'generate', '--profile', 'large', *option])
+        with pytest.raises(SystemExit) as exc:
+            rulesync_enhanced.main()
+        assert exc.value.code == 2
+        assert not (project / 'CLAUDE.md').exists()
+
+    def test_apply_changes_reloads_only_changed_rules(self, project):
+        sync = RuleSyncEnhanced(project_root=str(project))
+        sync.generate(profile='large')
+        docs = project / 'rules' / '100-lang' / '102-docs.mdc'
+        docs.write_text(docs.read_text().replace('Docs rule.', 'Docs rules.'))
+
+        rules, profiles = sync.apply_changes([docs, project / 'profiles' / 'small.yaml'])
+        assert rules == {'100-lang/102-docs.mdc'} and profiles == {'small'}
+        assert '100-lang/101-python.mdc' in sync.item_cache
+        assert '100-lang/102-docs.mdc' not in sync.item_cache
+
+        (project / 'rules' / '100-lang' / '104-new.mdc').write_text('New rule.')
+        sync.apply_changes([project / 'rules' / '100-lang' / '104-new.mdc'])
+        assert sync.item_cache == {}  # A new rule can change what dependencies resolve to
+
+    def test_watch_regenerates_on_save(self, project):
+        sync = RuleSyncEnhanced(project_root=str(project))
+        sync.watch('large', ['claude'], interval=0.01, debounce=0.02, use_watchdog=False)
+        try:
+            docs = project / 'rules' / '100-lang' / '102-docs.mdc'
+            docs.write_text(docs.read_text().replace('Docs rule.', 'Docs rules.'))
+            deadline = time.time() + 5
+            while 'Docs rules.' not in (project / 'CLAUDE.md').read_text() and time.time() < deadline:
+                time.sleep(0.01)
+            assert 'Docs rules.' in (project / 'CLAUDE.md').read_text()
+        finally:
+            sync.unwatch()
+        assert not (project / 'codex.md').exists()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,56 @@
+import pytest
+import sys
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from startup_profile import parse_importtime, profile_command, format_report
+
+
+class TestStartupProfile:
+
+    def test_parse_importtime(self):
+        """Test nesting depth and timings are read from -X importtime output"""
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   _io\n"
+            "import time:       300 |        420 | yaml\n"
+            "warning: unrelated output\n"
+            "import time:        50 |         50 |     yaml.reader\n"
+        )
+        timings = parse_importtime(stderr)
+
+        assert [(t.module, t.depth) for t in timings] == [('_io', 1), ('yaml', 0), ('yaml.reader', 2)]
+        assert timings[1].self_us == 300
+        assert timings[1].cumulative_us == 420
+
+    def test_profile_command(self, tmp_path):
+        """Test a script is profiled in a fresh interpreter"""
+        script = tmp_path / 'tool.py'
+        script.write_text('import json\nimport sys\nsys.exit(len(sys.argv) - 1)\n')
+
+        profile = profile_command(script, ['--all'])
+
+        assert profile.returncode == 1
+        assert 'json' in {t.module for t in profile.imports}
+        assert profile.import_time_ms > 0
+        assert 'json' in format_report(profile)
+
+    def test_heavy_modules_not_imported_eagerly(self):
+        """Test the CLIs import without psutil, matplotlib or a process pool"""
+        script = (
+            "import sys; sys.path[:0] = ['validation', 'scripts']\n"
+            "import rule_validator, rule_loader\n"
+            "assert 'networkx' not in sys.modules, 'networkx'\n"
+            "assert 'concurrent.futures' not in sys.modules, 'concurrent.futures'\n"
+            "import generate_docs, benchmark_rules\n"
+            "assert 'psutil' not in sys.modules, 'psutil'\n"
+            "assert 'matplotlib' not in sys.modules, 'matplotlib'\n"
+        )
+        subprocess.run([sys.executable, '-c', script], check=True,
+                       cwd=Path(__file__).parent.parent)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
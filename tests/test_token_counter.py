@@ -0,0 +1,80 @@
+import pytest
+import sys
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+import token_counter
+from token_counter import TokenCounter, FALLBACK_ENCODING, get_token_counter
+
+
+class TestTokenCounter:
+
+    @pytest.fixture
+    def fake_encoder(self):
+        """Encoder that yields one token per whitespace-separated word"""
+        encoder = MagicMock()
+        encoder.name = 'fake_base'
+        encoder.encode_batch.side_effect = lambda texts: [text.split() for text in texts]
+        return encoder
+
+    @pytest.fixture
+    def counter(self, fake_encoder):
+        counter = TokenCounter()
+        counter._encoder = fake_encoder
+        counter._encoder_loaded = True
+        return counter
+
+    def test_fallback_without_tokenizer(self):
+        """Test character-based fallback when tiktoken cannot load"""
+        counter = TokenCounter()
+        with patch.dict(sys.modules, {'tiktoken': None}):
+            assert counter.count('x' * 40) == 10
+            assert counter.encoding_name == FALLBACK_ENCODING
+
+    def test_batch_encodes_unique_misses_once(self, counter, fake_encoder):
+        """Test repeated and cached texts are never re-encoded"""
+        assert counter.count_many(['a b', 'c d e', 'a b']) == [2, 3, 2]
+        fake_encoder.encode_batch.assert_called_once_with(['a b', 'c d e'])
+
+        assert counter.count('c d e') == 3
+        assert fake_encoder.encode_batch.call_count == 1
+
+    def test_disk_cache_round_trip(self, counter, fake_encoder, tmp_path):
+        """Test counts persist and are reused without encoding"""
+        cache_path = tmp_path / '.cache' / 'token_counts.json'
+        counter.attach_cache(cache_path)
+        counter.count_many(['one two', 'three'])
+        counter.save()
+
+        data = json.loads(cache_path.read_text())
+        assert sorted(data['encodings']['fake_base'].values()) == [1, 2]
+
+        warm = TokenCounter(cache_path=cache_path)
+        warm._expected_encoding = 'fake_base'
+        with patch.object(warm, '_get_encoder', side_effect=AssertionError('encoded')):
+            assert warm.count_many(['one two', 'three']) == [2, 1]
+
+    def test_failed_encoder_switches_namespace(self, tmp_path):
+        """Test fallback counts are not stored under the real encoding name"""
+        counter = TokenCounter()
+        counter._expected_encoding = 'cl100k_base'
+        with patch.dict(sys.modules, {'tiktoken': None}):
+            assert counter.count('x' * 8) == 2
+        assert 'cl100k_base' not in counter._counts or not counter._counts['cl100k_base']
+        assert counter._counts[FALLBACK_ENCODING]
+
+    def test_shared_counter(self, tmp_path, monkeypatch):
+        """Test the process-wide counter is reused and can gain a cache later"""
+        monkeypatch.setattr(token_counter, '_shared_counter', None)
+        first = get_token_counter()
+        second = get_token_counter(tmp_path / 'counts.json')
+
+        assert first is second
+        assert first.cache_path == tmp_path / 'counts.json'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
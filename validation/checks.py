@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Rule Check Registry
+Declarative per-rule checks compiled once per configuration and shared by both validators
+"""
+
+import re
+from contextlib import nullcontext
+from itertools import groupby
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from content_scanner import RuleFeatures, get_content_scanner
+
+# Pseudo-fields a check can depend on besides metadata keys
+CONTENT = '@content'
+NAME = '@name'
+# Existence of the files named in ``dependencies``, which can change without the rule changing
+DEPENDENCY_TARGETS = '@dependency_targets'
+
+VERSION_PATTERN = r'^\d+\.\d+\.\d+$'
+NAMING_PATTERN = r'^[0-9]{3}-[a-z0-9\-]+$'
+
+
+class RuleInput(NamedTuple):
+    """What a check may look at for one rule
+
+    ``features`` is the content scan, when the caller already has one.
+    """
+    name: str
+    category: str
+    metadata: Any
+    content: str
+    features: Optional[RuleFeatures] = None
+
+
+class Findings:
+    """Errors, warnings and metrics produced by one check for one rule"""
+
+    __slots__ = ('errors', 'warnings', 'metrics')
+
+    def __init__(self, errors: Optional[List[str]] = None, warnings: Optional[List[str]] = None,
+                 metrics: Optional[Dict[str, Any]] = None):
+        self.errors = errors if errors is not None else []
+        self.warnings = warnings if warnings is not None else []
+        self.metrics = metrics if metrics is not None else {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'errors': self.errors, 'warnings': self.warnings, 'metrics': self.metrics}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Findings':
+        return cls(list(data['errors']), list(data['warnings']), dict(data['metrics']))
+
+
+class Check(NamedTuple):
+    """A registered check
+
+    ``needs`` lists the metadata fields and pseudo-fields the check reads;
+    it may also be a callable taking the config, for checks whose inputs are
+    configured. ``phase`` names the instrumentation phase it is timed under.
+    """
+    name: str
+    needs: Any
+    phase: str
+    func: Callable[['CheckEngine', RuleInput, Findings], None]
+
+
+class CheckRegistry:
+    """Ordered collection of checks; registration order is report order"""
+
+    def __init__(self):
+        self._checks: Dict[str, Check] = {}
+
+    def register(self, name: str, needs: Any, phase: str):
+        def decorator(func):
+            if name in self._checks:
+                raise ValueError(f"Check already registered: {name}")
+            self._checks[name] = Check(name, needs, phase, func)
+            return func
+        return decorator
+
+    def __getitem__(self, name: str) -> Check:
+        return self._checks[name]
+
+    def __iter__(self):
+        return iter(self._checks.values())
+
+    def names(self) -> List[str]:
+        return list(self._checks)
+
+    def compile(self, config: Dict, checks: Optional[Iterable[str]] = None, **options) -> 'CheckEngine':
+        """Bind the named checks (all by default) to a configuration"""
+        selected = [self._checks[name] for name in checks] if checks is not None else list(self)
+        return CheckEngine(config, selected, **options)
+
+
+REGISTRY = CheckRegistry()
+
+
+class CheckEngine:
+    """Checks bound to one configuration
+
+    Patterns and tag sets are compiled here once instead of per rule, and
+    each check's inputs are resolved up front so ``run`` can skip checks
+    whose inputs did not change.
+    """
+
+    def __init__(self, config: Dict, checks: List[Check], rules_dir: Optional[Path] = None,
+                 count_tokens: Optional[Callable[[str], int]] = None):
+        self.config = config
+        self.checks = checks
+        self.rules_dir = Path(rules_dir) if rules_dir is not None else None
+        self.count_tokens = count_tokens or (lambda text: len(text) // 4)
+
+        self.required_fields: Tuple[str, ...] = tuple(config.get('required_metadata', ()))
+        self.approved_tags: FrozenSet[str] = frozenset(config.get('approved_tags', ()))
+        self.version_re = re.compile(VERSION_PATTERN)
+        self.naming_re = re.compile(NAMING_PATTERN)
+
+        self.needs: Dict[str, FrozenSet[str]] = {
+            check.name: frozenset(check.needs(config) if callable(check.needs) else check.needs)
+            for check in checks
+        }
+
+    def select(self, changed: Optional[Set[str]] = None, only: Optional[Iterable[str]] = None) -> List[Check]:
+        """Checks reading any of ``changed`` (every check when None), limited to ``only``"""
+        only = set(only) if only is not None else None
+        return [check for check in self.checks
+                if (only is None or check.name in only)
+                and (changed is None or self.needs[check.name] & changed)]
+
+    def run(self, rule: RuleInput, changed: Optional[Set[str]] = None,
+            previous: Optional[Dict[str, Findings]] = None, only: Optional[Iterable[str]] = None,
+            timer: Optional[Callable[[str], Any]] = None,
+            findings: Optional[Dict[str, Findings]] = None) -> Dict[str, Findings]:
+        """Run the checks affected by ``changed``, reusing ``previous`` findings for the rest
+
+        Findings come back keyed by check name in engine order; pass a
+        ``findings`` dict to keep what earlier checks found if a later one
+        raises. A check without previous findings always runs. ``timer`` is
+        entered once per phase, e.g. ``Instrumentation.phase``.
+        """
+        previous = previous or {}
+        findings = findings if findings is not None else {}
+        only = set(only) if only is not None else None
+        selected = {check.name for check in self.select(changed, only)}
+        checks = [check for check in self.checks if only is None or check.name in only]
+        for phase, group in groupby(checks, key=attrgetter('phase')):
+            pending = []
+            for check in group:
+                if check.name in selected or check.name not in previous:
+                    findings[check.name] = Findings()
+                    pending.append(check)
+                else:
+                    findings[check.name] = previous[check.name]
+            if pending:
+                with timer(phase) if timer is not None else nullcontext():
+                    for check in pending:
+                        check.func(self, rule, findings[check.name])
+        return findings
+
+    @staticmethod
+    def apply(findings: Dict[str, Findings], result) -> None:
+        """Fold findings into a ValidationResult-like object, in check order"""
+        for found in findings.values():
+            if found.errors:
+                result.passed = False
+                result.errors.extend(found.errors)
+            result.warnings.extend(found.warnings)
+            result.metrics.update(found.metrics)
+
+
+def changed_fields(old_metadata: Any, new_metadata: Any) -> Optional[Set[str]]:
+    """Metadata keys whose values differ, or None when either side is not a mapping"""
+    if not isinstance(old_metadata, dict) or not isinstance(new_metadata, dict):
+        return None
+    return {key for key in old_metadata.keys() | new_metadata.keys()
+            if old_metadata.get(key) != new_metadata.get(key)}
+
+
+# Metadata checks, as run by EnhancedRuleValidator
+
+@REGISTRY.register('required_metadata', needs=lambda config: config.get('required_metadata', ()),
+                   phase='metadata_checks')
+def check_required_metadata(engine: CheckEngine, rule: RuleInput, findings: Findings) -> None:
+    for field in engine.required_fields:
+        if field not in rule.metadata:
+            findings.errors.append(f"Missing required metadata field: {field}")
+
+
+@REGISTRY.register('version_format', needs=('version',), phase='metadata_checks')
+def check_version_format(engine: CheckEngine, rule: RuleInput, findings: Findings) -> None:
+    if 'version' in rule.metadata:
+        version = rule.metadata['version']
+        if not engine.version_re.match(str(version)):
+            findings.errors.append(f"Invalid version format: {version}")
+
+
+@REGISTRY.register('approved_tags', needs=('tags',), phase='metadata_checks')
+def check_approved_tags(engine: CheckEngine, rule: RuleInput, findings: Findings) -> None:
+    if 'tags' in rule.metadata:
+        invalid_tags = set(rule.metadata['tags']) - engine.approved_tags
+        if invalid_tags:
+            findings.warnings.append(f"Unknown tags: {invalid_tags}")
+
+
+@REGISTRY.register('content_size', needs=(CONTENT,), phase='content_checks')
+def check_content_size(engine: CheckEngine, rule: RuleInput, findings: Findings) -> None:
+    line_count = len(rule.content.splitlines())
+    if line_count > engine.config['max_lines']:
+        findings.errors.append(f"Rule exceeds maximum lines: {line_count} > {engine.config['max_lines']}")
+    elif line_count > engine.config['warn_lines']:
+        findings.warnings.append(f"Rule approaching size limit: {line_count} lines")
+    findings.metrics['line_count'] = line_count
+
+
+@REGISTRY.register('token_budget', needs=(CONTENT,), phase='content_checks')
+def check_token_budget(engine: CheckEngine, rule: RuleInput, findings: Findings) -> None:
+    tokens = engine.count_tokens(rule.content)
+    if tokens > engine.config['max_tokens']:
+        findings.warnings.append(f"High token count: ~{tokens} tokens")
+    findings.metrics['estimated_tokens'] = tokens
+
+
+@REGISTRY.register('dependencies_exist', needs=('dependencies', DEPENDENCY_TARGETS),
+                   phase='dependency_checks')
+def check_dependencies_exist(engine: CheckEngine, rule: RuleInput, findings: Findings) -> None:
+    if 'dependencies' not in rule.metadata:
+        return
+    for dep in rule.metadata['dependencies']:
+        if not (engine.rules_dir / dep).exists():
+            findings.errors.append(f"Dependency not found: {dep}")
+
+
+@REGISTRY.register('conflict_resolution', needs=('conflicts',), phase='dependency_checks')
+def check_conflict_resolution(engine: CheckEngine, rule: RuleInput, findings: Findings) -> None:
+    if 'conflicts' not in rule.metadata:
+        return
+    for conflict in rule.metadata['conflicts']:
+        if isinstance(conflict, dict) and 'resolution' not in conflict:
+            findings.warnings.append(f"Conflict without resolution strategy: {conflict.get('rule', conflict)}")
+
+
+# Structural checks, as run by rules/validate_rules.py
+
+@REGISTRY.register('naming_convention', needs=(NAME,), phase='structure_checks')
+def check_naming_convention(engine: CheckEngine, rule: RuleInput, findings: Findings) -> None:
+    if not engine.naming_re.match(rule.name):
+        findings.warnings.append(f"Non-standard naming: {rule.name} (expected: NNN-kebab-case)")
+    if rule.category != 'root' and not rule.name.startswith(rule.category[:3]):
+        findings.warnings.append(f"Category mismatch: {rule.name} in {rule.category}")
+
+
+@REGISTRY.register('phase_markers', needs=(CONTENT,), phase='structure_checks')
+def check_phase_markers(engine: CheckEngine, rule: RuleInput, findings: Findings) -> None:
+    features = rule.features if rule.features is not None else get_content_scanner().features(rule.content)
+    findings.metrics['divergence'] = 'divergence' in features.labels
+    findings.metrics['convergence'] = 'convergence' in features.labels
+
+
+METADATA_CHECKS = (
+    'required_metadata', 'version_format', 'approved_tags', 'content_size',
+    'token_budget', 'dependencies_exist', 'conflict_resolution',
+)
+STRUCTURE_CHECKS = ('naming_convention', 'phase_markers')
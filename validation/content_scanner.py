@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Rule Content Scanner
+Matching of rule references, phase markers and keywords with compiled regexes and substring checks
+"""
+
+import re
+from typing import FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+RULE_REFERENCE = '@Rule:'
+REFERENCE_NAME_RE = re.compile(r'[a-zA-Z0-9\-_.]+')
+REFERENCE_RE = re.compile(re.escape(RULE_REFERENCE) + f"({REFERENCE_NAME_RE.pattern})")
+
+# (literal, feature label, case sensitive)
+CONTENT_PATTERNS: Tuple[Tuple[str, str, bool], ...] = (
+    (RULE_REFERENCE, 'reference', True),
+    ('divergence-convergence', 'divergence-convergence', True),
+    ('internal_thought', 'internal_thought', True),
+    ('user_facing_response', 'user_facing_response', True),
+    ('divergence phase', 'divergence', False),
+    ('divergent', 'divergence', False),
+    ('convergence phase', 'convergence', False),
+    ('convergent', 'convergence', False),
+)
+
+
+class Pattern(NamedTuple):
+    literal: str
+    label: str
+    case_sensitive: bool
+
+
+class PatternScanner:
+    """Find many literal patterns with C-level scans rather than a Python loop per character
+
+    ``labels`` only needs to know which patterns occur, so it is one
+    substring test per pattern, against the lowercased text for
+    case-insensitive ones. ``matches`` reports positions: one compiled
+    alternation of every lowercased literal finds each candidate start,
+    and only those few positions are checked against the patterns.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, str, bool]]):
+        self.patterns = [Pattern(*pattern) for pattern in patterns]
+        for pattern in self.patterns:
+            if not pattern.literal:
+                raise ValueError(f"Empty pattern for {pattern.label}")
+        self._lowered = [pattern.literal.lower() for pattern in self.patterns]
+        self._sensitive = [(pattern.literal, pattern.label) for pattern in self.patterns if pattern.case_sensitive]
+        self._insensitive = [(lowered, pattern.label) for lowered, pattern in zip(self._lowered, self.patterns)
+                             if not pattern.case_sensitive]
+        # Longest first, so a literal is not shadowed by one of its prefixes
+        alternation = '|'.join(re.escape(literal) for literal in sorted(set(self._lowered), key=len, reverse=True))
+        self._lowered_re = re.compile(alternation)
+        self._ignorecase_re = re.compile(alternation, re.IGNORECASE)
+
+    def matches(self, text: str) -> List[Tuple[int, Pattern]]:
+        """``(start, pattern)`` for every occurrence, overlapping ones included, by end position"""
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            search, haystack = self._lowered_re.search, lowered
+        else:
+            # Lowercasing changed offsets (e.g. U+0130); match case-insensitively in place
+            search, haystack = self._ignorecase_re.search, text
+        found: List[Tuple[int, int, int]] = []
+        match = search(haystack)
+        while match is not None:
+            start = match.start()
+            for index, literal in enumerate(self._lowered):
+                end = start + len(literal)
+                if text[start:end].lower() != literal:
+                    continue
+                if self.patterns[index].case_sensitive and not text.startswith(self.patterns[index].literal, start):
+                    continue
+                found.append((end, start, index))
+            match = search(haystack, start + 1)
+        found.sort()
+        return [(start, self.patterns[index]) for _, start, index in found]
+
+    def labels(self, text: str) -> FrozenSet[str]:
+        labels = {label for literal, label in self._sensitive if literal in text}
+        if self._insensitive:
+            lowered = text.lower()
+            labels.update(label for literal, label in self._insensitive if literal in lowered)
+        return frozenset(labels)
+
+
+class RuleFeatures(NamedTuple):
+    """What one scan of a rule body found"""
+    references: Tuple[str, ...]
+    labels: FrozenSet[str]
+
+
+class ContentScanner(PatternScanner):
+    """Scanner for ``CONTENT_PATTERNS`` that also reads ``@Rule:`` reference names"""
+
+    def __init__(self, patterns: Iterable[Tuple[str, str, bool]] = CONTENT_PATTERNS):
+        super().__init__(patterns)
+
+    def features(self, text: str) -> RuleFeatures:
+        labels = set(self.labels(text))
+        references: Tuple[str, ...] = ()
+        if 'reference' in labels:
+            references = tuple(REFERENCE_RE.findall(text))
+            if not references:
+                labels.discard('reference')  # Only bare markers without a name
+        return RuleFeatures(references, frozenset(labels))
+
+
+_shared_scanner: Optional[ContentScanner] = None
+
+
+def get_content_scanner() -> ContentScanner:
+    """Return the process-wide scanner for rule content"""
+    global _shared_scanner
+    if _shared_scanner is None:
+        _shared_scanner = ContentScanner()
+    return _shared_scanner
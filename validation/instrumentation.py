@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Validation Instrumentation
+Per-phase timing histograms, tracemalloc allocation attribution and cProfile export
+"""
+
+import os
+import json
+import time
+import bisect
+import pstats
+import tracemalloc
+from pathlib import Path
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+# Phases of validating one rule, in pipeline order
+PHASES = (
+    'read', 'yaml_decode', 'metadata_checks', 'content_checks',
+    'dependency_checks', 'baseline_checks', 'fix_suggestions',
+)
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended
+BUCKET_BOUNDS_MS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+
+# Call paths below this share of total profiled time are pruned from collapsed output
+MIN_STACK_SHARE = 1e-5
+MAX_STACK_DEPTH = 128
+
+
+class PhaseHistogram:
+    """Log-scale latency histogram for one phase"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float('inf')
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def record(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+
+    def merge(self, other: 'PhaseHistogram') -> None:
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.min_ms = min(self.min_ms, other.min_ms)
+        self.max_ms = max(self.max_ms, other.max_ms)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile, capped at the max"""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                bound = BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound}ms" for bound in BUCKET_BOUNDS_MS] + [f">{BUCKET_BOUNDS_MS[-1]}ms"]
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.total_ms / self.count, 4) if self.count else 0.0,
+            'min_ms': round(self.min_ms, 4) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 4),
+            'p50_ms': round(self.percentile(50), 4),
+            'p95_ms': round(self.percentile(95), 4),
+            'buckets': {label: n for label, n in zip(labels, self.buckets) if n}
+        }
+
+
+class PhaseScope:
+    """Times one phase; ``elapsed_ms`` and ``peak_bytes`` are set on exit"""
+
+    __slots__ = ('instrumentation', 'name', 'start', 'before', 'elapsed_ms', 'peak_bytes')
+
+    def __init__(self, instrumentation: 'Instrumentation', name: str):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.elapsed_ms = 0.0
+        self.peak_bytes = 0
+
+    def __enter__(self) -> 'PhaseScope':
+        if self.instrumentation.trace_allocations:
+            self.before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.elapsed_ms = (time.perf_counter() - self.start) * 1000
+        allocated = 0
+        if self.instrumentation.trace_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            allocated = current - self.before
+            self.peak_bytes = max(0, peak - self.before)
+        self.instrumentation.record(self.name, self.elapsed_ms, allocated, self.peak_bytes)
+
+
+class Instrumentation:
+    """Aggregate phase timings and, optionally, allocations across rules
+
+    Per-phase allocation attribution uses tracemalloc, which slows
+    validation noticeably, so it is only enabled on request.
+    """
+
+    def __init__(self, trace_allocations: bool = False, top_sites: int = 15):
+        self.trace_allocations = trace_allocations
+        self.top_sites = top_sites
+        self.phases: Dict[str, PhaseHistogram] = {}
+        self.allocations: Dict[str, Dict[str, int]] = {}
+        self.sites: Dict[str, List[int]] = {}
+        self._started_tracing = False
+
+    def phase(self, name: str) -> PhaseScope:
+        return PhaseScope(self, name)
+
+    def record(self, name: str, ms: float, allocated: int = 0, peak: int = 0) -> None:
+        histogram = self.phases.get(name)
+        if histogram is None:
+            histogram = self.phases[name] = PhaseHistogram()
+        histogram.record(ms)
+        if self.trace_allocations:
+            stats = self.allocations.setdefault(name, {'net_bytes': 0, 'peak_bytes': 0})
+            stats['net_bytes'] += allocated
+            stats['peak_bytes'] = max(stats['peak_bytes'], peak)
+
+    def start(self) -> None:
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        """Record live allocations by source line, then stop tracing if we started it"""
+        if not self.trace_allocations or not tracemalloc.is_tracing():
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        ))
+        for stat in snapshot.statistics('lineno')[:self.top_sites]:
+            frame = stat.traceback[0]
+            site = self.sites.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+            site[0] += stat.size
+            site[1] += stat.count
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def merge(self, other: 'Instrumentation') -> None:
+        """Fold in measurements taken elsewhere, e.g. in a worker process"""
+        for name, histogram in other.phases.items():
+            self.phases.setdefault(name, PhaseHistogram()).merge(histogram)
+        for name, stats in other.allocations.items():
+            mine = self.allocations.setdefault(name, {'net_bytes': 0, 'peak_bytes': 0})
+            mine['net_bytes'] += stats['net_bytes']
+            mine['peak_bytes'] = max(mine['peak_bytes'], stats['peak_bytes'])
+        for key, (size, count) in other.sites.items():
+            site = self.sites.setdefault(key, [0, 0])
+            site[0] += size
+            site[1] += count
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = [name for name in PHASES if name in self.phases]
+        ordered += sorted(name for name in self.phases if name not in PHASES)
+        report: Dict[str, Any] = {'phases': {name: self.phases[name].to_dict() for name in ordered}}
+        total = sum(h.total_ms for h in self.phases.values())
+        if total:
+            report['dominant_phase'] = max(ordered, key=lambda name: self.phases[name].total_ms)
+        if self.trace_allocations:
+            report['allocations'] = {name: self.allocations[name] for name in ordered if name in self.allocations}
+            top = sorted(self.sites.items(), key=lambda item: item[1][0], reverse=True)[:self.top_sites]
+            report['live_allocation_sites'] = [
+                {'site': key, 'size_bytes': size, 'count': count} for key, (size, count) in top
+            ]
+        return report
+
+
+class _RawStats:
+    """Adapter letting pstats.Stats load stats dicts collected in other processes"""
+
+    def __init__(self, stats: Dict):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+def combine_profiles(profiler=None, raw_stats: Optional[List[Dict]] = None) -> Optional[pstats.Stats]:
+    """Merge a local cProfile.Profile with ``profiler.stats`` dicts from workers"""
+    sources = []
+    if profiler is not None:
+        profiler.create_stats()
+        if profiler.stats:
+            sources.append(profiler)
+    sources.extend(_RawStats(stats) for stats in raw_stats or [] if stats)
+    if not sources:
+        return None
+    combined = pstats.Stats(sources[0])
+    for source in sources[1:]:
+        combined.add(source)
+    return combined
+
+
+# pstats keys functions by (filename, line, name)
+Func = Tuple[str, int, str]
+
+
+def _frame_label(func: Func) -> str:
+    filename, lineno, name = func
+    if filename == '~':
+        return name  # Built-in functions
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+
+def collapsed_stacks(stats: pstats.Stats) -> Dict[str, int]:
+    """Approximate flamegraph stacks (``a;b;c`` -> microseconds) from caller edges
+
+    cProfile records caller/callee pairs rather than full stacks, so each
+    callee's time is split between call paths in proportion to the time its
+    callers spent in it.
+    """
+    # Stats.stats is undocumented and missing from typeshed, but it is the only
+    # place pstats exposes caller edges; get_stats_profile() drops them
+    table: Dict[Func, Tuple[int, int, float, float, Dict[Func, Tuple]]] = stats.stats  # type: ignore[attr-defined]
+    callees: Dict[Func, Dict[Func, float]] = defaultdict(dict)
+    roots = []
+    for func, (_, _, _, _, callers) in table.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            callees[caller][func] = edge[3]
+
+    total_us = sum(entry[2] for entry in table.values()) * 1e6
+    min_us = max(1.0, total_us * MIN_STACK_SHARE)
+    stacks: Dict[str, int] = defaultdict(int)
+    pending: List[Tuple[Func, Tuple[str, ...], FrozenSet[Func], float]] = [
+        (root, (), frozenset(), 1.0) for root in sorted(roots)]
+    while pending:
+        func, stack, on_stack, share = pending.pop()
+        _, _, own_time, cumulative, _ = table[func]
+        stack = stack + (_frame_label(func),)
+        self_us = int(own_time * share * 1e6)
+        if self_us >= min_us:
+            stacks[';'.join(stack)] += self_us
+        if len(stack) >= MAX_STACK_DEPTH:
+            continue
+        for callee, edge_time in callees.get(func, {}).items():
+            callee_total = table[callee][3]
+            if callee in on_stack or callee_total <= 0:
+                continue
+            callee_share = share * edge_time / callee_total
+            if callee_share * callee_total * 1e6 >= min_us:
+                pending.append((callee, stack, on_stack | {func}, callee_share))
+    return dict(stacks)
+
+
+def write_profile(output_dir: Path, instrumentation: Instrumentation,
+                  stats: Optional[pstats.Stats] = None, name: str = 'validate') -> Dict[str, Path]:
+    """Write phase report, pstats dump and collapsed stacks into ``output_dir``"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = {}
+
+    phases_path = output_dir / f'{name}.phases.json'
+    with open(phases_path, 'w') as f:
+        json.dump(instrumentation.to_dict(), f, indent=2)
+    written['phases'] = phases_path
+
+    if stats is not None:
+        pstats_path = output_dir / f'{name}.pstats'
+        stats.dump_stats(str(pstats_path))
+        written['pstats'] = pstats_path
+
+        collapsed_path = output_dir / f'{name}.collapsed'
+        with open(collapsed_path, 'w') as f:
+            for stack, micros in sorted(collapsed_stacks(stats).items()):
+                f.write(f"{stack} {micros}\n")
+        written['collapsed'] = collapsed_path
+    return written
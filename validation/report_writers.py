@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Streaming Report Writers
+Emit validation results one at a time as NDJSON, SARIF or HTML
+"""
+
+import abc
+import json
+from datetime import datetime
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+TOOL_NAME = 'cursor-rules-validator'
+
+# Message prefix -> (SARIF rule id, short name); first match wins
+SARIF_RULES: List[Tuple[str, str, str]] = [
+    ('Missing metadata file', 'RV001', 'missing-metadata-file'),
+    ('Missing required metadata field', 'RV002', 'missing-metadata-field'),
+    ('Invalid version format', 'RV003', 'invalid-version'),
+    ('Unknown tags', 'RV004', 'unknown-tags'),
+    ('Rule exceeds maximum lines', 'RV005', 'rule-too-long'),
+    ('Rule approaching size limit', 'RV005', 'rule-too-long'),
+    ('High token count', 'RV006', 'high-token-count'),
+    ('Performance regression', 'RV007', 'performance-regression'),
+    ('Token increase', 'RV007', 'performance-regression'),
+    ('Dependency not found', 'RV008', 'missing-dependency'),
+    ('Conflict without resolution strategy', 'RV009', 'unresolved-conflict'),
+    ('Validation failed', 'RV000', 'validation-failure'),
+]
+UNCLASSIFIED_RULE = ('RV999', 'unclassified')
+
+
+def sarif_rule_for(message: str) -> Tuple[str, str]:
+    """Map a validation message to its SARIF rule id and name"""
+    for prefix, rule_id, name in SARIF_RULES:
+        if message.startswith(prefix):
+            return rule_id, name
+    return UNCLASSIFIED_RULE
+
+
+class ReportWriter(abc.ABC):
+    """Write a report incrementally: begin, one write_result per rule, end"""
+
+    def __init__(self, stream: TextIO, base_dir: Optional[Path] = None):
+        self.stream = stream
+        self.base_dir = base_dir
+
+    def begin(self, timestamp: Optional[str] = None) -> None:
+        pass
+
+    @abc.abstractmethod
+    def write_result(self, result) -> None:
+        ...
+
+    def end(self, summary: Dict[str, Any]) -> None:
+        pass
+
+    def _relative_uri(self, path: Path) -> str:
+        if self.base_dir is not None:
+            try:
+                return Path(path).resolve().relative_to(Path(self.base_dir).resolve()).as_posix()
+            except ValueError:
+                pass
+        return Path(path).as_posix()
+
+
+class NdjsonReportWriter(ReportWriter):
+    """One JSON object per line: a result per rule, then the summary"""
+
+    def write_result(self, result) -> None:
+        record = {'type': 'result', 'path': self._relative_uri(result.rule_path), **result.to_dict()}
+        self.stream.write(json.dumps(record, default=str) + '\n')
+        self.stream.flush()  # Lets CI show progress rule by rule
+
+    def end(self, summary: Dict[str, Any]) -> None:
+        self.stream.write(json.dumps({'type': 'summary', **summary}, default=str) + '\n')
+        self.stream.flush()
+
+
+class SarifReportWriter(ReportWriter):
+    """SARIF 2.1.0 log for code-scanning upload
+
+    Results are streamed into the run before the tool descriptor, which is
+    written last once every referenced rule id is known.
+    """
+
+    def begin(self, timestamp: Optional[str] = None) -> None:
+        self._first = True
+        self._rules: Dict[str, str] = {}
+        self.stream.write('{"$schema": %s, "version": "2.1.0", "runs": [{"results": [\n'
+                          % json.dumps(SARIF_SCHEMA))
+
+    def write_result(self, result) -> None:
+        uri = self._relative_uri(result.rule_path)
+        issues = [('error', message) for message in result.errors]
+        issues += [('warning', message) for message in result.warnings]
+        for level, message in issues:
+            rule_id, name = sarif_rule_for(message)
+            self._rules.setdefault(rule_id, name)
+            record = {
+                'ruleId': rule_id,
+                'level': level,
+                'message': {'text': message},
+                'locations': [{'physicalLocation': {'artifactLocation': {'uri': uri}}}]
+            }
+            self.stream.write(('' if self._first else ',\n') + json.dumps(record, default=str))
+            self._first = False
+
+    def end(self, summary: Dict[str, Any]) -> None:
+        driver = {
+            'name': TOOL_NAME,
+            'rules': [{'id': rule_id, 'name': name} for rule_id, name in sorted(self._rules.items())]
+        }
+        invocation = {
+            'executionSuccessful': True,
+            'properties': {key: value for key, value in summary.items() if key != 'suggested_fixes'}
+        }
+        self.stream.write('\n], "tool": {"driver": %s}, "invocations": [%s]}]}\n'
+                          % (json.dumps(driver), json.dumps(invocation, default=str)))
+        self.stream.flush()
+
+
+class HtmlReportWriter(ReportWriter):
+    """HTML table written row by row, with the summary after the results"""
+
+    def begin(self, timestamp: Optional[str] = None) -> None:
+        timestamp = timestamp or datetime.now().isoformat()
+        self.stream.write(f"""
+        <html>
+        <head>
+            <title>Rule Validation Report</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; margin: 20px; }}
+                .success {{ color: green; }}
+                .error {{ color: red; }}
+                .warning {{ color: orange; }}
+                table {{ border-collapse: collapse; width: 100%; }}
+                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+                th {{ background-color: #f2f2f2; }}
+            </style>
+        </head>
+        <body>
+            <h1>Rule Validation Report</h1>
+            <p>Generated: {escape(timestamp)}</p>
+
+            <h2>Results</h2>
+            <table>
+                <tr>
+                    <th>Rule</th>
+                    <th>Status</th>
+                    <th>Issues</th>
+                    <th>Performance</th>
+                </tr>
+        """)
+
+    def write_result(self, result) -> None:
+        self.write_row(result.to_dict())
+
+    def write_row(self, result: Dict[str, Any]) -> None:
+        status_class = 'success' if result['status'] == 'PASS' else 'error'
+        issues = '<br>'.join(escape(issue) for issue in result['errors'] + result['warnings'])
+        perf = result.get('performance', {})
+        perf_text = f"{perf.get('validation_time_ms', 'N/A')}ms" if perf else 'N/A'
+
+        self.stream.write(f"""
+                <tr>
+                    <td>{escape(result['rule'])}</td>
+                    <td class="{status_class}">{result['status']}</td>
+                    <td>{issues}</td>
+                    <td>{perf_text}</td>
+                </tr>
+            """)
+
+    def end(self, summary: Dict[str, Any]) -> None:
+        self.stream.write(f"""
+            </table>
+
+            <h2>Summary</h2>
+            <ul>
+                <li>Total Rules: {summary['total_rules']}</li>
+                <li>Valid Rules: {summary['valid_rules']}</li>
+                <li>Errors: {summary['error_count']}</li>
+                <li>Warnings: {summary['warning_count']}</li>
+            </ul>
+        </body>
+        </html>
+        """)
+        self.stream.flush()
+
+
+REPORT_WRITERS = {
+    'ndjson': NdjsonReportWriter,
+    'sarif': SarifReportWriter,
+    'html': HtmlReportWriter,
+}
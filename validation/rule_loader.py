@@ -4,18 +4,64 @@ Rule Loader with YAML-first strategy
 Supports both separated and legacy frontmatter formats
 """
 
+import os
 import re
+import sys
+import logging
+import pickle
+import sqlite3
+import hashlib
+import threading
 import yaml
 from pathlib import Path
-from typing import Dict, Tuple, Optional
-from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, NamedTuple, Set, Tuple, Optional
+from collections import defaultdict
+
+# Shared tooling lives alongside the other scripts
+SCRIPTS_DIR = str(Path(__file__).resolve().parent.parent / 'scripts')
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from token_counter import TOKEN_CACHE_FILENAME, get_token_counter
+
+# Bump whenever the cached payload layout changes
+CACHE_SCHEMA_VERSION = 2
+CACHE_FILENAME = 'rule_index.sqlite'
+
+# libyaml's C loader is several times faster; results are identical
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+FRONTMATTER_RE = re.compile(r'^---\n(.*?)\n---\n(.*)$', re.DOTALL)
 
-@dataclass
 class Rule:
-    """Rule with metadata and content"""
-    path: Path
-    metadata: Dict
-    content: str
+    """Rule with eagerly parsed metadata and a lazily read body
+    
+    The body is only read from disk on first access to ``content`` or
+    ``tokens``, so metadata-only queries never hold rule text in memory.
+    """
+    __slots__ = ('path', 'metadata', '_content', '_frontmatter')
+    
+    def __init__(self, path: Path, metadata: Dict, content: Optional[str] = None,
+                 frontmatter: bool = False):
+        self.path = path
+        self.metadata = metadata
+        self._content = content
+        # Whether the body must be split from a frontmatter header when read
+        self._frontmatter = frontmatter
+    
+    @property
+    def content(self) -> str:
+        if self._content is None:
+            self._content = _read_body(self.path, self._frontmatter)
+        return self._content
+    
+    @content.setter
+    def content(self, value: str) -> None:
+        self._content = value
+    
+    @property
+    def content_loaded(self) -> bool:
+        return self._content is not None
     
     @property
     def name(self) -> str:
@@ -31,110 +77,471 @@ class Rule:
     
     @property
     def tokens(self) -> int:
-        """Estimate token count"""
-        return len(self.content.split()) * 1.3
+        """Token count from the shared tokenizer-backed counter"""
+        return get_token_counter().count(self.content)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Rule):
+            return NotImplemented
+        return (self.path, self.metadata, self.content) == (other.path, other.metadata, other.content)
+    
+    def __repr__(self) -> str:
+        return f"Rule(path={self.path!r}, metadata={self.metadata!r})"
+
+def _read_body(rule_path: Path, frontmatter: bool) -> str:
+    """Read a rule body, stripping the frontmatter header without parsing it"""
+    text = rule_path.read_text()
+    if frontmatter:
+        match = FRONTMATTER_RE.match(text)
+        if match:
+            return match.group(2).strip()
+    return text
+
+class RuleCache:
+    """Persistent on-disk index of parsed rule metadata
+    
+    Entries are validated by mtime+size of the .mdc/.yaml pair first and
+    fall back to a content hash, so touched-but-unchanged files stay warm.
+    """
+    
+    def __init__(self, cache_path: Path):
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Watch mode writes from the watcher thread, serialised by the loader lock
+        self._conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+        self._dirty = False
+        self._init_schema()
+    
+    def _init_schema(self) -> None:
+        version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+        if version != CACHE_SCHEMA_VERSION:
+            self._conn.execute('DROP TABLE IF EXISTS rules')
+            self._conn.execute(f'PRAGMA user_version = {CACHE_SCHEMA_VERSION}')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS rules ('
+            'key TEXT PRIMARY KEY, signature TEXT NOT NULL, '
+            'digest TEXT NOT NULL, payload BLOB NOT NULL)'
+        )
+        self._conn.commit()
+    
+    def get(self, key: str) -> Optional[Tuple[str, str, bytes]]:
+        """Return the cached (signature, digest, payload) row for a rule"""
+        return self._conn.execute(
+            'SELECT signature, digest, payload FROM rules WHERE key = ?', (key,)
+        ).fetchone()
+    
+    @staticmethod
+    def decode(payload: bytes) -> Tuple[Dict, bool]:
+        """Unpack a payload into (metadata, frontmatter)"""
+        return pickle.loads(payload)
+    
+    def touch(self, key: str, signature: str) -> None:
+        """Record a new stat signature for content that did not change"""
+        self._conn.execute('UPDATE rules SET signature = ? WHERE key = ?', (signature, key))
+        self._dirty = True
+    
+    def put(self, key: str, signature: str, digest: str, metadata: Dict, frontmatter: bool) -> None:
+        payload = pickle.dumps((metadata, frontmatter), protocol=pickle.HIGHEST_PROTOCOL)
+        self._conn.execute(
+            'INSERT OR REPLACE INTO rules (key, signature, digest, payload) VALUES (?, ?, ?, ?)',
+            (key, signature, digest, payload)
+        )
+        self._dirty = True
+    
+    def commit(self) -> None:
+        if self._dirty:
+            self._conn.commit()
+            self._dirty = False
+    
+    def close(self) -> None:
+        self.commit()
+        self._conn.close()
+
+class RuleEvent(NamedTuple):
+    """Change published to watch subscribers"""
+    kind: str  # 'created', 'modified' or 'deleted'
+    name: str
+    path: Path
+    rule: Optional['Rule']
+
+class ParsedRule(NamedTuple):
+    """Result of reading one rule pair, picklable across processes"""
+    path: str
+    signature: str
+    digest: str
+    metadata: Optional[Dict]
+    frontmatter: bool
+
+def _stat_signature(*paths: Path) -> str:
+    """Cheap change signature from mtime and size of each path"""
+    parts = []
+    for path in paths:
+        try:
+            st = path.stat()
+            parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+        except FileNotFoundError:
+            parts.append('-')
+    return '|'.join(parts)
+
+def _load_yaml_text(text: str) -> Dict:
+    """Decode YAML with the libyaml-backed loader when available"""
+    return yaml.load(text, Loader=YAML_LOADER) or {}
+
+def _split_frontmatter(content: str) -> Tuple[Dict, str]:
+    """Parse frontmatter from content"""
+    match = FRONTMATTER_RE.match(content)
+    if match:
+        metadata = _load_yaml_text(match.group(1))
+        body = match.group(2).strip()
+        return metadata, body
+    return {}, content
+
+def _parse_rule_files(rule_path: str, known_digest: Optional[str] = None) -> ParsedRule:
+    """Read and decode one .mdc/.yaml pair
+    
+    Decoding is skipped when the content digest equals ``known_digest``.
+    Module-level so it can run inside worker processes.
+    """
+    mdc_path = Path(rule_path)
+    yaml_path = mdc_path.with_suffix('.yaml')
+    # Stat before reading so a concurrent edit can only cause a later miss
+    signature = _stat_signature(mdc_path, yaml_path)
+    mdc_bytes = mdc_path.read_bytes()
+    try:
+        yaml_bytes = yaml_path.read_bytes()
+    except FileNotFoundError:
+        yaml_bytes = None
+    
+    hasher = hashlib.sha256(mdc_bytes)
+    hasher.update(b'\0' + yaml_bytes if yaml_bytes is not None else b'\1')
+    digest = hasher.hexdigest()
+    frontmatter = yaml_bytes is None
+    
+    if digest == known_digest:
+        return ParsedRule(rule_path, signature, digest, None, frontmatter)
+    if yaml_bytes is None:
+        metadata, _ = _split_frontmatter(mdc_bytes.decode())
+    else:
+        metadata = _load_yaml_text(yaml_bytes.decode())
+    return ParsedRule(rule_path, signature, digest, metadata, frontmatter)
+
+def _parse_rule_batch(batch: List[Tuple[str, Optional[str]]]) -> List[ParsedRule]:
+    return [_parse_rule_files(rule_path, digest) for rule_path, digest in batch]
 
 class RuleLoader:
     """Load rules with YAML-first strategy"""
     
-    def __init__(self, rules_dir: Path):
+    def __init__(self, rules_dir: Path, cache_dir: Optional[Path] = None,
+                 workers: Optional[int] = None):
         self.rules_dir = Path(rules_dir)
-        self._cache = {}
+        self.workers = workers or 1
+        self._cache: Dict[Path, Rule] = {}
+        self._index: Optional[RuleIndex] = None
+        self._store = RuleCache(Path(cache_dir) / CACHE_FILENAME) if cache_dir else None
+        self._lock = threading.RLock()
+        self._subscribers: List[Callable[[RuleEvent], None]] = []
+        self._watcher = None
         
     def load_rule(self, rule_path: Path) -> Rule:
         """Load rule with metadata from YAML or frontmatter"""
+        with self._lock:
+            rule = self._load_rule(rule_path)
+            self.flush()
+        return rule
+    
+    def _load_rule(self, rule_path: Path) -> Rule:
         if rule_path in self._cache:
             return self._cache[rule_path]
-            
-        yaml_path = rule_path.with_suffix('.yaml')
+        return self._load_many([rule_path])[0]
+    
+    def _load_many(self, rule_paths: List[Path]) -> List[Rule]:
+        """Load rules in order, decoding cache misses in parallel when enabled"""
+        pending = []
+        entries = {}
+        for rule_path in rule_paths:
+            if rule_path in self._cache:
+                continue
+            entry = None
+            if self._store is not None:
+                entry = self._store.get(self._cache_key(rule_path))
+                signature = _stat_signature(rule_path, rule_path.with_suffix('.yaml'))
+                if entry is not None and entry[0] == signature:
+                    metadata, frontmatter = RuleCache.decode(entry[2])
+                    self._remember(rule_path, metadata, frontmatter)
+                    continue
+            entries[str(rule_path)] = (rule_path, entry)
+            pending.append((str(rule_path), entry[1] if entry else None))
         
-        # YAML-first strategy
-        if yaml_path.exists():
-            metadata = self._load_yaml(yaml_path)
-            content = rule_path.read_text()
-        else:
-            # Fallback to frontmatter
-            full_content = rule_path.read_text()
-            metadata, content = self._parse_frontmatter(full_content)
+        for parsed in self._parse_pending(pending):
+            rule_path, entry = entries[parsed.path]
+            if parsed.metadata is None:
+                # Touched but unchanged, reuse the cached decode; only a cache entry supplies a known digest
+                assert self._store is not None and entry is not None
+                self._store.touch(self._cache_key(rule_path), parsed.signature)
+                metadata, frontmatter = RuleCache.decode(entry[2])
+                self._remember(rule_path, metadata, frontmatter)
+                continue
+            if self._store is not None:
+                self._store.put(self._cache_key(rule_path), parsed.signature, parsed.digest,
+                                parsed.metadata, parsed.frontmatter)
+            self._remember(rule_path, parsed.metadata, parsed.frontmatter)
         
-        rule = Rule(path=rule_path, metadata=metadata, content=content)
+        return [self._cache[rule_path] for rule_path in rule_paths]
+    
+    def _parse_pending(self, pending: List[Tuple[str, Optional[str]]]) -> List[ParsedRule]:
+        if self.workers <= 1 or len(pending) < 2:
+            return _parse_rule_batch(pending)
+        
+        # concurrent.futures is a noticeable import, so only parallel runs pay for it
+        from concurrent.futures import ProcessPoolExecutor
+        
+        # Several chunks per worker keeps the pool busy when file sizes vary
+        chunksize = max(1, -(-len(pending) // (self.workers * 4)))
+        batches = [pending[i:i + chunksize] for i in range(0, len(pending), chunksize)]
+        parsed = []
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for results in pool.map(_parse_rule_batch, batches):
+                parsed.extend(results)
+        return parsed
+    
+    def _remember(self, rule_path: Path, metadata: Dict, frontmatter: bool) -> Rule:
+        rule = Rule(path=rule_path, metadata=metadata, frontmatter=frontmatter)
         self._cache[rule_path] = rule
         return rule
     
-    def _load_yaml(self, yaml_path: Path) -> Dict:
-        """Load metadata from YAML file"""
-        with open(yaml_path) as f:
-            return yaml.safe_load(f) or {}
+    def _cache_key(self, rule_path: Path) -> str:
+        try:
+            return rule_path.relative_to(self.rules_dir).as_posix()
+        except ValueError:
+            return str(rule_path.resolve())
     
-    def _parse_frontmatter(self, content: str) -> Tuple[Dict, str]:
-        """Parse frontmatter from content"""
-        match = re.match(r'^---\n(.*?)\n---\n(.*)$', content, re.DOTALL)
-        if match:
-            metadata = yaml.safe_load(match.group(1)) or {}
-            body = match.group(2).strip()
-            return metadata, body
-        return {}, content
+    def flush(self) -> None:
+        """Persist pending cache entries"""
+        if self._store is not None:
+            self._store.commit()
+    
+    def close(self) -> None:
+        self.unwatch()
+        with self._lock:
+            if self._store is not None:
+                self._store.close()
+                self._store = None
+    
+    def _scan(self) -> List[Path]:
+        """Collect every .mdc file under rules_dir in one os.scandir walk"""
+        found = []
+        pending = [str(self.rules_dir)]
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            pending.append(entry.path)
+                        elif entry.name.endswith('.mdc') and entry.is_file():
+                            found.append(Path(entry.path))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+        found.sort()
+        return found
+    
+    def _get_index(self) -> 'RuleIndex':
+        """Scan and load the tree once, reusing the index for every query"""
+        if self._index is None:
+            index = RuleIndex(self.rules_dir)
+            for rule in self._load_many(self._scan()):
+                index.add(rule)
+            self.flush()
+            self._index = index
+        return self._index
+    
+    def refresh(self) -> None:
+        """Drop in-memory state so the next query rescans the tree"""
+        with self._lock:
+            self._cache.clear()
+            self._index = None
     
     def load_all(self) -> Dict[str, Rule]:
         """Load all rules in the system"""
-        rules = {}
-        for rule_file in self.rules_dir.rglob("*.mdc"):
-            rule = self.load_rule(rule_file)
-            rules[rule.name] = rule
-        return rules
+        with self._lock:
+            return dict(self._get_index().rules)
     
     def load_category(self, category: str) -> Dict[str, Rule]:
         """Load all rules in a category"""
-        category_path = self.rules_dir / category
-        if not category_path.exists():
-            return {}
-            
-        rules = {}
-        for rule_file in category_path.glob("*.mdc"):
-            rule = self.load_rule(rule_file)
-            rules[rule.name] = rule
-        return rules
+        key = Path(category).as_posix()
+        with self._lock:
+            return dict(self._get_index().by_category.get(key, {}))
     
     def search_by_tag(self, tag: str) -> Dict[str, Rule]:
         """Find rules with specific tag"""
-        matching = {}
-        for rule_file in self.rules_dir.rglob("*.mdc"):
-            rule = self.load_rule(rule_file)
-            if tag in rule.metadata.get('tags', []):
-                matching[rule.name] = rule
-        return matching
+        with self._lock:
+            return dict(self._get_index().by_tag.get(tag, {}))
     
     def get_dependency_graph(self) -> Dict[str, set]:
         """Build dependency graph"""
-        graph = {}
-        all_rules = self.load_all()
+        with self._lock:
+            index = self._get_index()
+            return {name: set(deps) for name, deps in index.dependencies.items()}
+    
+    def subscribe(self, callback: Callable[[RuleEvent], None]) -> None:
+        """Register a callback for rule changes applied in watch mode"""
+        self._subscribers.append(callback)
+    
+    def apply_changes(self, changed_paths: Iterable[Path]) -> List[RuleEvent]:
+        """Re-parse only the rules behind changed .mdc/.yaml files
         
-        for name, rule in all_rules.items():
-            deps = set()
-            if 'dependencies' in rule.metadata:
-                deps_meta = rule.metadata['dependencies']
-                if 'required' in deps_meta:
-                    deps.update(deps_meta['required'])
-                if 'recommended' in deps_meta:
-                    deps.update(deps_meta['recommended'])
-            graph[name] = deps
+        Indexes and the dependency map are updated in place and each
+        resulting event is published to subscribers. A rule that fails to
+        parse, e.g. a half-written save, is logged and keeps its previous
+        version until a later change parses.
+        """
+        rule_paths = sorted({Path(path).with_suffix('.mdc') for path in changed_paths})
+        events = []
+        with self._lock:
+            index = self._get_index()
+            for rule_path in rule_paths:
+                self._cache.pop(rule_path, None)
+                previous = index.rules.get(rule_path.stem)
+                if previous is not None and previous.path != rule_path:
+                    previous = None
+                
+                if rule_path.is_file():
+                    try:
+                        rule = self._load_rule(rule_path)
+                        if not isinstance(rule.metadata, dict):
+                            raise ValueError(f"metadata is a {type(rule.metadata).__name__}, not a mapping")
+                    except (OSError, ValueError, yaml.YAMLError) as e:
+                        logging.error(f"Could not reload {rule_path}: {e}")
+                        self._cache.pop(rule_path, None)
+                        if previous is not None:
+                            self._cache[rule_path] = previous
+                        continue
+                    index.add(rule)
+                    kind = 'created' if previous is None else 'modified'
+                    events.append(RuleEvent(kind, rule.name, rule_path, rule))
+                elif previous is not None:
+                    index.discard(previous.name)
+                    events.append(RuleEvent('deleted', previous.name, rule_path, None))
+            self.flush()
         
-        return graph
+        for event in events:
+            for callback in self._subscribers:
+                callback(event)
+        return events
+    
+    def watch(self, interval: float = 0.5, use_watchdog: Optional[bool] = None):
+        """Keep the index current by applying file changes as they happen"""
+        if self._watcher is None:
+            from file_watcher import FileWatcher
+            
+            self._get_index()
+            watcher = FileWatcher([self.rules_dir], interval=interval, use_watchdog=use_watchdog)
+            watcher.start(
+                lambda changes: self.apply_changes(change.path for change in changes)
+            )
+            self._watcher = watcher
+        return self._watcher
+    
+    def unwatch(self) -> None:
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+class RuleIndex:
+    """In-memory rule index with tag and category inverted indexes"""
+    
+    def __init__(self, rules_dir: Path):
+        self.rules_dir = rules_dir
+        self.rules: Dict[str, Rule] = {}
+        self.by_tag: Dict[str, Dict[str, Rule]] = defaultdict(dict)
+        self.by_category: Dict[str, Dict[str, Rule]] = defaultdict(dict)
+        self.dependencies: Dict[str, Set[str]] = {}
+    
+    def add(self, rule: Rule) -> None:
+        """Index a rule, replacing any previous rule with the same name"""
+        if rule.name in self.rules:
+            self.discard(rule.name)
+        self.rules[rule.name] = rule
+        for tag in _rule_tags(rule.metadata):
+            self.by_tag[tag][rule.name] = rule
+        self.by_category[self._category_key(rule)][rule.name] = rule
+        self.dependencies[rule.name] = _rule_dependencies(rule.metadata)
+    
+    def discard(self, name: str) -> Optional[Rule]:
+        """Remove a rule from every index"""
+        rule = self.rules.pop(name, None)
+        if rule is None:
+            return None
+        for tag in _rule_tags(rule.metadata):
+            bucket = self.by_tag.get(tag)
+            if bucket is not None:
+                bucket.pop(name, None)
+                if not bucket:
+                    del self.by_tag[tag]
+        key = self._category_key(rule)
+        bucket = self.by_category.get(key)
+        if bucket is not None:
+            bucket.pop(name, None)
+            if not bucket:
+                del self.by_category[key]
+        self.dependencies.pop(name, None)
+        return rule
+    
+    def _category_key(self, rule: Rule) -> str:
+        # Categories are directories, matching the layout load_category expects
+        try:
+            return rule.path.parent.relative_to(self.rules_dir).as_posix()
+        except ValueError:
+            return rule.path.parent.name
+
+def _rule_tags(metadata: Dict) -> List[str]:
+    tags = metadata.get('tags') or []
+    if isinstance(tags, str):
+        return [tags]
+    return [tag for tag in tags if isinstance(tag, str)]
+
+def _rule_dependencies(metadata: Dict) -> Set[str]:
+    """Dependencies from either the {required, recommended} or plain list form"""
+    deps_meta = metadata.get('dependencies') or []
+    deps: Set[str] = set()
+    if isinstance(deps_meta, dict):
+        deps.update(deps_meta.get('required') or [])
+        deps.update(deps_meta.get('recommended') or [])
+    elif isinstance(deps_meta, list):
+        deps.update(dep for dep in deps_meta if isinstance(dep, str))
+    return deps
 
 # CLI interface
 def main():
     import argparse
-    import json
     
     parser = argparse.ArgumentParser()
-    parser.add_argument('command', choices=['list', 'show', 'stats', 'deps'])
+    parser.add_argument('command', choices=['list', 'show', 'stats', 'deps', 'watch'])
     parser.add_argument('--rule', help='Rule name for show command')
     parser.add_argument('--category', help='Filter by category')
     parser.add_argument('--tag', help='Filter by tag')
     parser.add_argument('--format', choices=['json', 'yaml', 'text'], default='text')
+    parser.add_argument('--cache-dir', type=Path, default=Path('./.cache'),
+                        help='Directory for the persistent rule cache')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the persistent rule cache')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for parsing uncached rules')
+    parser.add_argument('--interval', type=float, default=0.5,
+                        help='Polling interval in seconds for watch without watchdog, '
+                             'which is also the worst-case update latency')
     args = parser.parse_args()
     
-    loader = RuleLoader(Path('./rules'))
+    loader = RuleLoader(Path('./rules'), cache_dir=None if args.no_cache else args.cache_dir,
+                        workers=args.workers)
+    if not args.no_cache:
+        get_token_counter(args.cache_dir / TOKEN_CACHE_FILENAME)
+    try:
+        _run_command(args, loader)
+    finally:
+        loader.close()
+
+def _run_command(args, loader: RuleLoader) -> None:
+    import json
     
     if args.command == 'list':
         if args.category:
@@ -169,21 +576,19 @@ def main():
     
     elif args.command == 'stats':
         rules = loader.load_all()
-        total_tokens = sum(r.tokens for r in rules.values())
+        total_tokens = sum(get_token_counter().count_many(r.content for r in rules.values()))
+        
+        categories: Dict[str, int] = {}
+        for rule in rules.values():
+            categories[rule.category] = categories.get(rule.category, 0) + 1
         
         stats = {
             'total_rules': len(rules),
             'total_tokens': int(total_tokens),
             'avg_tokens': int(total_tokens / len(rules)) if rules else 0,
-            'categories': {}
+            'categories': categories
         }
         
-        for rule in rules.values():
-            cat = rule.category
-            if cat not in stats['categories']:
-                stats['categories'][cat] = 0
-            stats['categories'][cat] += 1
-        
         print(json.dumps(stats, indent=2))
     
     elif args.command == 'deps':
@@ -193,11 +598,29 @@ def main():
             json_graph = {k: list(v) for k, v in graph.items()}
             print(json.dumps(json_graph, indent=2))
         else:
-            for rule, deps in sorted(graph.items()):
+            for name, deps in sorted(graph.items()):
                 if deps:
-                    print(f"{rule}:")
+                    print(f"{name}:")
                     for dep in sorted(deps):
                         print(f"  → {dep}")
+    
+    elif args.command == 'watch':
+        import time
+        
+        def report(event: RuleEvent) -> None:
+            print(f"{event.kind}: {event.name}", flush=True)
+        
+        loader.subscribe(report)
+        watcher = loader.watch(interval=args.interval)
+        print(f"Watching {loader.rules_dir} (Ctrl-C to stop)", flush=True)
+        if not watcher.use_watchdog:
+            print(f"watchdog is not installed; polling every {args.interval}s "
+                  f"(pip install watchdog for near-instant updates)", flush=True)
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
 
 if __name__ == '__main__':
     main()
@@ -5,26 +5,42 @@ Production-ready validation with performance profiling and auto-fix suggestions
 """
 
 import os
-import re
+import sys
 import yaml
 import json
-import time
 import ast
-import networkx as nx
+import hashlib
+import tempfile
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Set, Any
-from dataclasses import dataclass, field, asdict
+from typing import Deque, Dict, List, Tuple, Optional, Set, Any, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field, fields, asdict
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, deque
+from io import StringIO
+from types import MappingProxyType
 import traceback
-import psutil
 import subprocess
 from enum import Enum
 
-# Performance profiling imports
-import cProfile
-import pstats
-from io import StringIO
+# Shared tooling lives alongside the other scripts
+SCRIPTS_DIR = str(Path(__file__).resolve().parent.parent / 'scripts')
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from token_counter import TOKEN_CACHE_FILENAME, get_token_counter
+from report_writers import HtmlReportWriter, ReportWriter, REPORT_WRITERS
+from instrumentation import Instrumentation, combine_profiles, write_profile
+from checks import (REGISTRY, METADATA_CHECKS, CONTENT, DEPENDENCY_TARGETS,
+                    CheckEngine, Findings, RuleInput, changed_fields)
+
+VALIDATION_CACHE_VERSION = 2
+VALIDATION_CACHE_FILENAME = 'validation_results.json'
+# Modules whose code decides results; editing them invalidates cached results
+RESULT_MODULES = ('checks', 'content_scanner', __name__)
+# One witness cycle is reported per strongly connected component, up to this many
+MAX_CYCLE_WITNESSES = 50
+# Upper bound on rules per worker batch, so streamed results arrive steadily
+MAX_BATCH_SIZE = 32
 
 
 class FixType(Enum):
@@ -59,6 +75,11 @@ class PerformanceMetrics:
             'file_size_bytes': self.file_size_bytes,
             'memory_usage_mb': round(self.memory_usage_mb, 2)
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict, rule_path: Path) -> 'PerformanceMetrics':
+        fields = {k: v for k, v in data.items() if k != 'rule'}
+        return cls(rule_path=rule_path, **fields)
 
 
 @dataclass 
@@ -78,6 +99,17 @@ class Fix:
             'new_value': self.new_value,
             'line_number': self.line_number
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Fix':
+        return cls(
+            type=FixType(data['type']),
+            description=data['description'],
+            old_value=data['old_value'],
+            new_value=data['new_value'],
+            line_number=data.get('line_number')
+        )
+
 @dataclass
 class ValidationResult:
     """Enhanced validation result with performance metrics"""
@@ -88,6 +120,8 @@ class ValidationResult:
     metrics: Dict[str, Any] = field(default_factory=dict)
     suggested_fixes: List[Fix] = field(default_factory=list)
     performance: Optional[PerformanceMetrics] = None
+    # Per-check findings, cached so unchanged checks need not rerun
+    check_findings: Dict[str, Findings] = field(default_factory=dict, repr=False, compare=False)
     
     @property
     def severity(self) -> str:
@@ -108,83 +142,481 @@ class ValidationResult:
             'fixes': [fix.to_dict() for fix in self.suggested_fixes],
             'performance': self.performance.to_dict() if self.performance else None
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict, rule_path: Path) -> 'ValidationResult':
+        """Rebuild a result serialized with ``to_dict``"""
+        performance = data.get('performance')
+        return cls(
+            rule_path=rule_path,
+            passed=data['status'] == 'PASS',
+            errors=list(data['errors']),
+            warnings=list(data['warnings']),
+            metrics=dict(data['metrics']),
+            suggested_fixes=[Fix.from_dict(fix) for fix in data['fixes']],
+            performance=PerformanceMetrics.from_dict(performance, rule_path) if performance else None
+        )
+
+
+class ValidationCache:
+    """Persisted validation results keyed by rule path
+    
+    Entries carry content digests and are only trusted while the validator
+    fingerprint (config, baselines, tokenizer) they were written under holds.
+    """
+    
+    def __init__(self, path: Path, fingerprint: str):
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, Dict] = {}
+        self._dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+                if (data.get('version') == VALIDATION_CACHE_VERSION
+                        and data.get('fingerprint') == fingerprint):
+                    self.entries = data.get('entries', {})
+            except (OSError, ValueError):
+                pass  # A corrupt cache is simply rebuilt
+    
+    def get(self, key: str) -> Optional[Dict]:
+        return self.entries.get(key)
+    
+    def put(self, key: str, entry: Dict) -> None:
+        self.entries[key] = entry
+        self._dirty = True
+    
+    def save(self) -> None:
+        """Atomically write the cache if anything changed"""
+        if not self._dirty:
+            return
+        payload = {
+            'version': VALIDATION_CACHE_VERSION,
+            'fingerprint': self.fingerprint,
+            'entries': self.entries
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(payload, f, default=str)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+class ReportSummary:
+    """Running report totals, updated one result at a time"""
+    
+    def __init__(self, collect_fixes: bool = True):
+        self.collect_fixes = collect_fixes
+        self.total_rules = 0
+        self.passed_rules = 0
+        self.errors = 0
+        self.warnings = 0
+        self.perf_count = 0
+        self.total_validation_ms = 0.0
+        self.total_tokens = 0
+        self.largest_rule: Optional[Dict] = None
+        self.fix_count = 0
+        self.fixes: List[Dict] = []
+    
+    def add(self, result: ValidationResult) -> None:
+        self.total_rules += 1
+        self.passed_rules += result.passed
+        self.errors += len(result.errors)
+        self.warnings += len(result.warnings)
+        
+        if result.performance:
+            perf = result.performance.to_dict()
+            self.perf_count += 1
+            self.total_validation_ms += perf['validation_time_ms']
+            self.total_tokens += perf['token_count']
+            if self.largest_rule is None or perf['line_count'] > self.largest_rule['line_count']:
+                self.largest_rule = perf
+        
+        self.fix_count += len(result.suggested_fixes)
+        if self.collect_fixes:
+            self.fixes.extend({
+                'rule': str(result.rule_path.name),
+                'fix': fix.to_dict()
+            } for fix in result.suggested_fixes)
+    
+    def to_dict(self, cycles: Optional[List[List[str]]] = None,
+                results: Optional[List[Dict]] = None) -> Dict[str, Any]:
+        report = {
+            'timestamp': datetime.now().isoformat(),
+            'success': self.errors == 0,
+            'total_rules': self.total_rules,
+            'valid_rules': self.passed_rules,
+            'error_count': self.errors,
+            'warning_count': self.warnings,
+            'dependency_cycles': cycles or []
+        }
+        if results is not None:
+            report['results'] = results
+        
+        # Add performance summary
+        if self.perf_count:
+            report['performance_summary'] = {
+                'avg_validation_time_ms': self.total_validation_ms / self.perf_count,
+                'total_tokens': self.total_tokens,
+                'largest_rule': self.largest_rule
+            }
+        
+        # Add suggested fixes summary
+        if self.fixes:
+            report['suggested_fixes'] = self.fixes
+        elif self.fix_count and not self.collect_fixes:
+            report['suggested_fix_count'] = self.fix_count
+        return report
 
 
 class DependencyGraph:
-    """Analyze rule dependencies and detect cycles"""
+    """Analyze rule dependencies and detect cycles
     
-    def __init__(self):
-        self.graph = nx.DiGraph()
+    Edges point from a rule to the rules it depends on. Cycle detection,
+    depths and trees are derived from one pass of Tarjan's strongly
+    connected components algorithm, so analysis stays O(V + E).
+    """
+    
+    def __init__(self) -> None:
+        self.successors: Dict[str, List[str]] = {}
+        self.predecessors: Dict[str, List[str]] = {}
+        self.paths: Dict[str, Path] = {}
         self.metadata_cache: Dict[Path, Dict] = {}
+        self._reset_analysis()
+    
+    def _reset_analysis(self) -> None:
+        self._components: Optional[List[List[str]]] = None
+        self._component_of: Dict[str, int] = {}
+        self._cyclic: List[bool] = []
+        self._depths: List[int] = []
+        self._trees: Dict[str, Mapping[str, Any]] = {}
     
-    def build_from_directory(self, rules_dir: Path) -> None:
-        """Build dependency graph from all rules"""
-        yaml_files = list(rules_dir.rglob("*.yaml"))
+    def build_from_directory(self, rules_dir: Path, parsed: Optional[Dict[Path, Dict]] = None) -> None:
+        """Build dependency graph from all rules
+        
+        ``parsed`` maps YAML paths to metadata that was already decoded,
+        so those files are not read a second time.
+        """
+        parsed = parsed or {}
+        yaml_files = sorted(rules_dir.rglob("*.yaml"))
         
         for yaml_file in yaml_files:
             if yaml_file.name == '_category.yaml':
                 continue
-                
-            with open(yaml_file) as f:
-                metadata = yaml.safe_load(f)
-                self.metadata_cache[yaml_file] = metadata
-                
-                rule_name = yaml_file.stem
-                self.graph.add_node(rule_name, path=yaml_file)
-                
-                if 'dependencies' in metadata:
-                    for dep in metadata['dependencies']:
-                        dep_name = Path(dep).stem
-                        self.graph.add_edge(rule_name, dep_name)
-    
-    def find_cycles(self) -> List[List[str]]:
-        """Find all cycles in dependency graph"""
-        try:
-            cycles = list(nx.simple_cycles(self.graph))
-            return cycles
-        except nx.NetworkXNoCycle:
-            return []
+            
+            if yaml_file in parsed:
+                metadata = parsed[yaml_file]
+            else:
+                with open(yaml_file) as f:
+                    metadata = yaml.safe_load(f)
+            self.add_rule(yaml_file, metadata)
+    
+    def add_node(self, rule: str) -> None:
+        if rule not in self.successors:
+            self.successors[rule] = []
+            self.predecessors[rule] = []
+            self._reset_analysis()
+    
+    def add_edge(self, rule: str, dependency: str) -> None:
+        self.add_node(rule)
+        self.add_node(dependency)
+        if dependency not in self.successors[rule]:
+            self.successors[rule].append(dependency)
+            self.predecessors[dependency].append(rule)
+            self._reset_analysis()
+    
+    def add_rule(self, yaml_file: Path, metadata: Dict) -> None:
+        """Add one rule and its dependency edges"""
+        self.metadata_cache[yaml_file] = metadata
+        
+        rule_name = yaml_file.stem
+        self.add_node(rule_name)
+        self.paths[rule_name] = yaml_file
+        
+        if metadata and 'dependencies' in metadata:
+            for dep in metadata['dependencies']:
+                dep_name = Path(dep).stem
+                self.add_edge(rule_name, dep_name)
+    
+    def __contains__(self, rule: str) -> bool:
+        return rule in self.successors
+    
+    def strongly_connected_components(self) -> List[List[str]]:
+        """Components in dependency order: every component follows those it depends on"""
+        return [list(component) for component in self._analyze()]
+    
+    def _analyze(self) -> List[List[str]]:
+        """Run Tarjan's algorithm and derive component depths; returns the components"""
+        if self._components is not None:
+            return self._components
+        
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        components: List[List[str]] = []
+        
+        # Iterative DFS so long dependency chains cannot hit the recursion limit
+        for root in self.successors:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.successors[root]))]
+            while work:
+                node, deps = work[-1]
+                for dep in deps:
+                    if dep not in index:
+                        index[dep] = lowlink[dep] = len(index)
+                        stack.append(dep)
+                        on_stack.add(dep)
+                        work.append((dep, iter(self.successors[dep])))
+                        break
+                    if dep in on_stack:
+                        lowlink[node] = min(lowlink[node], index[dep])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component: List[str] = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+        
+        component_of: Dict[str, int] = {}
+        for number, component in enumerate(components):
+            for member in component:
+                component_of[member] = number
+        
+        # Tarjan emits dependencies first, so depths fill in one sweep
+        cyclic: List[bool] = []
+        depths: List[int] = []
+        for number, component in enumerate(components):
+            depth = 0
+            is_cyclic = len(component) > 1
+            for member in component:
+                for dep in self.successors[member]:
+                    target = component_of[dep]
+                    if target == number:
+                        is_cyclic = True
+                    else:
+                        depth = max(depth, depths[target] + 1)
+            cyclic.append(is_cyclic)
+            depths.append(depth)
+        
+        self._components = components
+        self._component_of = component_of
+        self._cyclic = cyclic
+        self._depths = depths
+        return components
+    
+    def find_cycles(self, max_cycles: int = MAX_CYCLE_WITNESSES) -> List[List[str]]:
+        """Find dependency cycles, one witness per strongly connected component
+        
+        Each witness is a shortest cycle through the component's first rule
+        in sorted order. At most ``max_cycles`` witnesses are returned.
+        """
+        cycles: List[List[str]] = []
+        for number, component in enumerate(self._analyze()):
+            if len(cycles) >= max_cycles:
+                break
+            if self._cyclic[number]:
+                cycles.append(self._cycle_witness(number, min(component)))
+        return cycles
+    
+    def _cycle_witness(self, number: int, start: str) -> List[str]:
+        """Shortest cycle through ``start`` inside its component, by BFS"""
+        parent: Dict[str, Optional[str]] = {start: None}
+        queue = [start]
+        for node in queue:
+            for dep in self.successors[node]:
+                if self._component_of[dep] != number:
+                    continue
+                if dep == start:
+                    cycle: List[str] = []
+                    step: Optional[str] = node
+                    while step is not None:
+                        cycle.append(step)
+                        step = parent[step]
+                    return cycle[::-1]
+                if dep not in parent:
+                    parent[dep] = node
+                    queue.append(dep)
+        return [start]
     
     def get_dependency_depth(self, rule: str) -> int:
-        """Get maximum dependency depth for a rule"""
-        if rule not in self.graph:
-            return 0
+        """Get maximum dependency depth for a rule
         
-        try:
-            paths = nx.single_source_shortest_path_length(self.graph, rule)
-            return max(paths.values()) if paths else 0
-        except nx.NetworkXError:
-            # This can happen if the rule is not in the graph, which is a valid case
+        Depth is the longest chain of dependencies below the rule; rules in
+        a cycle share one level.
+        """
+        if rule not in self.successors:
             return 0
+        self._analyze()
+        return self._depths[self._component_of[rule]]
     
-    def get_dependency_tree(self, rule: str) -> Dict:
-        """Get full dependency tree for a rule"""
-        if rule not in self.graph:
-            return {}
+    def get_dependents(self, rule: str) -> Set[str]:
+        """Get every rule that depends on ``rule``, directly or transitively"""
+        if rule not in self.predecessors:
+            return set()
         
-        tree = {}
-        for successor in self.graph.successors(rule):
-            tree[successor] = self.get_dependency_tree(successor)
-        return tree
+        dependents: Set[str] = set()
+        pending = [rule]
+        while pending:
+            for dependent in self.predecessors[pending.pop()]:
+                if dependent not in dependents:
+                    dependents.add(dependent)
+                    pending.append(dependent)
+        dependents.discard(rule)
+        return dependents
+    
+    def get_dependency_tree(self, rule: str) -> Mapping[str, Any]:
+        """Get full dependency tree for a rule
+        
+        Trees are read-only mappings whose subtrees are shared between
+        rules rather than copied, and each cycle is cut with an empty
+        subtree where it would repeat a rule.
+        """
+        if rule not in self.successors:
+            return MappingProxyType({})
+        components = self._analyze()
+        
+        # Collect what the rule reaches, then build trees dependencies-first
+        reachable = {rule}
+        pending = [rule]
+        while pending:
+            for dep in self.successors[pending.pop()]:
+                if dep not in reachable:
+                    reachable.add(dep)
+                    pending.append(dep)
+        
+        for number, component in enumerate(components):
+            for member in component:
+                if member in self._trees or member not in reachable:
+                    continue
+                if self._cyclic[number]:
+                    # Only rules entered from outside the cycle need their own expansion
+                    if member == rule or any(
+                            self._component_of[dependent] != number and dependent in reachable
+                            for dependent in self.predecessors[member]):
+                        self._trees[member] = self._cyclic_tree(number, member)
+                else:
+                    self._trees[member] = MappingProxyType(
+                        {dep: self._trees[dep] for dep in self.successors[member]})
+        return self._trees[rule]
+    
+    def _cyclic_tree(self, number: int, entry: str) -> Mapping[str, Any]:
+        """Expand a cyclic component from ``entry``, visiting each member once"""
+        root: Dict[str, Any] = {}
+        expanded = {entry}
+        pending = [(entry, root)]
+        while pending:
+            node, tree = pending.pop()
+            for dep in self.successors[node]:
+                if self._component_of[dep] != number:
+                    tree[dep] = self._trees[dep]
+                elif dep in expanded:
+                    tree[dep] = MappingProxyType({})
+                else:
+                    expanded.add(dep)
+                    subtree: Dict[str, Any] = {}
+                    tree[dep] = MappingProxyType(subtree)  # A live view, filled in below
+                    pending.append((dep, subtree))
+        return MappingProxyType(root)
+
 
 class EnhancedRuleValidator:
     """Production-ready rule validation with profiling and fixes"""
     
-    def __init__(self, rules_dir: Path):
+    def __init__(self, rules_dir: Path, cache_dir: Optional[Path] = None,
+                 profile: bool = False, trace_allocations: bool = False):
         self.rules_dir = rules_dir
         self.results: List[ValidationResult] = []
         self.dependency_graph = DependencyGraph()
         self.config = self._load_config()
-        self.process = psutil.Process()
+        self._check_engine: Optional[CheckEngine] = None
+        # Token counts persist only alongside the other caches, never with --no-cache
+        self.token_counter = get_token_counter(
+            Path(cache_dir) / TOKEN_CACHE_FILENAME if cache_dir is not None else None)
         
-        # Performance tracking
-        self.profiler = cProfile.Profile()
+        # Performance tracking: phase timers are always on; cProfile and
+        # tracemalloc only when asked for, since both slow validation down
+        self.instrumentation = Instrumentation(trace_allocations=trace_allocations)
+        self.profile = profile
+        self._profiler: Optional[Any] = None  # cProfile.Profile, imported only when profiling
+        self._worker_profiles: List[Dict] = []
         self.performance_baselines: Dict[str, PerformanceMetrics] = {}
         self._load_baselines()
+        
+        # Incremental validation
+        self.validation_cache = None
+        if cache_dir is not None:
+            self.validation_cache = ValidationCache(
+                Path(cache_dir) / VALIDATION_CACHE_FILENAME, self._fingerprint()
+            )
+    
+    @property
+    def profiler(self):
+        """cProfile profiler for validate_all, created on first use"""
+        if self._profiler is None:
+            import cProfile
+            self._profiler = cProfile.Profile()
+        return self._profiler
+    
+    def profile_stats(self):
+        """cProfile stats for the last validate_all, including worker processes"""
+        if not self.profile:
+            return None
+        return combine_profiles(self._profiler, self._worker_profiles)
+    
+    def write_profile(self, output_dir: Path) -> Dict[str, Path]:
+        """Write phase histograms, a pstats dump and collapsed stacks"""
+        return write_profile(output_dir, self.instrumentation, self.profile_stats())
+    
+    @property
+    def check_engine(self) -> CheckEngine:
+        """Rule checks compiled for the current config, rebuilt if it is replaced"""
+        if self._check_engine is None or self._check_engine.config is not self.config:
+            self._check_engine = REGISTRY.compile(
+                self.config, METADATA_CHECKS, rules_dir=self.rules_dir,
+                count_tokens=lambda text: self._estimate_tokens(text)
+            )
+        return self._check_engine
+    
+    def _fingerprint(self) -> str:
+        """Hash of every validator setting and piece of check code that can change a rule's result"""
+        settings = {
+            'config': self.config,
+            'baselines': {name: asdict(metrics) for name, metrics in self.performance_baselines.items()},
+            'encoding': self.token_counter.encoding_name,
+            'checks': [(check.name, check.phase, check.needs if not callable(check.needs)
+                        else check.needs.__qualname__) for check in REGISTRY],
+            'selected_checks': list(METADATA_CHECKS),
+            'code': _code_digest()
+        }
+        encoded = json.dumps(settings, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+    
+    @property
+    def config_path(self) -> Path:
+        return self.rules_dir.parent / 'validation' / 'config.yaml'
+    
+    @property
+    def baseline_path(self) -> Path:
+        return self.rules_dir.parent / 'baseline_metrics.json'
     
     def _load_config(self) -> Dict:
         """Load validation configuration"""
-        config_path = self.rules_dir.parent / 'validation' / 'config.yaml'
+        config_path = self.config_path
         defaults = {
             'max_lines': 150,
             'warn_lines': 100,
@@ -214,49 +646,55 @@ class EnhancedRuleValidator:
     
     def _load_baselines(self) -> None:
         """Load performance baselines"""
-        baseline_path = self.rules_dir.parent / 'baseline_metrics.json'
+        baseline_path = self.baseline_path
         if baseline_path.exists():
             with open(baseline_path) as f:
                 data = json.load(f)
+                known = {f.name for f in fields(PerformanceMetrics)}
                 for rule, metrics in data.items():
+                    # Statistical baselines also carry samples and stats
                     self.performance_baselines[rule] = PerformanceMetrics(
                         rule_path=Path(rule),
-                        **metrics
+                        **{key: value for key, value in metrics.items() if key in known}
                     )
     def benchmark_rule(self, rule_path: Path) -> PerformanceMetrics:
         """Benchmark rule loading and parsing performance"""
-        start_time = time.perf_counter()
-        initial_memory = self.process.memory_info().rss / 1024 / 1024
-        
         # Load MDC file
-        load_start = time.perf_counter()
-        with open(rule_path) as f:
-            content = f.read()
-        load_time = (time.perf_counter() - load_start) * 1000
+        with self.instrumentation.phase('read') as read:
+            with open(rule_path) as f:
+                content = f.read()
         
         # Parse metadata from corresponding YAML file
-        parse_start = time.perf_counter()
-        yaml_path = rule_path.with_suffix('.yaml')
-        metadata = {}
-        if yaml_path.exists():
-            try:
-                with open(yaml_path) as f:
-                    metadata = yaml.safe_load(f)
-            except yaml.YAMLError:
-                metadata = {}
-        parse_time = (time.perf_counter() - parse_start) * 1000
+        with self.instrumentation.phase('yaml_decode') as decode:
+            yaml_path = rule_path.with_suffix('.yaml')
+            metadata = {}
+            if yaml_path.exists():
+                try:
+                    with open(yaml_path) as f:
+                        metadata = yaml.safe_load(f)
+                except yaml.YAMLError:
+                    metadata = {}
         
         # Validation timing
-        val_start = time.perf_counter()
-        result = ValidationResult(rule_path=rule_path)
-        self._validate_metadata(metadata, result)
-        val_time = (time.perf_counter() - val_start) * 1000
+        with self.instrumentation.phase('metadata_checks') as checks:
+            result = ValidationResult(rule_path=rule_path)
+            self._validate_metadata(metadata, result)
         
-        # Calculate metrics
+        return self._performance_metrics(rule_path, content, read.elapsed_ms, decode.elapsed_ms,
+                                         checks.elapsed_ms, (read, decode, checks))
+    
+    def _performance_metrics(self, rule_path: Path, content: str, load_time: float,
+                             parse_time: float, val_time: float,
+                             phases: Iterable = ()) -> PerformanceMetrics:
+        """Assemble metrics for a rule that has already been read and parsed
+        
+        Memory is the largest tracemalloc peak across ``phases``, or 0 when
+        allocation tracing is off.
+        """
         file_stats = rule_path.stat()
         lines = content.count('\n') + 1
         tokens = self._estimate_tokens(content)
-        final_memory = self.process.memory_info().rss / 1024 / 1024
+        peak_bytes = max((phase.peak_bytes for phase in phases), default=0)
         
         return PerformanceMetrics(
             rule_path=rule_path,
@@ -266,7 +704,7 @@ class EnhancedRuleValidator:
             token_count=tokens,
             line_count=lines,
             file_size_bytes=file_stats.st_size,
-            memory_usage_mb=final_memory - initial_memory
+            memory_usage_mb=peak_bytes / 1024 / 1024
         )
     
     def analyze_dependencies(self) -> DependencyGraph:
@@ -305,73 +743,336 @@ class EnhancedRuleValidator:
                 ))
         
         return fixes
-    def validate_all(self, report_format: str = "json") -> Dict[str, Any]:
-        """Complete validation with dependency analysis"""
-        self.profiler.enable()
+    def validate_all(self, report_format: str = "json", workers: Optional[int] = None,
+                     changed: Optional[Set[Path]] = None,
+                     writer: Optional[ReportWriter] = None) -> Dict[str, Any]:
+        """Complete validation with dependency analysis
         
-        # Build dependency graph first
-        self.analyze_dependencies()
-        cycles = self.dependency_graph.find_cycles()
+        With ``workers`` > 1, rule pairs are read, parsed and checked in a
+        process pool; results are merged back in path order. When ``changed``
+        is given, only those rules and their dependents are validated.
+        
+        With a ``writer``, each result is streamed to it as soon as it is
+        produced instead of being kept in ``self.results``, and the summary
+        (without per-rule results) is returned.
+        """
+        self._worker_profiles = []
+        self.instrumentation.start()
+        if self.profile:
+            self.profiler.enable()
+        summary = ReportSummary(collect_fixes=False)
+        if writer is not None:
+            writer.begin()
         
-        # Validate all rules
-        rule_files = list(self.rules_dir.rglob("*.mdc"))
-        yaml_files = list(self.rules_dir.rglob("*.yaml"))
+        def emit(result: ValidationResult) -> None:
+            if writer is None:
+                self.results.append(result)
+            else:
+                summary.add(result)
+                writer.write_result(result)
         
         # Match MDC files with their YAML metadata
         rule_pairs = []
-        for mdc in rule_files:
+        missing = []
+        for mdc in sorted(self.rules_dir.rglob("*.mdc")):
             yaml_path = mdc.with_suffix('.yaml')
             if yaml_path.exists():
                 rule_pairs.append((mdc, yaml_path))
             else:
-                self.results.append(ValidationResult(
+                missing.append(ValidationResult(
                     rule_path=mdc,
                     passed=False,
                     errors=[f"Missing metadata file: {yaml_path.name}"]
                 ))
         
-        # Validate each rule
-        for mdc_path, yaml_path in rule_pairs:
-            result = self._validate_rule_pair(mdc_path, yaml_path)
-            self.results.append(result)
+        if changed is not None:
+            # The full graph is needed to find dependents of the changed rules
+            self.dependency_graph.build_from_directory(self.rules_dir, self._cached_metadata())
+            scope = self._affected_rules(changed)
+            if scope is not None:
+                rule_pairs = [pair for pair in rule_pairs if pair[0].stem in scope]
+                missing = [result for result in missing if result.rule_path.stem in scope]
+        for result in missing:
+            emit(result)
+        
+        # Validate each rule, reading every file exactly once
+        parsed_metadata = {}
+        for (mdc_path, yaml_path), (result, metadata) in zip(
+                rule_pairs, self._validate_pairs(rule_pairs, workers)):
+            emit(result)
+            if metadata is not None:
+                parsed_metadata[yaml_path] = metadata
         
-        self.profiler.disable()
+        # Dependency graph reuses the metadata decoded above
+        if changed is None:
+            self.dependency_graph.build_from_directory(self.rules_dir, parsed_metadata)
+        cycles = self.dependency_graph.find_cycles()
+        
+        if self.validation_cache is not None:
+            self.validation_cache.save()
+        
+        if self.profile:
+            self.profiler.disable()
+        self.instrumentation.stop()
+        
+        if writer is not None:
+            report = summary.to_dict(cycles)
+            report['instrumentation'] = self.instrumentation.to_dict()
+            writer.end(report)
+            return report
         
         # Generate report
-        return self.generate_report(report_format, cycles)
+        report = self.generate_report(report_format, cycles)
+        if isinstance(report, dict):
+            report['instrumentation'] = self.instrumentation.to_dict()
+        return report
+    
+    def _affected_rules(self, changed: Set[Path]) -> Optional[Set[str]]:
+        """Names of changed rules plus their dependents, or None for all rules"""
+        # Edits to the config or baselines invalidate every result, so the scope widens to all rules
+        global_inputs = {self.config_path.resolve(), self.baseline_path.resolve()}
+        scope = set()
+        for path in changed:
+            path = Path(path)
+            if path.resolve() in global_inputs:
+                return None
+            if path.suffix in ('.mdc', '.yaml') and path.name != '_category.yaml':
+                scope.add(path.stem)
+        
+        for rule in list(scope):
+            scope |= self.dependency_graph.get_dependents(rule)
+        return scope
+    
+    def _cached_metadata(self) -> Dict[Path, Dict]:
+        """Metadata from cache entries whose YAML file is unchanged"""
+        if self.validation_cache is None:
+            return {}
+        
+        metadata = {}
+        for key, entry in self.validation_cache.entries.items():
+            yaml_path = (self.rules_dir / key).with_suffix('.yaml')
+            if entry.get('metadata') is None:
+                continue
+            try:
+                with open(yaml_path) as f:
+                    yaml_text = f.read()
+            except OSError:
+                continue
+            if _digest(yaml_text) == entry['yaml_digest']:
+                metadata[yaml_path] = entry['metadata']
+        return metadata
+    
+    def _validate_pairs(self, rule_pairs: List[Tuple[Path, Path]],
+                        workers: Optional[int]) -> Iterator[Tuple[ValidationResult, Optional[Dict]]]:
+        """Yield outcomes in order, serving unchanged rules from the validation cache"""
+        if self.validation_cache is None:
+            items = ((mdc, yaml_path, None, None, None) for mdc, yaml_path in rule_pairs)
+            yield from self._run_validation_pipeline(items, workers, len(rule_pairs))
+            return
+        
+        # Lookups run lazily ahead of the pipeline; outcomes come back in the same order
+        records: Deque[Tuple[Path, Optional[Tuple[str, str, str]]]] = deque()
+        
+        def lookups():
+            for mdc, yaml_path in rule_pairs:
+                try:
+                    sources = self._read_sources(mdc, yaml_path)
+                except OSError:
+                    records.append((mdc, None))
+                    yield mdc, yaml_path, None, None, None
+                    continue
+                digests = (_digest(sources[0], sources[1]), _digest(sources[1]), _digest(sources[0]))
+                entry = self.validation_cache.get(self._cache_key(mdc))
+                if (entry is not None
+                        and entry['digest'] == digests[0]
+                        and entry['dependencies'] == self._dependency_state(entry['metadata'])):
+                    records.append((mdc, None))
+                    yield mdc, yaml_path, None, (ValidationResult.from_dict(entry['result'], mdc), entry['metadata']), None
+                else:
+                    # A stale entry still lets checks whose inputs are unchanged be skipped
+                    records.append((mdc, digests))
+                    yield mdc, yaml_path, sources, None, entry
+        
+        for result, metadata in self._run_validation_pipeline(lookups(), workers, len(rule_pairs)):
+            mdc, digests = records.popleft()
+            if digests is not None:
+                self.validation_cache.put(self._cache_key(mdc), {
+                    'digest': digests[0],
+                    'yaml_digest': digests[1],
+                    'content_digest': digests[2],
+                    'dependencies': self._dependency_state(metadata),
+                    'metadata': metadata,
+                    'result': result.to_dict(),
+                    'checks': {name: found.to_dict() for name, found in result.check_findings.items()}
+                })
+            yield result, metadata
+    
+    def _cache_key(self, mdc_path: Path) -> str:
+        return mdc_path.relative_to(self.rules_dir).as_posix()
+    
+    def _dependency_state(self, metadata: Optional[Dict]) -> Dict[str, bool]:
+        """Existence of each declared dependency, which a cached result relies on"""
+        if not isinstance(metadata, dict) or not isinstance(metadata.get('dependencies'), list):
+            return {}
+        return {str(dep): (self.rules_dir / str(dep)).exists() for dep in metadata['dependencies']}
+    
+    def _run_validation_pipeline(self, items: Iterable[Tuple[Path, Path, Optional[Tuple[str, str, float]],
+                                                           Optional[Tuple[ValidationResult, Optional[Dict]]],
+                                                           Optional[Dict]]],
+                                 workers: Optional[int], total: int) -> Iterator[Tuple[ValidationResult, Optional[Dict]]]:
+        """Validate rule pairs serially or across a process pool, yielding in order
+        
+        Items are ``(mdc, yaml, sources, outcome, previous)``; a known outcome
+        passes straight through and ``previous`` is a stale cache entry. Only a bounded number of batches is in flight, so
+        results stream out while later rules are still being read.
+        """
+        if not workers or workers <= 1 or total < 2:
+            for mdc, yaml_path, sources, outcome, previous in items:
+                yield outcome or self._validate_source(mdc, yaml_path, sources, previous)
+            return
+        
+        # concurrent.futures is a noticeable import, so only parallel runs pay for it
+        from concurrent.futures import ProcessPoolExecutor
+        
+        # Several chunks per worker keeps the pool busy when rule sizes vary
+        chunksize = max(1, min(MAX_BATCH_SIZE, -(-total // (workers * 4))))
+        in_flight: Deque[Any] = deque()  # Submitted batches, or outcome lists already known
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_validation_worker,
+                initargs=(str(self.rules_dir), self.config, self.performance_baselines,
+                          self.profile, self.instrumentation.trace_allocations)) as pool:
+            batch: List[Tuple[str, str, Optional[Tuple[str, str, float]], Optional[Dict]]] = []
+            for mdc, yaml_path, sources, outcome, previous in items:
+                if outcome is not None:
+                    if batch:
+                        in_flight.append(pool.submit(_validate_batch, batch))
+                        batch = []
+                    in_flight.append([outcome])
+                else:
+                    batch.append((str(mdc), str(yaml_path), sources, previous))
+                    if len(batch) >= chunksize:
+                        in_flight.append(pool.submit(_validate_batch, batch))
+                        batch = []
+                while len(in_flight) > workers * 2:
+                    yield from self._batch_outcomes(in_flight.popleft())
+            if batch:
+                in_flight.append(pool.submit(_validate_batch, batch))
+            while in_flight:
+                yield from self._batch_outcomes(in_flight.popleft())
+    
+    def _batch_outcomes(self, batch) -> List[Tuple[ValidationResult, Optional[Dict]]]:
+        """Outcomes of a submitted batch, merging the worker's measurements"""
+        if isinstance(batch, list):
+            return batch  # Outcomes already known, e.g. cache hits
+        outcomes, instrumentation, profile_stats = batch.result()
+        self.instrumentation.merge(instrumentation)
+        if profile_stats:
+            self._worker_profiles.append(profile_stats)
+        return outcomes
     
     def _validate_rule_pair(self, mdc_path: Path, yaml_path: Path) -> ValidationResult:
         """Validate MDC rule with YAML metadata"""
+        result, _ = self._validate_source(mdc_path, yaml_path)
+        return result
+    
+    def _read_sources(self, mdc_path: Path, yaml_path: Path) -> Tuple[str, str, float]:
+        """Read a rule pair, returning both texts and the load time in ms"""
+        with self.instrumentation.phase('read') as read:
+            with open(mdc_path) as f:
+                mdc_content = f.read()
+            with open(yaml_path) as f:
+                yaml_text = f.read()
+        return mdc_content, yaml_text, read.elapsed_ms
+    
+    def _validate_source(self, mdc_path: Path, yaml_path: Path,
+                         sources: Optional[Tuple[str, str, float]] = None,
+                         previous: Optional[Dict] = None) -> Tuple[ValidationResult, Optional[Dict]]:
+        """Read, parse and check one rule pair in a single pass
+        
+        ``sources`` may carry texts the caller already read, and ``previous``
+        the rule's stale cache entry, whose findings are reused for checks
+        none of whose inputs changed. Returns the result with the decoded
+        metadata so callers can reuse it.
+        """
         result = ValidationResult(rule_path=mdc_path)
+        metadata = None
         
+        phase = self.instrumentation.phase
         try:
-            # Benchmark performance
-            result.performance = self.benchmark_rule(mdc_path)
-            
             # Load files
-            with open(mdc_path) as f:
-                mdc_content = f.read()
-            with open(yaml_path) as f:
-                metadata = yaml.safe_load(f)
+            mdc_content, yaml_text, load_time = sources or self._read_sources(mdc_path, yaml_path)
             
-            # Validation checks
-            self._validate_metadata(metadata, result)
-            self._validate_content(mdc_content, result)
-            self._validate_performance_against_baseline(result)
-            self._validate_dependencies_exist(metadata, result)
-            self._validate_no_conflicts(metadata, result)
+            with phase('yaml_decode') as decode:
+                metadata = yaml.safe_load(yaml_text)
+            
+            # Validation checks, timed per phase
+            checks = []
+            
+            def timed(name: str):
+                checks.append(phase(name))
+                return checks[-1]
+            
+            changed = self._changed_inputs(previous, metadata, mdc_content)
+            prior = None
+            if changed is not None:
+                assert previous is not None  # Inputs only compare against a previous entry
+                prior = {name: Findings.from_dict(found) for name, found in previous['checks'].items()}
+            findings: Dict[str, Findings] = {}
+            try:
+                self.check_engine.run(self._rule_input(mdc_path, metadata, mdc_content),
+                                      changed, prior, timer=timed, findings=findings)
+            finally:
+                self.check_engine.apply(findings, result)
+            result.check_findings = findings
+            
+            result.performance = self._performance_metrics(
+                mdc_path, mdc_content, load_time, decode.elapsed_ms,
+                sum(check.elapsed_ms for check in checks), [decode, *checks]
+            )
+            with phase('baseline_checks'):
+                self._validate_performance_against_baseline(result)
             
             # Generate fixes if needed
             if result.errors:
-                result.suggested_fixes = self.suggest_fixes(
-                    result.errors, metadata, mdc_content
-                )
+                with phase('fix_suggestions'):
+                    result.suggested_fixes = self.suggest_fixes(
+                        result.errors, metadata, mdc_content
+                    )
             
         except Exception as e:
             result.passed = False
             result.errors.append(f"Validation failed: {str(e)}")
+            result.check_findings = {}
         
-        return result    
+        return result, metadata
+    
+    def _rule_input(self, mdc_path: Path, metadata: Any, content: str) -> RuleInput:
+        return RuleInput(mdc_path.stem, mdc_path.parent.name, metadata, content)
+    
+    def _changed_inputs(self, previous: Optional[Dict], metadata: Any, content: str) -> Optional[Set[str]]:
+        """Check inputs that differ from a stale cache entry, or None to run every check"""
+        if not previous or not previous.get('checks'):
+            return None
+        changed = changed_fields(previous['metadata'], metadata)
+        if changed is None:
+            return None
+        if previous['content_digest'] != _digest(content):
+            changed.add(CONTENT)
+        if previous['dependencies'] != self._dependency_state(metadata):
+            changed.add(DEPENDENCY_TARGETS)
+        return changed
+    
+    def _apply_checks(self, names: Iterable[str], metadata: Any, content: str,
+                      result: ValidationResult) -> None:
+        """Run the named checks against one rule and record their findings on ``result``"""
+        findings: Dict[str, Findings] = {}
+        try:
+            self.check_engine.run(self._rule_input(result.rule_path, metadata, content),
+                                  only=names, findings=findings)
+        finally:
+            self.check_engine.apply(findings, result)
+    
     def _parse_rule(self, content: str) -> Tuple[Dict, str]:
         """Parse rule content into metadata and body"""
         if content.startswith('---'):
@@ -388,29 +1089,11 @@ class EnhancedRuleValidator:
     
     def _validate_metadata(self, metadata: Dict, result: ValidationResult) -> None:
         """Validate metadata fields"""
-        # Check required fields
-        for field in self.config['required_metadata']:
-            if field not in metadata:
-                result.passed = False
-                result.errors.append(f"Missing required metadata field: {field}")
-        
-        # Validate version format
-        if 'version' in metadata:
-            version = metadata['version']
-            if not re.match(r'^\d+\.\d+\.\d+$', str(version)):
-                result.passed = False
-                result.errors.append(f"Invalid version format: {version}")
-        
-        # Validate tags
-        if 'tags' in metadata:
-            invalid_tags = set(metadata['tags']) - set(self.config['approved_tags'])
-            if invalid_tags:
-                result.warnings.append(f"Unknown tags: {invalid_tags}")
+        self._apply_checks(('required_metadata', 'version_format', 'approved_tags'), metadata, '', result)
     
     def _estimate_tokens(self, content: str) -> int:
-        """Estimate token count for content"""
-        # Rough estimation: 1 token ≈ 4 characters
-        return len(content) // 4
+        """Token count for content via the shared counter"""
+        return self.token_counter.count(content)
     
     def _default_value_for_field(self, field: str) -> Any:
         """Provide default value for missing field"""
@@ -431,23 +1114,7 @@ class EnhancedRuleValidator:
         return defaults.get(field, '')    
     def _validate_content(self, content: str, result: ValidationResult) -> None:
         """Validate rule content"""
-        lines = content.splitlines()
-        line_count = len(lines)
-        
-        # Check line count
-        if line_count > self.config['max_lines']:
-            result.passed = False
-            result.errors.append(f"Rule exceeds maximum lines: {line_count} > {self.config['max_lines']}")
-        elif line_count > self.config['warn_lines']:
-            result.warnings.append(f"Rule approaching size limit: {line_count} lines")
-        
-        # Check token estimate
-        tokens = self._estimate_tokens(content)
-        if tokens > self.config['max_tokens']:
-            result.warnings.append(f"High token count: ~{tokens} tokens")
-        
-        result.metrics['line_count'] = line_count
-        result.metrics['estimated_tokens'] = tokens
+        self._apply_checks(('content_size', 'token_budget'), {}, content, result)
     
     def _validate_performance_against_baseline(self, result: ValidationResult) -> None:
         """Compare performance against baseline"""
@@ -471,61 +1138,19 @@ class EnhancedRuleValidator:
     
     def _validate_dependencies_exist(self, metadata: Dict, result: ValidationResult) -> None:
         """Verify all dependencies exist"""
-        if 'dependencies' not in metadata:
-            return
-        
-        for dep in metadata['dependencies']:
-            dep_path = self.rules_dir / dep
-            if not dep_path.exists():
-                result.passed = False
-                result.errors.append(f"Dependency not found: {dep}")
+        self._apply_checks(('dependencies_exist',), metadata, '', result)
     
     def _validate_no_conflicts(self, metadata: Dict, result: ValidationResult) -> None:
         """Check for unresolved conflicts"""
-        if 'conflicts' not in metadata:
-            return
-        
-        for conflict in metadata['conflicts']:
-            if isinstance(conflict, dict) and 'resolution' not in conflict:
-                result.warnings.append(f"Conflict without resolution strategy: {conflict.get('rule', conflict)}")
+        self._apply_checks(('conflict_resolution',), metadata, '', result)
     
     def generate_report(self, format: str, cycles: List[List[str]] = None) -> Dict[str, Any]:
         """Generate validation report in specified format"""
-        total_rules = len(self.results)
-        passed_rules = sum(1 for r in self.results if r.passed)
-        errors = sum(len(r.errors) for r in self.results)
-        warnings = sum(len(r.warnings) for r in self.results)        
-        report = {
-            'timestamp': datetime.now().isoformat(),
-            'success': errors == 0,
-            'total_rules': total_rules,
-            'valid_rules': passed_rules,
-            'error_count': errors,
-            'warning_count': warnings,
-            'dependency_cycles': cycles or [],
-            'results': [r.to_dict() for r in self.results]
-        }
+        summary = ReportSummary()
+        for result in self.results:
+            summary.add(result)
+        report = summary.to_dict(cycles, results=[r.to_dict() for r in self.results])
         
-        # Add performance summary
-        if any(r.performance for r in self.results):
-            perf_data = [r.performance.to_dict() for r in self.results if r.performance]
-            report['performance_summary'] = {
-                'avg_validation_time_ms': sum(p['validation_time_ms'] for p in perf_data) / len(perf_data),
-                'total_tokens': sum(p['token_count'] for p in perf_data),
-                'largest_rule': max(perf_data, key=lambda p: p['line_count'])
-            }
-        
-        # Add suggested fixes summary
-        all_fixes = []
-        for r in self.results:
-            if r.suggested_fixes:
-                all_fixes.extend([{
-                    'rule': str(r.rule_path.name),
-                    'fix': fix.to_dict()
-                } for fix in r.suggested_fixes])
-        
-        if all_fixes:
-            report['suggested_fixes'] = all_fixes        
         if format == 'json':
             return report
         elif format == 'html':
@@ -535,63 +1160,83 @@ class EnhancedRuleValidator:
     
     def _generate_html_report(self, report: Dict) -> str:
         """Generate HTML report"""
-        html = f"""
-        <html>
-        <head>
-            <title>Rule Validation Report</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .success {{ color: green; }}
-                .error {{ color: red; }}
-                .warning {{ color: orange; }}
-                table {{ border-collapse: collapse; width: 100%; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                th {{ background-color: #f2f2f2; }}
-            </style>
-        </head>
-        <body>
-            <h1>Rule Validation Report</h1>
-            <p>Generated: {report['timestamp']}</p>
-            
-            <h2>Summary</h2>
-            <ul>
-                <li>Total Rules: {report['total_rules']}</li>
-                <li>Valid Rules: {report['valid_rules']}</li>
-                <li>Errors: {report['error_count']}</li>
-                <li>Warnings: {report['warning_count']}</li>
-            </ul>            
-            <h2>Results</h2>
-            <table>
-                <tr>
-                    <th>Rule</th>
-                    <th>Status</th>
-                    <th>Issues</th>
-                    <th>Performance</th>
-                </tr>
-        """
-        
+        buffer = StringIO()
+        writer = HtmlReportWriter(buffer)
+        writer.begin(report['timestamp'])
         for result in report['results']:
-            status_class = 'success' if result['status'] == 'PASS' else 'error'
-            issues = '<br>'.join(result['errors'] + result['warnings'])
-            perf = result.get('performance', {})
-            perf_text = f"{perf.get('validation_time_ms', 'N/A')}ms" if perf else 'N/A'
-            
-            html += f"""
-                <tr>
-                    <td>{result['rule']}</td>
-                    <td class="{status_class}">{result['status']}</td>
-                    <td>{issues}</td>
-                    <td>{perf_text}</td>
-                </tr>
-            """
-        
-        html += """
-            </table>
-        </body>
-        </html>
-        """
-        
-        return html
+            writer.write_row(result)
+        writer.end(report)
+        return buffer.getvalue()
+
+_worker_validator: Optional[EnhancedRuleValidator] = None
+
+def _init_validation_worker(rules_dir: str, config: Dict,
+                            baselines: Dict[str, PerformanceMetrics],
+                            profile: bool = False, trace_allocations: bool = False) -> None:
+    """Build one validator per worker process with the parent's settings"""
+    global _worker_validator
+    _worker_validator = EnhancedRuleValidator(Path(rules_dir), profile=profile,
+                                              trace_allocations=trace_allocations)
+    _worker_validator.config = config
+    _worker_validator.performance_baselines = baselines
+
+def _validate_batch(items: List[Tuple[str, str, Optional[Tuple[str, str, float]], Optional[Dict]]]) -> Tuple[
+        List[Tuple[ValidationResult, Optional[Dict]]], Instrumentation, Optional[Dict]]:
+    """Validate a batch, returning outcomes with this batch's measurements"""
+    validator = _worker_validator
+    assert validator is not None, "worker used without _init_validation_worker"
+    validator.instrumentation = Instrumentation(validator.instrumentation.trace_allocations)
+    validator.instrumentation.start()
+    profiler = None
+    if validator.profile:
+        import cProfile
+        profiler = validator._profiler = cProfile.Profile()
+        profiler.enable()
+    
+    outcomes = [validator._validate_source(Path(mdc), Path(yaml_path), sources, previous)
+                for mdc, yaml_path, sources, previous in items]
+    
+    profile_stats = None
+    if profiler is not None:
+        profiler.disable()
+        profiler.create_stats()
+        profile_stats = profiler.stats
+    validator.instrumentation.stop()
+    return outcomes, validator.instrumentation, profile_stats
+
+def _code_digest() -> str:
+    """Digest of the sources of RESULT_MODULES"""
+    digest = hashlib.sha256()
+    for name in RESULT_MODULES:
+        source = getattr(sys.modules.get(name), '__file__', None)
+        digest.update(name.encode('utf-8') + b'\0')
+        if source is not None:
+            with open(source, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+def _digest(*texts: str) -> str:
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(text.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def changed_rule_files(rules_dir: Path, since: str = 'HEAD') -> Set[Path]:
+    """Files changed since a git ref, including uncommitted and untracked ones
+    
+    Raises ``OSError`` without git and ``CalledProcessError`` outside a
+    checkout or for an unknown ref.
+    """
+    def git(*args: str) -> List[str]:
+        completed = subprocess.run(
+            ['git', *args], cwd=rules_dir, capture_output=True, text=True, check=True
+        )
+        return completed.stdout.splitlines()
+    
+    root = Path(git('rev-parse', '--show-toplevel')[0])
+    names = git('diff', '--name-only', since) + git('ls-files', '--others', '--exclude-standard', '--full-name')
+    return {root / name for name in names if name}
 
 def main():
     """CLI entry point"""
@@ -600,17 +1245,75 @@ def main():
     parser = argparse.ArgumentParser(description="Validate Cursor Rules")
     parser.add_argument('--all', action='store_true', help='Validate all rules')
     parser.add_argument('--rule', help='Validate specific rule')
-    parser.add_argument('--report-format', choices=['json', 'html'], default='json')
+    parser.add_argument('--report-format', choices=['json', 'html', 'ndjson', 'sarif'], default='json',
+                        help='json builds the report in memory; other formats stream results as they are produced')
     parser.add_argument('--output', help='Output file for report')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for validating rules in parallel')
+    parser.add_argument('--changed-only', action='store_true',
+                        help='Validate only rules changed since HEAD and their dependents')
+    parser.add_argument('--since', metavar='REF',
+                        help='Validate only rules changed since a git ref and their dependents')
+    parser.add_argument('--cache-dir', type=Path,
+                        help='Directory for the validation result cache (default: ./.cache next to rules)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Disable the validation result and token count caches')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Report import time for this command instead of its output')
+    parser.add_argument('--profile-dir', type=Path,
+                        help='Write phase histograms, a cProfile pstats dump and collapsed stacks here')
+    parser.add_argument('--trace-allocations', action='store_true',
+                        help='Attribute allocations to validation phases with tracemalloc')
     
     args = parser.parse_args()
     
+    if args.profile_startup:
+        from startup_profile import report_startup
+        report_startup(__file__)
+        return
+    
     rules_dir = Path(__file__).parent.parent / 'rules'
-    validator = EnhancedRuleValidator(rules_dir)
+    cache_dir = None if args.no_cache else (args.cache_dir or rules_dir.parent / '.cache')
+    validator = EnhancedRuleValidator(rules_dir, cache_dir=cache_dir,
+                                      profile=args.profile_dir is not None,
+                                      trace_allocations=args.trace_allocations)
+    
+    changed = None
+    if args.changed_only or args.since:
+        try:
+            changed = changed_rule_files(rules_dir, args.since or 'HEAD')
+        except (OSError, subprocess.CalledProcessError) as e:
+            detail = getattr(e, 'stderr', None) or str(e)
+            parser.exit(2, f"error: cannot list changed rules from git: {detail.strip()}\n")
     
-    if args.all:
-        report = validator.validate_all(args.report_format)
-    elif args.rule:
+    if not (args.all or changed is not None or args.rule):
+        parser.print_help()
+        return
+    
+    if args.report_format != 'json':
+        # Stream results as they are produced
+        stream = open(args.output, 'w') if args.output else sys.stdout
+        try:
+            writer = REPORT_WRITERS[args.report_format](stream, base_dir=rules_dir.parent)
+            if args.rule:
+                rule_path = rules_dir / args.rule
+                result = validator._validate_rule_pair(rule_path, rule_path.with_suffix('.yaml'))
+                summary = ReportSummary(collect_fixes=False)
+                summary.add(result)
+                writer.begin()
+                writer.write_result(result)
+                writer.end(summary.to_dict())
+            else:
+                validator.validate_all(args.report_format, workers=args.workers,
+                                       changed=changed, writer=writer)
+        finally:
+            if args.output:
+                stream.close()
+        if args.profile_dir:
+            validator.write_profile(args.profile_dir)
+        return
+    
+    if args.rule:
         # Single rule validation
         rule_path = rules_dir / args.rule
         yaml_path = rule_path.with_suffix('.yaml')
@@ -620,22 +1323,17 @@ def main():
             'results': [result.to_dict()]
         }
     else:
-        parser.print_help()
-        return
+        report = validator.validate_all(args.report_format, workers=args.workers, changed=changed)
+    
+    if args.profile_dir:
+        validator.write_profile(args.profile_dir)
     
     # Output report
     if args.output:
         with open(args.output, 'w') as f:
-            if args.report_format == 'json':
-                json.dump(report, f, indent=2)
-            else:
-                f.write(report)
+            json.dump(report, f, indent=2)
     else:
-        if args.report_format == 'json':
-            print(json.dumps(report, indent=2))
-        else:
-            print(report)
-
+        print(json.dumps(report, indent=2))
 
 if __name__ == '__main__':
     main()
\ No newline at end of file